@@ -4,4 +4,6 @@ status=$?
 if [[ $status != 0 ]]; then
   python /code/todolist/manage.py migrate
 fi
+# Creates the cache table if the database cache backend is configured, does nothing otherwise
+python /code/todolist/manage.py createcachetable
 exec "$@"
\ No newline at end of file
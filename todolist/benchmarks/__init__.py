@@ -0,0 +1,74 @@
+"""
+Benchmarks for performance-sensitive code paths
+
+Run a benchmark as a module from the todolist directory, e.g.:
+
+    python -m benchmarks.board_participants
+
+Benchmarks that need data write it to the configured database inside a transaction that is rolled back at the end,
+so they can be run against a development database.
+"""
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import django
+
+
+def setup() -> None:
+    """Configure Django for a standalone benchmark script"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    django.setup()
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run the block in a transaction that is always rolled back"""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@dataclass
+class Measurement:
+    queries: int
+    seconds: float
+
+
+def measure(func: Callable[[], object], repeat: int = 1) -> Measurement:
+    """Run the function and return the number of SQL statements and the best wall time out of `repeat` runs
+
+    Args:
+        func (Callable): Function to measure
+        repeat (int): Number of runs. Each run happens in its own rolled back savepoint. Defaults to 1.
+
+    Returns:
+        Measurement: Statement count of the last run and the best time
+
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    best: float = float('inf')
+    queries: int = 0
+    for _ in range(repeat):
+        with rolled_back(), CaptureQueriesContext(connection) as context:
+            started: float = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        queries = len(context.captured_queries)
+    return Measurement(queries=queries, seconds=best)
+
+
+def print_table(headers: list[str], rows: list[list]) -> None:
+    """Print rows as a plain text table"""
+    cells: list[list[str]] = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths: list[int] = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for i, row in enumerate(cells):
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            print('  '.join('-' * width for width in widths))
@@ -0,0 +1,104 @@
+"""
+Compare peak Python memory of the streaming board export with an export that loads every table into a list first
+
+Peak memory of the streaming export should stay the same while the board grows, the list-based export grows
+with the board. Times include the overhead of tracing allocations.
+
+    python -m benchmarks.board_export [--goals 10000 50000 200000] [--comments 1]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from benchmarks import print_table, rolled_back, setup
+
+setup()
+
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.export import TABLES, export_board  # noqa: E402
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment  # noqa: E402
+
+CATEGORIES: int = 10
+
+
+def create_board(goals: int, comments: int) -> Board:
+    now = timezone.now()
+    dates: dict = {'created': now, 'updated': now}
+    user: User = User.objects.create(username='benchmark-board-export', password='!')
+    board: Board = Board.objects.create(title='Benchmark')
+    BoardParticipant.objects.create(board=board, user=user)
+    categories: list[GoalCategory] = GoalCategory.objects.bulk_create(
+        GoalCategory(title=f'Category {i}', board=board, user=user, **dates) for i in range(CATEGORIES)
+    )
+    goal_objs: list[Goal] = Goal.objects.bulk_create(
+        (
+            Goal(
+                title=f'Goal {i}', description='Description ' * 10, category=categories[i % CATEGORIES],
+                board=board, user=user, **dates,
+            )
+            for i in range(goals)
+        ),
+        batch_size=10000,
+    )
+    GoalComment.objects.bulk_create(
+        (
+            GoalComment(text=f'Comment {i}', goal=goal, board=board, user=user, **dates)
+            for goal in goal_objs for i in range(comments)
+        ),
+        batch_size=10000,
+    )
+    return board
+
+
+def export_loaded(board: Board) -> Iterable[bytes]:
+    """Export as it would be written without streaming: every table is loaded before writing"""
+    rows: list[dict] = [
+        {'table': table, **row}
+        for table, (model, fields) in TABLES.items()
+        for row in list(model.objects.filter(board_id=board.id).order_by('id').values(*fields))
+    ]
+    return [json.dumps(row, cls=DjangoJSONEncoder).encode() + b'\n' for row in rows]
+
+
+def run(export: Callable[[Board], Iterable[bytes]], board: Board) -> tuple[int, float, float]:
+    """Return the export size, peak traced memory in MiB and the time of the export"""
+    size: int = 0
+    tracemalloc.start()
+    started: float = time.perf_counter()
+    for chunk in export(board):
+        size += len(chunk)
+    seconds: float = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak / 2 ** 20, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--comments', type=int, default=1, help='Comments per goal')
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    for goals in args.goals:
+        with rolled_back():
+            board: Board = create_board(goals, args.comments)
+            size, streamed_peak, streamed_seconds = run(export_board, board)
+            _, loaded_peak, loaded_seconds = run(export_loaded, board)
+        rows.append([
+            goals, f'{size / 2 ** 20:.1f}',
+            f'{streamed_peak:.1f}', f'{streamed_seconds:.2f}', f'{loaded_peak:.1f}', f'{loaded_seconds:.2f}',
+        ])
+
+    print_table(
+        ['goals', 'export MiB', 'streamed peak MiB', 'streamed s', 'loaded peak MiB', 'loaded s'], rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare throughput of the board import with creating the same rows one at a time with save()
+
+The import loads a generated NDJSON board with one comment per goal. The save() path creates the categories,
+goals and comments of a smaller sample the way the create views do.
+
+    python -m benchmarks.board_import [--goals 10000 100000] [--batch-size 2000] [--save-sample 2000]
+"""
+import argparse
+import json
+import time
+
+from benchmarks import print_table, rolled_back, setup
+
+setup()
+
+from django.utils import timezone  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.importer import BoardImporter  # noqa: E402
+from goals.models import Board, Goal, GoalCategory, GoalComment  # noqa: E402
+
+CATEGORIES: int = 10
+
+
+def generate(goals: int) -> list[str]:
+    """Return NDJSON lines of a board with the given number of goals, each with a comment"""
+    created: str = timezone.now().isoformat()
+    rows: list[dict] = [{'table': 'board', 'id': 1, 'title': 'Benchmark', 'created': created}]
+    rows += [
+        {'table': 'categories', 'id': i, 'title': f'Category {i}', 'user_id': 1, 'created': created}
+        for i in range(CATEGORIES)
+    ]
+    rows += [
+        {
+            'table': 'goals', 'id': i, 'category_id': i % CATEGORIES, 'title': f'Goal {i}',
+            'description': 'Description ' * 10, 'status': 1 + i % 4, 'priority': 1 + i % 4, 'user_id': 1,
+            'created': created,
+        }
+        for i in range(goals)
+    ]
+    rows += [
+        {'table': 'comments', 'id': i, 'goal_id': i, 'text': f'Comment {i}', 'user_id': 1, 'created': created}
+        for i in range(goals)
+    ]
+    return [json.dumps(row) + '\n' for row in rows]
+
+
+def save_rows(user: User, goals: int) -> float:
+    """Create categories, goals and comments one at a time, return rows per second"""
+    started: float = time.perf_counter()
+    board: Board = Board.objects.create(title='Benchmark')
+    categories: list[GoalCategory] = [
+        GoalCategory.objects.create(title=f'Category {i}', board=board, user=user) for i in range(CATEGORIES)
+    ]
+    for i in range(goals):
+        goal: Goal = Goal.objects.create(
+            title=f'Goal {i}', description='Description ' * 10, category=categories[i % CATEGORIES], user=user
+        )
+        GoalComment.objects.create(text=f'Comment {i}', goal=goal, user=user)
+    return (1 + CATEGORIES + 2 * goals) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--save-sample', type=int, default=2000, help='Goals created with save()')
+    args = parser.parse_args()
+
+    with rolled_back():
+        user: User = User.objects.create(username='benchmark-board-import', password='!')
+        save_rate: float = save_rows(user, args.save_sample)
+
+    rows: list[list] = []
+    for goals in args.goals:
+        lines: list[str] = generate(goals)
+        with rolled_back():
+            user = User.objects.create(username='benchmark-board-import', password='!')
+            result = BoardImporter(user, args.batch_size).run(lines)
+        rows.append([
+            goals, sum(result.rows.values()), f'{result.seconds:.2f}',
+            f'{result.rows_per_second:.0f}', f'{save_rate:.0f}', f'{result.rows_per_second / save_rate:.1f}x',
+        ])
+
+    print_table(['goals', 'rows', 'import s', 'import rows/s', 'save() rows/s', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare statement counts and latency of the board participant sync with the former per-row implementation
+
+For each board size, half of the existing participants get a new role, the other half is removed, and as many new
+participants as were removed are added.
+
+    python -m benchmarks.board_participants [--sizes 10 100 1000] [--repeat 3]
+"""
+import argparse
+from types import SimpleNamespace
+
+from benchmarks import measure, print_table, rolled_back, setup
+
+setup()
+
+from django.db import transaction  # noqa: E402
+from django.db.models import QuerySet  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.models import Board, BoardParticipant  # noqa: E402
+from goals.serializers import BoardParticipantSerializer, BoardSerializer  # noqa: E402
+
+
+class PerRowBoardParticipantSerializer(BoardParticipantSerializer):
+    user = serializers.SlugRelatedField(slug_field='username', queryset=User.objects.all())
+
+    class Meta(BoardParticipantSerializer.Meta):
+        list_serializer_class = serializers.ListSerializer
+
+
+class PerRowBoardSerializer(BoardSerializer):
+    """The participant sync as it was before it became set-based"""
+    participants = PerRowBoardParticipantSerializer(many=True)
+
+    def update(self, instance: Board, validated_data: dict) -> Board:
+        owner: User = validated_data.pop('user')
+        new_participants: list[dict] = validated_data.pop('participants')
+        new_by_id: dict[int, dict] = {pa['user'].id: pa for pa in new_participants}
+
+        existing_participants: QuerySet = instance.participants.exclude(user=owner)
+        existing_by_id: dict[int, BoardParticipant] = {pa.user_id: pa for pa in existing_participants}
+
+        with transaction.atomic():
+            for uid, existing_participant in existing_by_id.items():
+                if uid not in new_by_id.keys():
+                    existing_participant.delete()
+
+            for uid, participant_data in new_by_id.items():
+                role = participant_data['role']
+
+                if uid in existing_by_id.keys() and existing_by_id[uid].role != role:
+                    existing_by_id[uid].role = role
+                    existing_by_id[uid].save()
+                else:
+                    BoardParticipant.objects.create(user=participant_data['user'], board=instance, role=role)
+
+        if title := validated_data.get('title'):
+            instance.title = title
+            instance.save()
+        return instance
+
+
+def create_board(size: int) -> tuple[Board, User, list[dict]]:
+    """Create a board with an owner and `size` participants, return it with the participant list to sync"""
+    now = timezone.now()
+    users: list[User] = User.objects.bulk_create(
+        User(username=f'benchmark-{size}-{i}', password='!') for i in range(size + size // 2 + 1)
+    )
+    owner, existing_users, new_users = users[0], users[1:size + 1], users[size + 1:]
+
+    board: Board = Board.objects.create(title=f'Benchmark {size}')
+    BoardParticipant.objects.create(board=board, user=owner, role=BoardParticipant.Role.owner)
+    BoardParticipant.objects.bulk_create(
+        BoardParticipant(board=board, user=user, role=BoardParticipant.Role.reader, created=now, updated=now)
+        for user in existing_users
+    )
+
+    participants: list[dict] = (
+        [{'user': user.username, 'role': BoardParticipant.Role.writer} for user in existing_users[:size // 2]] +
+        [{'user': user.username, 'role': BoardParticipant.Role.reader} for user in new_users]
+    )
+    return board, owner, participants
+
+
+def sync(serializer_class: type[BoardSerializer], board: Board, owner: User, participants: list[dict]) -> None:
+    context: dict = {'request': SimpleNamespace(user=owner)}
+    serializer = serializer_class(board, data={'title': board.title, 'participants': participants}, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    with rolled_back():
+        for size in args.sizes:
+            board, owner, participants = create_board(size)
+            per_row = measure(lambda: sync(PerRowBoardSerializer, board, owner, participants), repeat=args.repeat)
+            set_based = measure(lambda: sync(BoardSerializer, board, owner, participants), repeat=args.repeat)
+            rows.append([
+                size,
+                per_row.queries, f'{per_row.seconds * 1000:.1f}',
+                set_based.queries, f'{set_based.seconds * 1000:.1f}',
+            ])
+
+    print_table(['participants', 'per-row queries', 'per-row ms', 'set-based queries', 'set-based ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
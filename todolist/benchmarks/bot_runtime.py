@@ -0,0 +1,151 @@
+"""
+Compare update throughput of the serial bot loop and the asyncio runtime against a local fake telegram API
+
+The fake API serves getUpdates with '/goals' messages from authorized users of several chats and answers
+sendMessage after a delay standing in for the network round trip to telegram. The bot runs as a separate
+'runbot' process for each mode; throughput is measured from its first poll to the last reply.
+
+Users are committed to the database, since the bot process cannot see a rolled back transaction, and deleted
+at the end.
+
+    python -m benchmarks.bot_runtime [--chats 50] [--messages 10] [--latency 50] [--concurrency 1 8 32]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import print_table, setup
+
+setup()
+
+from bot.models import TgUser  # noqa: E402
+from core.models import User  # noqa: E402
+
+USERNAME_PREFIX: str = 'benchmark-bot-runtime-'
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    """Telegram bot API serving a fixed list of updates"""
+    daemon_threads: bool = True
+
+    def __init__(self, updates: list[dict], latency: float):
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.updates: list[dict] = updates
+        self.latency: float = latency
+        self.lock = threading.Lock()
+        self.first_poll: float | None = None
+        self.replies: int = 0
+        self.last_reply: float = 0.0
+        self.done = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def handle_error(self, request, client_address) -> None:
+        # The bot process is terminated in the middle of a poll
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    server: FakeTelegram
+    # Keep connections alive. Headers and body are written separately, which would wait for delayed ACKs.
+    protocol_version: str = 'HTTP/1.1'
+    disable_nagle_algorithm: bool = True
+
+    def do_POST(self) -> None:
+        params: dict = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if self.path.endswith('/getUpdates'):
+            result: list[dict] = self.get_updates(params.get('offset', 0))
+        else:
+            time.sleep(self.server.latency)
+            with self.server.lock:
+                self.server.replies += 1
+                self.server.last_reply = time.perf_counter()
+                if self.server.replies == len(self.server.updates):
+                    self.server.done.set()
+            result = {'chat': {'id': params['chat_id']}, 'text': params['text']}
+
+        body: bytes = json.dumps({'ok': True, 'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_updates(self, offset: int) -> list[dict]:
+        with self.server.lock:
+            if self.server.first_poll is None:
+                self.server.first_poll = time.perf_counter()
+        result: list[dict] = [update for update in self.server.updates if update['update_id'] >= offset][:100]
+        if not result:
+            # Short long poll
+            time.sleep(0.1)
+        return result
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run_bot(chat_ids: list[int], messages: int, latency: float, options: list[str]) -> float:
+    """Run the bot with the given options until it has answered every update, return updates per second"""
+    updates: list[dict] = [
+        {'update_id': 1 + i * len(chat_ids) + j, 'message': {'chat': {'id': chat_id}, 'text': '/goals'}}
+        for i in range(messages) for j, chat_id in enumerate(chat_ids)
+    ]
+    server = FakeTelegram(updates, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env: dict = os.environ | {'TELEGRAM_API_URL': server.url, 'TELEGRAM_BOT_TOKEN': 'benchmark'}
+    process = subprocess.Popen(
+        [sys.executable, 'manage.py', 'runbot', *options], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not server.done.wait(timeout=600):
+            raise RuntimeError(f'{server.replies} of {len(updates)} updates answered')
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        server.shutdown()
+    return len(updates) / (server.last_reply - server.first_poll)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chats', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=10, help='Messages per chat')
+    parser.add_argument('--latency', type=float, default=50, help='Milliseconds sendMessage takes')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    chat_ids: list[int] = list(range(10 ** 9, 10 ** 9 + args.chats))
+    users: list[User] = User.objects.bulk_create(
+        User(username=f'{USERNAME_PREFIX}{chat_id}', password='!') for chat_id in chat_ids
+    )
+    TgUser.objects.bulk_create(TgUser(chat_id=chat_id, user=user) for chat_id, user in zip(chat_ids, users))
+    try:
+        latency: float = args.latency / 1000
+        serial: float = run_bot(chat_ids, args.messages, latency, ['--serial'])
+        rows: list[list] = [['serial', '-', f'{serial:.1f}', '1.0x']]
+        for concurrency in args.concurrency:
+            rate: float = run_bot(chat_ids, args.messages, latency, [f'--concurrency={concurrency}'])
+            rows.append(['asyncio', concurrency, f'{rate:.1f}', f'{rate / serial:.1f}x'])
+    finally:
+        TgUser.objects.filter(chat_id__in=chat_ids).delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    print(f'{args.chats} chats, {args.messages} messages each, sendMessage takes {args.latency:.0f} ms')
+    print_table(['runtime', 'concurrency', 'updates/s', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare latency of the goal and comment list queries joining boards through categories and goals with the queries
+using the board stored on goals and comments
+
+The user participates in some of the boards, the others only add rows the queries have to skip. Every query
+counts the visible rows and loads the first page, like the list endpoints do.
+
+    python -m benchmarks.denormalized_board [--boards 200] [--member-boards 20] [--goals 200] [--comments 2]
+"""
+import argparse
+
+from benchmarks import measure, print_table, rolled_back, setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import QuerySet  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment  # noqa: E402
+
+PAGE_SIZE: int = 100
+CATEGORIES_PER_BOARD: int = 5
+
+
+def create_data(boards: int, member_boards: int, goals: int, comments: int) -> User:
+    """Create the boards with their categories, goals and comments, return the user participating in some of them"""
+    now = timezone.now()
+    dates: dict = {'created': now, 'updated': now}
+    user: User = User.objects.create(username='benchmark-denormalized-board', password='!')
+
+    board_objs: list[Board] = Board.objects.bulk_create(Board(title=f'Board {i}', **dates) for i in range(boards))
+    BoardParticipant.objects.bulk_create(
+        BoardParticipant(board=board, user=user, role=BoardParticipant.Role.owner, **dates)
+        for board in board_objs[:member_boards]
+    )
+    categories: list[GoalCategory] = GoalCategory.objects.bulk_create(
+        GoalCategory(title=f'Category {i}', board=board, user=user, **dates)
+        for board in board_objs for i in range(CATEGORIES_PER_BOARD)
+    )
+    goal_objs: list[Goal] = Goal.objects.bulk_create(
+        Goal(title=f'Goal {i}', category=category, board_id=category.board_id, user=user, **dates)
+        for category in categories for i in range(goals // CATEGORIES_PER_BOARD)
+    )
+    GoalComment.objects.bulk_create(
+        (
+            GoalComment(text=f'Comment {i}', goal=goal, board_id=goal.board_id, user=user, **dates)
+            for goal in goal_objs for i in range(comments)
+        ),
+        batch_size=10000,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return user
+
+
+def goal_lists(user: User) -> tuple[QuerySet, QuerySet]:
+    """Return the goal list queryset as it was before the board was stored on goals and as it is now"""
+    active: QuerySet = Goal.objects.exclude(status=Goal.Status.archived).select_related('user').order_by('title', 'id')
+    return (
+        active.filter(
+            category__board__participants__user_id=user.id,
+            category__is_deleted=False,
+            category__board__is_deleted=False,
+        ),
+        active.filter(
+            board__participants__user_id=user.id,
+            board__is_deleted=False,
+            category__is_deleted=False,
+        ),
+    )
+
+
+def comment_lists(user: User) -> tuple[QuerySet, QuerySet]:
+    """Return the comment list queryset as it was before the board was stored on comments and as it is now"""
+    comments: QuerySet = GoalComment.objects.select_related('user').order_by('-created', '-id')
+    return (
+        comments.filter(goal__category__board__participants__user_id=user.id),
+        comments.filter(board__participants__user_id=user.id),
+    )
+
+
+def run_list(queryset: QuerySet) -> None:
+    queryset.count()
+    list(queryset[:PAGE_SIZE])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boards', type=int, default=200, help='Number of boards')
+    parser.add_argument('--member-boards', type=int, default=20, help='Number of boards the user participates in')
+    parser.add_argument('--goals', type=int, default=200, help='Number of goals per board')
+    parser.add_argument('--comments', type=int, default=2, help='Number of comments per goal')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    with rolled_back():
+        user: User = create_data(args.boards, args.member_boards, args.goals, args.comments)
+        for name, (before, after) in (('goal list', goal_lists(user)), ('comment list', comment_lists(user))):
+            joined = measure(lambda: run_list(before), repeat=args.repeat)
+            denormalized = measure(lambda: run_list(after), repeat=args.repeat)
+            rows.append([
+                name,
+                f'{joined.seconds * 1000:.1f}',
+                f'{denormalized.seconds * 1000:.1f}',
+                f'{joined.seconds / denormalized.seconds:.1f}x',
+            ])
+
+    print_table(['query', 'joined ms', 'denormalized ms', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
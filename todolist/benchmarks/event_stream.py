@@ -0,0 +1,133 @@
+"""
+Measure memory of an ASGI server process holding idle event stream connections, and the time to fan an event out
+to all of them
+
+Starts `uvicorn todolist.asgi:application` with the postgres event backend, opens connections of one user in steps,
+reading the server's resident memory after each step, then publishes one event through LISTEN/NOTIFY and waits
+until every connection has received it. Requires uvicorn, which is not a project dependency.
+
+    python -m benchmarks.event_stream [--connections 1 100 1000 5000] [--port 8765]
+"""
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+import psutil
+from asgiref.sync import sync_to_async
+
+from benchmarks import print_table, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.events import Event, PostgresBackend  # noqa: E402
+from goals.models import Board, BoardParticipant  # noqa: E402
+from goals.stream import EVENT_STREAM_PATH  # noqa: E402
+
+
+def start_server(port: int) -> subprocess.Popen:
+    env: dict = {**os.environ, 'EVENT_STREAM_BACKEND': 'postgres'}
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'todolist.asgi:application', '--port', str(port), '--log-level', 'warning'],
+        env=env,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError('Server did not start')
+
+
+async def connect(port: int, cookie: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open an event stream and read its response headers and the first chunk"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'GET {EVENT_STREAM_PATH} HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    await reader.readuntil(b'\r\n\r\n')
+    await reader.readuntil(b'\n\n')
+    return reader, writer
+
+
+async def receive_event(reader: asyncio.StreamReader) -> None:
+    while not (await reader.readuntil(b'\n\n')).split(b'\r\n')[-1].startswith(b'data:'):
+        pass
+
+
+def publish(board_id: int) -> None:
+    with transaction.atomic():
+        PostgresBackend().publish(Event(kind='board', action='updated', board=board_id, ids=[board_id]))
+
+
+async def run(port: int, steps: list[int], cookie: str, board_id: int, server: psutil.Process) -> list[list]:
+    rows: list[list] = []
+    base_rss: int = server.memory_info().rss
+    rows.append([0, f'{base_rss / 2 ** 20:.1f}', '-'])
+
+    connections: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    for target in steps:
+        while len(connections) < target:
+            batch: int = min(target - len(connections), 200)
+            connections += await asyncio.gather(*(connect(port, cookie) for _ in range(batch)))
+        await asyncio.sleep(1)
+        rss: int = server.memory_info().rss
+        rows.append([target, f'{rss / 2 ** 20:.1f}', f'{(rss - base_rss) / target / 1024:.1f}'])
+
+    started: float = time.perf_counter()
+    await sync_to_async(publish)(board_id)
+    await asyncio.gather(*(receive_event(reader) for reader, _ in connections))
+    print(f'Event received by {len(connections)} connections in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    for _, writer in connections:
+        writer.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 100, 1000, 5000])
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    # Each connection takes a descriptor in this process and in the server, which inherits the limit
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+
+    user: User = User.objects.create(username=f'benchmark-event-stream-{os.getpid()}')
+    board: Board = Board.objects.create(title='Benchmark')
+    participant: BoardParticipant = BoardParticipant.objects.create(board=board, user=user)
+    client = Client()
+    client.force_login(user)
+    cookie: str = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    server = start_server(args.port)
+    try:
+        rows: list[list] = asyncio.run(run(args.port, args.connections, cookie, board.id, psutil.Process(server.pid)))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        client.logout()
+        participant.delete()
+        board.delete()
+        user.delete()
+
+    print_table(['connections', 'server RSS MiB', 'KiB per connection'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare rendering and parsing of a 1000-goal list page with DRF's JSON renderer / parser and the orjson ones
+
+Goals are serialized once from unsaved instances, only rendering and parsing are timed.
+
+    python -m benchmarks.json_renderers [--goals 1000] [--repeat 50]
+"""
+import argparse
+import datetime
+import io
+import time
+from typing import Callable
+
+from benchmarks import print_table, setup
+
+setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core.models import User  # noqa: E402
+from core.parsers import ORJSONParser  # noqa: E402
+from core.renderers import ORJSONRenderer  # noqa: E402
+from goals.models import Goal  # noqa: E402
+from goals.serializers import GoalSerializer  # noqa: E402
+
+
+def page(goals: int) -> dict:
+    now = timezone.now()
+    user = User(id=1, username='benchmark', first_name='Bench', last_name='Mark', email='benchmark@example.com')
+    results: list = GoalSerializer(
+        [
+            Goal(
+                id=i, title=f'Goal {i}', description='Description ' * 10, due_date=now.date() + datetime.timedelta(i),
+                user=user, category_id=1, board_id=1, created=now, updated=now,
+            )
+            for i in range(goals)
+        ],
+        many=True,
+    ).data
+    return {'count': goals, 'next': None, 'previous': None, 'results': results}
+
+
+def best(func: Callable[[], object], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    data: dict = page(args.goals)
+    body: bytes = JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == body
+
+    rows: list[list] = []
+    for renderer, json_parser in ((JSONRenderer(), JSONParser()), (ORJSONRenderer(), ORJSONParser())):
+        render: float = best(lambda: renderer.render(data), args.repeat)
+        parse: float = best(lambda: json_parser.parse(io.BytesIO(body)), args.repeat)
+        rows.append([type(renderer).__name__, len(body), f'{render * 1000:.2f}', f'{parse * 1000:.2f}'])
+
+    print_table(['renderer', 'bytes', 'render ms', 'parse ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
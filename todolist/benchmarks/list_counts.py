@@ -0,0 +1,48 @@
+"""
+Compare latency of the first page of the goal and comment lists with an exact count, an estimated count
+and without a count
+
+    python -m benchmarks.list_counts [--boards 50] [--goals 2000] [--comments 2] [--repeat 5]
+"""
+import argparse
+
+from benchmarks import measure, print_table, rolled_back, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from benchmarks.denormalized_board import create_data  # noqa: E402
+
+PAGE_SIZE: int = 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boards', type=int, default=50, help='Boards of the user')
+    parser.add_argument('--goals', type=int, default=2000, help='Goals per board')
+    parser.add_argument('--comments', type=int, default=2, help='Comments per goal')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    with rolled_back():
+        client = APIClient()
+        client.force_login(create_data(args.boards, args.boards, args.goals, args.comments))
+
+        for name in ('goal-list', 'comment-list'):
+            url: str = reverse(f'goals:{name}')
+            for count in ('true', 'estimate', 'false'):
+                params: dict = {'limit': PAGE_SIZE, 'count': count}
+                reported = client.get(url, params).data['count']
+                measurement = measure(lambda: client.get(url, params), repeat=args.repeat)
+                rows.append([name, count, reported, measurement.queries, f'{measurement.seconds * 1000:.1f}'])
+
+    print(f'Estimates are used from {settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD} rows')
+    print_table(['list', 'count', 'reported count', 'queries', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
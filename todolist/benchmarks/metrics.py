@@ -0,0 +1,59 @@
+"""
+Measure the cost of recording metrics samples and of exposing the metrics of several worker processes
+
+    python -m benchmarks.metrics [--samples 100000] [--workers 8] [--views 50]
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+from benchmarks import print_table, setup
+
+setup()
+
+from django.test import override_settings  # noqa: E402
+
+from core.metrics import generate_latest, http_request_duration, http_requests  # noqa: E402
+
+
+def record(samples: int, views: int) -> None:
+    for i in range(samples):
+        view: str = f'view-{i % views}'
+        http_request_duration.observe(i % 1000 / 1000, view=view)
+        http_requests.inc(view=view, method='GET', status='200')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=100000, help='Requests recorded by each worker')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--views', type=int, default=50, help='Distinct URL names')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_ENABLED=True, METRICS_DIR=directory):
+        started: float = time.perf_counter()
+        record(args.samples, args.views)
+        per_request: float = (time.perf_counter() - started) / args.samples
+
+        processes = [
+            multiprocessing.get_context('fork').Process(target=record, args=(args.samples // 10, args.views))
+            for _ in range(args.workers - 1)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        started = time.perf_counter()
+        text: str = generate_latest()
+        exposition: float = time.perf_counter() - started
+
+    print_table(
+        ['us per request (histogram + counter)', 'workers', 'exposition ms', 'exposition bytes'],
+        [[f'{per_request * 1_000_000:.2f}', args.workers, f'{exposition * 1000:.1f}', len(text)]],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare latency of a goal list page with the request timing instrumentation disabled and enabled
+
+    python -m benchmarks.request_timing [--goals 1000] [--limit 100] [--repeat 50]
+"""
+import argparse
+
+from benchmarks import measure, print_table, rolled_back, setup
+
+setup()
+
+from django.test import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from benchmarks.denormalized_board import create_data  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=1000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    with rolled_back():
+        user = create_data(boards=1, member_boards=1, goals=args.goals, comments=0)
+        for enabled in (False, True):
+            with override_settings(REQUEST_TIMING=enabled):
+                # Middleware is loaded by the first request of a client
+                client = APIClient()
+                client.force_login(user)
+                response = client.get(reverse('goals:goal-list'), {'limit': args.limit})
+                measurement = measure(
+                    lambda: client.get(reverse('goals:goal-list'), {'limit': args.limit}), repeat=args.repeat
+                )
+            rows.append([enabled, f'{measurement.seconds * 1000:.2f}', response.get('Server-Timing', '')])
+
+    print_table(['enabled', 'ms', 'Server-Timing'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare CPU time per update of decoding getUpdates responses with the marshmallow schemas of the bot dataclasses
+and with the decoders of bot.tg.decoding
+
+Updates are shaped like the ones telegram sends: messages and callback queries with the fields the dataclasses
+leave out. Times are the best out of the runs.
+
+    python -m benchmarks.update_decoding [--updates 100] [--repeat 200]
+"""
+import argparse
+import time
+from typing import Callable
+
+from benchmarks import print_table, setup
+
+setup()
+
+import marshmallow_dataclass  # noqa: E402
+
+from bot.tg.dc import GetUpdatesResponse  # noqa: E402
+from bot.tg.decoding import decode  # noqa: E402
+
+
+def get_update(update_id: int) -> dict:
+    """Get an update as decoded from telegram's JSON, a callback query for every third update"""
+    user: dict = {'id': 100 + update_id % 7, 'is_bot': False, 'first_name': 'Name', 'language_code': 'en'}
+    chat: dict = {'id': 100 + update_id % 7, 'first_name': 'Name', 'type': 'private'}
+    message: dict = {
+        'message_id': update_id, 'from': user, 'chat': chat, 'date': 1700000000 + update_id, 'text': '/goals',
+        'entities': [{'offset': 0, 'length': 6, 'type': 'bot_command'}],
+    }
+    if update_id % 3:
+        return {'update_id': update_id, 'message': message}
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id), 'from': user, 'message': message, 'chat_instance': '1', 'data': 'goal',
+        },
+    }
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=100, help='Updates per response')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    data: dict = {'ok': True, 'result': [get_update(i) for i in range(1, args.updates + 1)]}
+    schema_class = marshmallow_dataclass.class_schema(GetUpdatesResponse)
+    schema = schema_class()
+    assert decode(GetUpdatesResponse, data) == schema.load(data)
+
+    timings: list[tuple[str, float]] = [
+        ('schema per response', best_time(lambda: schema_class().load(data), args.repeat)),
+        ('cached schema', best_time(lambda: schema.load(data), args.repeat)),
+        ('decoder', best_time(lambda: decode(GetUpdatesResponse, data), args.repeat)),
+    ]
+    baseline: float = timings[0][1]
+    rows: list[list] = [
+        [name, f'{seconds / args.updates * 1e6:.2f}', f'{baseline / seconds:.1f}x'] for name, seconds in timings
+    ]
+    print(f'{args.updates} updates per response')
+    print_table(['decoding', 'µs/update', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
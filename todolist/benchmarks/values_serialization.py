@@ -0,0 +1,77 @@
+"""
+Compare CPU time per item of the goal, category and comment lists serialized from model instances with the model
+serializers and from values() rows with their values plans
+
+'serialize' times the representation of already loaded objects or rows only, 'load + serialize' includes running
+the query and building the instances or rows. Times are process CPU time, the best out of the runs.
+
+    python -m benchmarks.values_serialization [--items 1000] [--repeat 20]
+"""
+import argparse
+import time
+from typing import Callable
+
+from benchmarks import print_table, rolled_back, setup
+
+setup()
+
+from django.db.models import QuerySet  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+
+from benchmarks.denormalized_board import create_data  # noqa: E402
+from goals.models import Goal, GoalCategory, GoalComment  # noqa: E402
+from goals.serializers import GoalCategorySerializer, GoalCommentSerializer, GoalSerializer  # noqa: E402
+from goals.values import ValuesPlan, get_values_plan  # noqa: E402
+
+
+def best_cpu(func: Callable[[], object], repeat: int) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        started: float = time.process_time()
+        func()
+        times.append(time.process_time() - started)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000, help='Items per list')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows: list[list] = []
+    with rolled_back():
+        create_data(boards=1, member_boards=1, goals=args.items, comments=1)
+        lists: list[tuple[str, type[serializers.Serializer], QuerySet]] = [
+            ('goals', GoalSerializer, Goal.objects.select_related('user').order_by('title')[:args.items]),
+            ('categories', GoalCategorySerializer, GoalCategory.objects.select_related('user').order_by('title')),
+            ('comments', GoalCommentSerializer, GoalComment.objects.select_related('user').order_by('-created')),
+        ]
+        for name, serializer_class, queryset in lists:
+            plan: ValuesPlan = get_values_plan(serializer_class)
+            values: QuerySet = queryset.values(*plan.lookups)
+            instances: list = list(queryset)
+            value_rows: list[dict] = list(values)
+            assert plan.build_many(value_rows) == serializer_class(instances, many=True).data
+
+            timings: list[float] = [
+                best_cpu(lambda: serializer_class(instances, many=True).data, args.repeat),
+                best_cpu(lambda: plan.build_many(value_rows), args.repeat),
+                best_cpu(lambda: serializer_class(queryset.all(), many=True).data, args.repeat),
+                best_cpu(lambda: plan.build_many(values.all()), args.repeat),
+            ]
+            per_item: list[float] = [seconds * 1_000_000 / len(instances) for seconds in timings]
+            rows.append([
+                name, len(instances),
+                f'{per_item[0]:.1f}', f'{per_item[1]:.1f}', f'{per_item[0] / per_item[1]:.1f}x',
+                f'{per_item[2]:.1f}', f'{per_item[3]:.1f}', f'{per_item[2] / per_item[3]:.1f}x',
+            ])
+
+    print('CPU us per item, serialize / load + serialize')
+    print_table(
+        ['list', 'items', 'serializer', 'values', 'speedup', 'serializer', 'values', 'speedup'], rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Replay updates to the bot webhook at a target rate and measure ingestion latency and handling throughput
+
+The updates are read from a file with one update as sent by telegram per line, or generated as '/goals' messages
+from authorized users of several chats, which can be saved with --save to be replayed later. The webhook is served
+by 'runserver' and the updates are handled by 'runbot --webhook', both run as separate processes; replies of the
+bot go to a local fake telegram API, which answers sendMessage after a delay standing in for the network round trip.
+
+Handling is measured from the first request to the webhook until the queue is empty. Generated users and the chats
+of replayed updates are committed to the database and deleted at the end, so replay recorded updates against a
+development database only.
+
+    python -m benchmarks.webhook_replay [--updates FILE | --chats 50 --messages 10 [--save FILE]] [--rate 200]
+        [--workers 8] [--latency 50]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks import print_table, setup
+
+setup()
+
+from benchmarks.bot_runtime import FakeTelegram  # noqa: E402
+from bot.models import QueuedUpdate, TgUser  # noqa: E402
+from bot.queue import get_update_chat_id  # noqa: E402
+from core.models import User  # noqa: E402
+
+USERNAME_PREFIX: str = 'benchmark-webhook-replay-'
+SECRET: str = 'benchmark'
+
+
+def generate_updates(chats: int, messages: int) -> list[dict]:
+    """Return '/goals' messages of the given number of chats, as sent by telegram"""
+    chat_ids: list[int] = list(range(10 ** 9, 10 ** 9 + chats))
+    return [
+        {
+            'update_id': 1 + i * chats + j,
+            'message': {
+                'message_id': i + 1, 'chat': {'id': chat_id, 'type': 'private'}, 'date': 1700000000, 'text': '/goals',
+            },
+        }
+        for i in range(messages) for j, chat_id in enumerate(chat_ids)
+    ]
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30) -> None:
+    deadline: float = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Nothing is listening on port {port}')
+
+
+def replay(updates: list[dict], url: str, rate: float, senders: int) -> tuple[list[float], float]:
+    """Post the updates to the webhook, starting one every 1 / rate seconds
+
+    Returns:
+        Latencies of the requests in seconds and the time the first request was sent
+
+    """
+    local = threading.local()
+    started: float = time.perf_counter() + 0.1
+
+    def post(i: int, update: dict) -> float:
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        delay: float = started + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sent: float = time.perf_counter()
+        response = local.session.post(url, json=update, headers={'X-Telegram-Bot-Api-Secret-Token': SECRET})
+        response.raise_for_status()
+        return time.perf_counter() - sent
+
+    with ThreadPoolExecutor(max_workers=senders) as executor:
+        latencies: list[float] = list(executor.map(post, range(len(updates)), updates))
+    return latencies, started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', help='File with an update per line to replay')
+    parser.add_argument('--chats', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=10, help='Messages per chat')
+    parser.add_argument('--save', help='Save the generated updates to this file')
+    parser.add_argument('--rate', type=float, default=200, help='Updates posted per second')
+    parser.add_argument('--senders', type=int, default=16, help='Connections posting updates')
+    parser.add_argument('--workers', type=int, default=8, help='Bot worker processes')
+    parser.add_argument('--latency', type=float, default=50, help='Milliseconds sendMessage takes')
+    args = parser.parse_args()
+
+    if args.updates:
+        with open(args.updates) as file:
+            updates: list[dict] = [json.loads(line) for line in file if line.strip()]
+    else:
+        updates = generate_updates(args.chats, args.messages)
+        if args.save:
+            with open(args.save, 'w') as file:
+                file.writelines(json.dumps(update) + '\n' for update in updates)
+    if QueuedUpdate.objects.exists():
+        sys.exit('The update queue is not empty')
+
+    chat_ids: set[int] = {chat_id for update in updates if (chat_id := get_update_chat_id(update)) is not None}
+    # Chats of replayed updates are created by the bot, generated ones as authorized users here
+    new_chat_ids: list[int] = sorted(
+        chat_ids - set(TgUser.objects.filter(chat_id__in=chat_ids).values_list('chat_id', flat=True))
+    )
+    if not args.updates:
+        users: list[User] = User.objects.bulk_create(
+            User(username=f'{USERNAME_PREFIX}{chat_id}', password='!') for chat_id in new_chat_ids
+        )
+        TgUser.objects.bulk_create(TgUser(chat_id=chat_id, user=user) for chat_id, user in zip(new_chat_ids, users))
+
+    telegram = FakeTelegram(updates, args.latency / 1000)
+    threading.Thread(target=telegram.serve_forever, daemon=True).start()
+    port: int = get_free_port()
+    env: dict = os.environ | {
+        'TELEGRAM_API_URL': telegram.url, 'TELEGRAM_BOT_TOKEN': 'benchmark', 'TELEGRAM_WEBHOOK_SECRET': SECRET,
+        'TELEGRAM_WEBHOOK_URL': '',
+    }
+    processes: list[subprocess.Popen] = [
+        subprocess.Popen(
+            [sys.executable, 'manage.py', *command], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for command in (
+            ['runserver', '--noreload', '--skip-checks', f'127.0.0.1:{port}'],
+            ['runbot', '--webhook', f'--concurrency={args.workers}'],
+        )
+    ]
+    try:
+        wait_for_port(port)
+        latencies, started = replay(updates, f'http://127.0.0.1:{port}/bot/webhook', args.rate, args.senders)
+        posted: float = time.perf_counter()
+        while QueuedUpdate.objects.exists():
+            time.sleep(0.01)
+        drained: float = time.perf_counter()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        telegram.shutdown()
+        TgUser.objects.filter(chat_id__in=new_chat_ids).delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    latencies.sort()
+    print(
+        f'{len(updates)} updates of {len(chat_ids)} chats at {args.rate:.0f}/s, {args.workers} workers, '
+        f'sendMessage takes {args.latency:.0f} ms'
+    )
+    print_table(['', 'value'], [
+        ['posted/s', f'{len(updates) / (posted - started):.1f}'],
+        ['handled/s', f'{len(updates) / (drained - started):.1f}'],
+        ['webhook p50 ms', f'{statistics.median(latencies) * 1000:.1f}'],
+        ['webhook p99 ms', f'{latencies[int(len(latencies) * 0.99)] * 1000:.1f}'],
+        ['drained after last post s', f'{drained - posted:.2f}'],
+        ['replies', telegram.replies],
+    ])
+
+
+if __name__ == '__main__':
+    main()
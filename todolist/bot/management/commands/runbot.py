@@ -1,14 +1,24 @@
 import logging
+import multiprocessing
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections, transaction
 from django.db.models import QuerySet
 from typing import Protocol
 
 from bot.models import TgUser
+from bot.queue import QueueWorker
+from bot.runtime import AsyncRuntime
+from bot.state import State, StateStore, get_state_store
 from bot.tg.client import TgClient
 from bot.tg.dc import GetUpdatesResponse, Update, Message, CallbackQuery
+from core.instrumentation import collect_timings, log_timings
+from core.metrics import bot_errors, bot_update_duration, bot_updates
 from goals.models import Goal, GoalCategory, Board, BoardParticipant
 
 logger = logging.getLogger(__name__)
@@ -16,7 +26,7 @@ logger = logging.getLogger(__name__)
 
 class Handler(Protocol):
     """Protocol for a callable handler"""
-    def __call__(self, tg_user: TgUser, msg: Message = ..., cb_data: str = ...) -> None:
+    def __call__(self, tg_user: TgUser, msg: Message = ..., cb_data: str = ..., state: State = ...) -> None:
         ...
 
 
@@ -25,20 +35,47 @@ class Command(BaseCommand):
 
     Attributes:
         help (str): Description of the command, which will be printed in help messages.
-        create_data (dict): Dictionary for storing instance creation data from users.
-            Structure: {chat_id (int): {'command': command (str), 'data': data (str)},}
         tg_client (TgClient): An instance of the telegram client class.
+        states (StateStore): Storage of the states of creation commands users are going through, shared by the
+            bot processes.
 
     """
     help = 'Run telegram bot'
-    create_data: dict = dict()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.tg_client: TgClient = TgClient()
+        self.states: StateStore = get_state_store()
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.BOT_CONCURRENCY,
+            help=f'Number of updates handled at a time. Defaults to {settings.BOT_CONCURRENCY}',
+        )
+        parser.add_argument('--serial', action='store_true', help='Handle updates one at a time in a single thread')
+        parser.add_argument(
+            '--webhook', action='store_true',
+            help='Handle updates queued by the webhook view in `concurrency` worker processes instead of polling',
+        )
 
     def handle(self, *args, **options) -> None:
-        """Main loop
+        """Run the bot
+
+        Updates of different chats are handled concurrently by the asyncio runtime, unless the serial loop or the
+        webhook workers are requested
+
+        """
+        logger.info('Bot started')
+        if options.get('serial'):
+            self.run_serial()
+        elif options.get('webhook'):
+            self.run_webhook(options['concurrency'])
+        else:
+            self.tg_client.resize_pool(options['concurrency'] + 1)
+            AsyncRuntime(self.tg_client, self.process_update, concurrency=options['concurrency']).run()
+
+    def run_serial(self) -> None:
+        """Main loop of the serial runtime
 
         Gets new updates from the telegram bot, passes the data from the update to the message or callback handler
         based on the update's contents
@@ -46,17 +83,103 @@ class Command(BaseCommand):
         """
         offset = 0
 
-        logger.info('Bot started')
         while True:
             response: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
 
             item: Update
             for item in response.result:
                 offset = item.update_id + 1
-                if item.message:
-                    self.handle_message(item.message)
-                elif item.callback_query:
-                    self.handle_callback(item.callback_query)
+                self.process_update(item)
+
+    def run_webhook(self, workers: int) -> None:
+        """Register the webhook if its URL is set and handle the queued updates in worker processes
+
+        Runs until a worker exits or the command is stopped, then stops the other workers.
+
+        Args:
+            workers (int): Number of worker processes
+
+        """
+        if settings.TELEGRAM_WEBHOOK_URL:
+            self.tg_client.set_webhook(settings.TELEGRAM_WEBHOOK_URL, secret_token=settings.TELEGRAM_WEBHOOK_SECRET)
+            logger.info('Webhook registered')
+
+        # Workers open their own database and telegram API connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes: list = [
+            context.Process(target=self.run_worker, name=f'bot-worker-{i}', daemon=True) for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        try:
+            wait([process.sentinel for process in processes])
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+        raise CommandError('A bot worker exited')
+
+    def run_worker(self) -> None:
+        """Main loop of a webhook worker process"""
+        self.tg_client = TgClient()
+        QueueWorker(self.process_update, poll_interval=settings.BOT_QUEUE_POLL_INTERVAL).run()
+
+    def process_update(self, item: Update) -> None:
+        """Handle the update, recording its metrics and logging its timings if enabled
+
+        Args:
+            item (Update): Update object
+
+        """
+        name: str = self.get_update_name(item)
+        started: float = time.perf_counter()
+        try:
+            if settings.REQUEST_TIMING:
+                with collect_timings(name) as timings:
+                    self.handle_update(item)
+                log_timings(timings, update_id=item.update_id)
+            else:
+                self.handle_update(item)
+        except Exception:
+            bot_errors.inc(handler=name)
+            raise
+        finally:
+            bot_update_duration.observe(time.perf_counter() - started, handler=name)
+            bot_updates.inc(handler=name)
+
+    def handle_update(self, item: Update) -> None:
+        """Pass the update to the message or callback handler based on its contents
+
+        Args:
+            item (Update): Update object
+
+        """
+        if item.message:
+            self.handle_message(item.message)
+        elif item.callback_query:
+            self.handle_callback(item.callback_query)
+
+    def get_update_name(self, item: Update) -> str:
+        """Return the name the update's timings are logged under: its command if it has a known one, else its kind
+
+        Args:
+            item (Update): Update object
+
+        Returns:
+            str: Name such as 'bot:/goals', 'bot:message' or 'bot:callback'
+
+        """
+        if item.message:
+            command, kind = item.message.text, 'message'
+        elif item.callback_query:
+            command, kind = item.callback_query.data, 'callback'
+        else:
+            return 'bot:other'
+        return f'bot:{command}' if self.get_handler(command) else f'bot:{kind}'
 
     def handle_message(self, msg: Message) -> None:
         """ Handle a message from a user
@@ -130,8 +253,8 @@ class Command(BaseCommand):
 
         if command_handler:
             command_handler(tg_user, msg)
-        elif tg_user.chat_id in self.create_data:
-            self.handle_create(tg_user, msg)
+        elif state := self.states.get(tg_user.chat_id):
+            self.continue_creation(tg_user, state, msg)
         else:
             self.tg_client.send_message(chat_id=tg_user.chat_id, text='Unknown command')
 
@@ -154,15 +277,32 @@ class Command(BaseCommand):
         }
         return commands.get(command)
 
+    def continue_creation(self, tg_user: TgUser, state: State, msg: Message = None, cb_data: str = None) -> None:
+        """Pass the data to the handler of the creation command the user is going through
+
+        Args:
+            tg_user (TgUser): Telegram user object
+            state (State): Creation state of the user's chat
+            msg (:obj:`Message`, optional): Message object
+            cb_data (:obj:`str`, optional): Callback data
+
+        """
+        command_handler: Handler = self.get_handler(state.command)
+        if not command_handler:
+            self.clear_creation_data(tg_user.chat_id, send_error_msg=True)
+            return
+
+        command_handler(tg_user, msg, cb_data, state=state)
+
     def clear_creation_data(self, chat_id: int, send_error_msg: bool = False) -> None:
-        """Remove the user's data from self.create_data
+        """Remove the creation state of the user's chat
 
         Args:
             chat_id (int): User's chat id.
             send_error_msg (bool): If True, sends an error message to the user. Defaults to False.
 
         """
-        self.create_data.pop(chat_id, None)
+        self.states.clear(chat_id)
         if send_error_msg:
             self.tg_client.send_message(chat_id, text='Something went wrong, please start over')
 
@@ -220,16 +360,10 @@ class Command(BaseCommand):
 
         """
         chat_id: int = tg_user.chat_id
-        create_data: dict = self.create_data.get(chat_id)
 
-        if create_data:
+        if state := self.states.get(chat_id):
             # Creation process was already started, relay data to the creation command
-            command_handler = self.get_handler(create_data.get('command'))
-            if not command_handler:
-                self.clear_creation_data(chat_id, send_error_msg=True)
-                return
-
-            command_handler(tg_user, msg, cb_data)
+            self.continue_creation(tg_user, state, msg, cb_data)
         else:
             # Send user buttons with available creation commands
             buttons = [
@@ -243,7 +377,7 @@ class Command(BaseCommand):
     def handle_cancel(self, tg_user: TgUser, msg: Message) -> None:
         """Handle /cancel command
 
-        Removes creation data for the user's chat id from self.creation_data, sends user a message.
+        Removes the creation state of the user's chat, sends user a message.
 
         Args:
             tg_user (TgUser): Telegram user object
@@ -253,20 +387,22 @@ class Command(BaseCommand):
         self.clear_creation_data(tg_user.chat_id)
         self.tg_client.send_message(tg_user.chat_id, text='Creation cancelled')
 
-    def handle_create_goal(self, tg_user: TgUser, msg: Message = None, cb_data: str = None):
+    def handle_create_goal(
+        self, tg_user: TgUser, msg: Message = None, cb_data: str = None, state: State | None = None
+    ) -> None:
         """Handle /creategoal command
 
         Args:
             tg_user (TgUser): Telegram user object
             msg (:obj:`Message`, optional): Message object
             cb_data (:obj:`str`, optional): Callback data
+            state (:obj:`State`, optional): Creation state of the user's chat. Creation is started if not provided.
 
         """
         chat_id: int = tg_user.chat_id
-        create_data: dict = self.create_data.get(chat_id)
 
         # Step 1: creation hasn't been started yet
-        if create_data is None:
+        if state is None:
             # Get existing categories' titles
             category_titles: QuerySet = (
                 GoalCategory.objects.filter(user_id=tg_user.user_id)
@@ -278,21 +414,25 @@ class Command(BaseCommand):
                 self.tg_client.send_message(chat_id=chat_id, text=no_categories_message)
                 return
 
+            # Store the command for the following steps before the user can answer
+            self.states.start(chat_id, '/creategoal')
+
             # Send a message with category titles as buttons
             choose_category_msg = 'Please choose a category from the following:\n'
             markup = self.generate_buttons_markup(category_titles)
             self.tg_client.send_message(chat_id=chat_id, text=choose_category_msg, reply_markup=markup)
 
-            # Store user's chat id and the command for the following steps
-            self.create_data[chat_id] = dict(command='/creategoal')
-
         # Step 2: creation started, expecting category title
         elif cb_data:
-            create_data['data'] = cb_data
-            self.tg_client.send_message(chat_id, text='Please enter goal title:')
+            # Skipped if the step was taken by another worker
+            if self.states.advance(chat_id, state, data=cb_data):
+                self.tg_client.send_message(chat_id, text='Please enter goal title:')
 
         # Step 3: category title was saved, expecting goal title
-        elif category_title := create_data.get('data'):
+        elif category_title := state.data:
+            # The goal is only created by the worker that finishes the creation
+            if not self.states.finish(chat_id, state):
+                return
             goal_title: str = msg.text
             try:
                 category: GoalCategory = GoalCategory.objects.exclude(is_deleted=True).get(title=category_title)
@@ -309,25 +449,26 @@ class Command(BaseCommand):
             markup = {'inline_keyboard': [[{'text': 'View goal', 'url': goal_url}]]}
 
             self.tg_client.send_message(chat_id, text='Goal successfully created', reply_markup=markup)
-            self.clear_creation_data(chat_id)
         else:
             # Failsafe for if something goes wrong
             self.clear_creation_data(chat_id, send_error_msg=True)
 
-    def handle_create_cat(self, tg_user: TgUser, msg: Message = None, cb_data: str = None):
+    def handle_create_cat(
+        self, tg_user: TgUser, msg: Message = None, cb_data: str = None, state: State | None = None
+    ) -> None:
         """Handle /createcat command
 
         Args:
             tg_user (TgUser): Telegram user object
             msg (:obj:`Message`, optional): Message object
             cb_data (:obj:`str`, optional): Callback data
+            state (:obj:`State`, optional): Creation state of the user's chat. Creation is started if not provided.
 
         """
         chat_id: int = tg_user.chat_id
-        create_data: dict = self.create_data.get(chat_id)
 
         # Step 1: creation hasn't been started yet
-        if create_data is None:
+        if state is None:
             # Get existing boards' titles
             board_titles: QuerySet = (
                 Board.objects.filter(
@@ -341,20 +482,22 @@ class Command(BaseCommand):
                 self.tg_client.send_message(chat_id=chat_id, text=no_boards_message)
                 return
 
+            self.states.start(chat_id, '/createcat')
+
             # Send a message with board titles as buttons
             choose_board_msg = 'Please choose a board from the following:\n'
             markup = self.generate_buttons_markup(board_titles)
             self.tg_client.send_message(chat_id=chat_id, text=choose_board_msg, reply_markup=markup)
 
-            self.create_data[chat_id] = dict(command='/createcat')
-
         # Step 2: creation started, expecting board title
         elif cb_data:
-            create_data['data'] = cb_data
-            self.tg_client.send_message(chat_id, text='Please enter category title:')
+            if self.states.advance(chat_id, state, data=cb_data):
+                self.tg_client.send_message(chat_id, text='Please enter category title:')
 
         # Step 3: board title was saved, expecting category title
-        elif board_title := create_data.get('data'):
+        elif board_title := state.data:
+            if not self.states.finish(chat_id, state):
+                return
             category_title: str = msg.text
             try:
                 board: Board = Board.objects.exclude(is_deleted=True).get(title=board_title)
@@ -373,30 +516,31 @@ class Command(BaseCommand):
             markup = {'inline_keyboard': [[{'text': 'View category', 'url': category_url}]]}
 
             self.tg_client.send_message(chat_id, text='Category successfully created', reply_markup=markup)
-            self.clear_creation_data(chat_id)
         else:
             # Failsafe for if something goes wrong
             self.clear_creation_data(chat_id, send_error_msg=True)
 
-    def handle_create_board(self, tg_user: TgUser, msg: Message = None, cb_data: str = None):
+    def handle_create_board(
+        self, tg_user: TgUser, msg: Message = None, cb_data: str = None, state: State | None = None
+    ) -> None:
         """Handle /createboard command
 
         Args:
             tg_user (TgUser): Telegram user object
             msg (:obj:`Message`, optional): Message object
             cb_data (:obj:`str`, optional): Callback data
+            state (:obj:`State`, optional): Creation state of the user's chat. Creation is started if not provided.
 
         """
         chat_id: int = tg_user.chat_id
-        create_data: dict = self.create_data.get(chat_id)
 
         # Step 1: creation hasn't been started yet
-        if create_data is None:
+        if state is None:
+            self.states.start(chat_id, '/createboard')
             self.tg_client.send_message(chat_id, text='Please enter board title:')
-            self.create_data[chat_id] = dict(command='/createboard')
 
         # Step 2: creation started, expecting board title
-        else:
+        elif self.states.finish(chat_id, state):
             board_title: str = msg.text
             with transaction.atomic():
                 board: Board = Board.objects.create(title=board_title)
@@ -409,4 +553,3 @@ class Command(BaseCommand):
             markup = {'inline_keyboard': [[{'text': 'View board', 'url': board_url}]]}
 
             self.tg_client.send_message(chat_id, text='Board successfully created', reply_markup=markup)
-            self.clear_creation_data(chat_id)
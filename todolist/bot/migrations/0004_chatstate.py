@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0003_remove_tguser_id_alter_tguser_chat_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatState',
+            fields=[
+                ('chat_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Telegram chat id')),
+                ('command', models.CharField(max_length=32, verbose_name='Command')),
+                ('data', models.CharField(max_length=255, null=True, verbose_name='Data')),
+                ('version', models.CharField(max_length=32, verbose_name='Version')),
+                ('expires', models.DateTimeField(verbose_name='Expires')),
+            ],
+            options={
+                'verbose_name': 'Chat state',
+                'verbose_name_plural': 'Chat states',
+                'indexes': [models.Index(fields=['expires'], name='chatstate_expires_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-18 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0004_chatstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedUpdate',
+            fields=[
+                ('update_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Update id')),
+                ('chat_id', models.BigIntegerField(null=True, verbose_name='Telegram chat id')),
+                ('data', models.JSONField(verbose_name='Update')),
+                ('received', models.DateTimeField(auto_now_add=True, verbose_name='Received')),
+            ],
+            options={
+                'verbose_name': 'Queued update',
+                'verbose_name_plural': 'Queued updates',
+                'indexes': [models.Index(fields=['chat_id', 'update_id'], name='queuedupdate_chat_idx')],
+            },
+        ),
+    ]
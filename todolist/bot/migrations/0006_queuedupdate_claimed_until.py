@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0005_queuedupdate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedupdate',
+            name='claimed_until',
+            field=models.DateTimeField(null=True, verbose_name='Claimed until'),
+        ),
+    ]
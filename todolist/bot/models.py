@@ -23,3 +23,46 @@ class TgUser(models.Model):
         if self._state.adding:
             self.verification_code = self._generate_verification_code()
         return super(TgUser, self).save(*args, **kwargs)
+
+
+class ChatState(models.Model):
+    """
+    State of a creation command a chat is going through, kept by bot.state.DatabaseStateStore
+
+    Rows whose expiry has passed are treated as missing and deleted when the next command is started.
+    """
+    chat_id = models.BigIntegerField(verbose_name=_('Telegram chat id'), primary_key=True)
+    command = models.CharField(verbose_name=_('Command'), max_length=32)
+    data = models.CharField(verbose_name=_('Data'), max_length=255, null=True)
+    # Changed by every transition, so a transition only succeeds from the state it was decided on
+    version = models.CharField(verbose_name=_('Version'), max_length=32)
+    expires = models.DateTimeField(verbose_name=_('Expires'))
+
+    class Meta:
+        verbose_name = _('Chat state')
+        verbose_name_plural = _('Chat states')
+        indexes = [
+            models.Index(fields=('expires', ), name='chatstate_expires_idx'),
+        ]
+
+
+class QueuedUpdate(models.Model):
+    """
+    Update received by the webhook, waiting to be handled by a bot worker. See bot.queue.
+
+    Deleted once handled. Telegram repeats updates it could not deliver, so they are stored by their id only once.
+    """
+    update_id = models.BigIntegerField(verbose_name=_('Update id'), primary_key=True)
+    # Updates of a chat are handled in order, updates without a chat in any order
+    chat_id = models.BigIntegerField(verbose_name=_('Telegram chat id'), null=True)
+    data = models.JSONField(verbose_name=_('Update'))
+    received = models.DateTimeField(verbose_name=_('Received'), auto_now_add=True)
+    # Set while a worker handles the update, the update is handled again once it passes if the worker stopped
+    claimed_until = models.DateTimeField(verbose_name=_('Claimed until'), null=True)
+
+    class Meta:
+        verbose_name = _('Queued update')
+        verbose_name_plural = _('Queued updates')
+        indexes = [
+            models.Index(fields=('chat_id', 'update_id'), name='queuedupdate_chat_idx'),
+        ]
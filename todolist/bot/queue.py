@@ -0,0 +1,135 @@
+import datetime
+import json
+import logging
+import select
+from typing import Callable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from bot.models import QueuedUpdate
+from bot.tg.dc import Update
+from bot.tg.decoding import decode
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL: str = 'bot_updates'
+
+
+def get_update_chat_id(data: dict) -> int | None:
+    """Return the id of the chat a received update comes from, if it has one"""
+    message: dict | None = data.get('message') or (data.get('callback_query') or {}).get('message')
+    if isinstance(message, dict) and isinstance(message.get('chat'), dict):
+        return message['chat'].get('id')
+    return None
+
+
+def enqueue_update(data: dict) -> bool:
+    """Store an update received by the webhook and wake up the workers
+
+    The update is inserted and the workers are notified by one statement, unless the update is already queued.
+
+    Args:
+        data (dict): Update as sent by telegram, with an integer 'update_id'
+
+    Returns:
+        bool: False if the update was already queued
+
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            WITH inserted AS (
+                INSERT INTO {QueuedUpdate._meta.db_table} (update_id, chat_id, data, received)
+                VALUES (%s, %s, %s::jsonb, now())
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            SELECT pg_notify(%s, '') FROM inserted
+            ''',
+            [data['update_id'], get_update_chat_id(data), json.dumps(data), NOTIFY_CHANNEL],
+        )
+        return cursor.fetchone() is not None
+
+
+def process_next_update(handler: Callable[[Update], None]) -> int | None:
+    """Handle the oldest unclaimed update whose chat has no earlier update queued
+
+    The update is claimed for BOT_QUEUE_CLAIM_TIMEOUT seconds by a short transaction, then handled outside
+    of any transaction and deleted, so no row lock is held while the handler calls telegram. An update claimed
+    by a worker that stopped in the middle is handled again once its claim expires. An update whose handling
+    fails is logged and deleted.
+
+    Args:
+        handler (Callable): Function handling an update
+
+    Returns:
+        int | None: Id of the handled update or None if there are no updates to handle
+
+    """
+    now = timezone.now()
+    # A claimed update stays queued until it is handled, so the next one of its chat waits for it
+    earlier = QueuedUpdate.objects.filter(chat_id=OuterRef('chat_id'), update_id__lt=OuterRef('update_id'))
+    with transaction.atomic():
+        queued: QueuedUpdate | None = (
+            QueuedUpdate.objects.select_for_update(skip_locked=True)
+            .filter(~Exists(earlier), Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+            .order_by('update_id')
+            .first()
+        )
+        if queued is None:
+            return None
+        queued.claimed_until = now + datetime.timedelta(seconds=settings.BOT_QUEUE_CLAIM_TIMEOUT)
+        queued.save(update_fields=('claimed_until', ))
+
+    try:
+        handler(decode(Update, queued.data))
+    except Exception:
+        logger.exception(f'Failed to handle update {queued.update_id}')
+    # Unless the claim expired and another worker claimed the update meanwhile
+    QueuedUpdate.objects.filter(update_id=queued.update_id, claimed_until=queued.claimed_until).delete()
+    return queued.update_id
+
+
+class QueueWorker:
+    """
+    Worker handling queued updates until it is stopped
+
+    While the queue is empty, the worker waits for a notification of a new update on its database connection,
+    or for `poll_interval` seconds in case a notification was missed.
+
+    Args:
+        handler (Callable): Function handling an update
+        poll_interval (float): Maximum seconds to wait while the queue is empty
+
+    """
+    def __init__(self, handler: Callable[[Update], None], poll_interval: float):
+        self.handler: Callable[[Update], None] = handler
+        self.poll_interval: float = poll_interval
+        # Connection of the database driver that LISTENs for new updates
+        self.listening = None
+
+    def run(self) -> None:
+        while True:
+            if process_next_update(self.handler) is None:
+                self.wait()
+
+    def wait(self) -> None:
+        """Wait for a new update to be enqueued"""
+        connection.ensure_connection()
+        if self.listening is not connection.connection:
+            # Updates enqueued before the connection listened are found by the next attempt
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            self.listening = connection.connection
+            return
+
+        listening = self.listening
+        # Notifications may have been received along with the results of earlier statements
+        if not listening.notifies:
+            if select.select([listening], [], [], self.poll_interval) == ([], [], []):
+                return
+            listening.poll()
+        listening.notifies.clear()
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from bot.tg.client import TgClient
+from bot.tg.dc import GetUpdatesResponse, Update
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def get_chat_id(update: Update) -> int | None:
+    """Return the id of the chat the update comes from, if it has one"""
+    if update.message:
+        return update.message.chat.id
+    if update.callback_query:
+        return update.callback_query.message.chat.id
+    return None
+
+
+class AsyncRuntime:
+    """
+    Bot runtime processing updates of different chats concurrently
+
+    Updates are fetched by long polling and handled by the synchronous handler in a pool of `concurrency` threads,
+    where ORM calls and telegram API requests may block. Like the serial loop, every thread keeps its database
+    connection open, so there are at most `concurrency` connections. Updates of one chat are handled one at a time,
+    in the order they were received. At most `max_pending` updates are held at a time, including the ones waiting
+    for an earlier update of their chat; polling waits while the limit is reached.
+
+    Updates are acknowledged to telegram by the next poll, so updates being handled when the process is killed are
+    lost, as with the serial loop. An update whose handling fails is logged and skipped.
+
+    Args:
+        tg_client (TgClient): Client used to poll for updates
+        handler (Callable): Synchronous function handling an update
+        concurrency (int): Number of updates handled at a time
+        max_pending (:obj:`int`, optional): Number of updates held at a time. Defaults to 10 times the concurrency.
+
+    """
+    def __init__(
+        self, tg_client: TgClient, handler: Callable[[Update], None], concurrency: int, max_pending: int | None = None
+    ):
+        self.tg_client: TgClient = tg_client
+        self.handler: Callable[[Update], None] = handler
+        self.concurrency: int = concurrency
+        self.max_pending: int = max_pending or concurrency * 10
+        self.tails: dict[int, asyncio.Task] = {}
+
+    def run(self) -> None:
+        asyncio.run(self.main())
+
+    async def main(self) -> None:
+        self.pending = asyncio.Semaphore(self.max_pending)
+        self.tasks: set[asyncio.Task] = set()
+        offset: int = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='bot') as self.executor:
+            try:
+                while True:
+                    response: GetUpdatesResponse = await asyncio.to_thread(self.tg_client.get_updates, offset=offset)
+                    for update in response.result:
+                        offset = update.update_id + 1
+                        await self.pending.acquire()
+                        self.schedule(update)
+            finally:
+                # Let the updates that were received be handled before the executor is shut down
+                if self.tasks:
+                    await asyncio.wait(self.tasks)
+
+    def schedule(self, update: Update) -> None:
+        """Start handling the update after the previous update of its chat"""
+        chat_id: int | None = get_chat_id(update)
+        previous: asyncio.Task | None = self.tails.get(chat_id) if chat_id is not None else None
+        task: asyncio.Task = asyncio.create_task(self.process(update, previous))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        if chat_id is not None:
+            self.tails[chat_id] = task
+            task.add_done_callback(lambda done: self.tails.pop(chat_id) if self.tails.get(chat_id) is done else None)
+
+    async def process(self, update: Update, previous: asyncio.Task | None) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait((previous, ))
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.handler, update)
+        except Exception:
+            logger.exception(f'Failed to handle update {update.update_id}')
+        finally:
+            self.pending.release()
@@ -0,0 +1,156 @@
+import abc
+import dataclasses
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from bot.models import ChatState
+
+STATE_KEY: str = 'bot:state:{chat_id}'
+CLAIM_KEY: str = 'bot:state-claim:{chat_id}:{version}'
+
+
+def _new_version() -> str:
+    # Versions are random, so a version of a cleared state is never taken again by a new state
+    return uuid.uuid4().hex
+
+
+@dataclasses.dataclass(frozen=True)
+class State:
+    """State of a creation command a chat is going through
+
+    Attributes:
+        command (str): Command that started the creation, e.g. '/creategoal'
+        data (:obj:`str`, optional): Data given by the user in an earlier step
+        version (str): Version the state was read at
+
+    """
+    command: str
+    data: str | None = None
+    version: str = dataclasses.field(default_factory=_new_version)
+
+
+class StateStore(abc.ABC):
+    """
+    Storage of the chats' creation states shared by the bot processes
+
+    States expire `ttl` seconds after their last change, so abandoned creations are forgotten. Transitions take the
+    state they were decided on and only succeed if the stored state is still that version, so an update handled
+    concurrently by another worker cannot be applied twice.
+
+    Args:
+        ttl (int): Seconds a state is kept after its last change
+
+    """
+    def __init__(self, ttl: int):
+        self.ttl: int = ttl
+
+    @abc.abstractmethod
+    def get(self, chat_id: int) -> State | None:
+        """Return the state of the chat, if it has one"""
+
+    @abc.abstractmethod
+    def start(self, chat_id: int, command: str) -> State:
+        """Start the creation command in the chat, replacing any state it had"""
+
+    @abc.abstractmethod
+    def advance(self, chat_id: int, state: State, data: str) -> State | None:
+        """Save the data of the next step, return the new state or None if the state has changed since it was read"""
+
+    @abc.abstractmethod
+    def finish(self, chat_id: int, state: State) -> bool:
+        """Remove the state, return False if it has changed since it was read, e.g. it was finished by another worker"""
+
+    @abc.abstractmethod
+    def clear(self, chat_id: int) -> None:
+        """Remove the state of the chat, if it has one"""
+
+
+class DatabaseStateStore(StateStore):
+    """Store keeping states in the ChatState table, with transitions made by conditional statements"""
+
+    def get(self, chat_id: int) -> State | None:
+        row: dict | None = (
+            ChatState.objects.filter(chat_id=chat_id, expires__gt=timezone.now())
+            .values('command', 'data', 'version').first()
+        )
+        return State(**row) if row else None
+
+    def start(self, chat_id: int, command: str) -> State:
+        now = timezone.now()
+        ChatState.objects.filter(expires__lte=now).delete()
+        state = State(command=command)
+        ChatState.objects.update_or_create(
+            chat_id=chat_id, defaults=dataclasses.asdict(state) | {'expires': now + timedelta(seconds=self.ttl)}
+        )
+        return state
+
+    def advance(self, chat_id: int, state: State, data: str) -> State | None:
+        now = timezone.now()
+        new_state = State(command=state.command, data=data)
+        updated: int = ChatState.objects.filter(chat_id=chat_id, version=state.version, expires__gt=now).update(
+            data=data, version=new_state.version, expires=now + timedelta(seconds=self.ttl)
+        )
+        return new_state if updated else None
+
+    def finish(self, chat_id: int, state: State) -> bool:
+        deleted, _ = ChatState.objects.filter(
+            chat_id=chat_id, version=state.version, expires__gt=timezone.now()
+        ).delete()
+        return deleted > 0
+
+    def clear(self, chat_id: int) -> None:
+        ChatState.objects.filter(chat_id=chat_id).delete()
+
+
+class CacheStateStore(StateStore):
+    """
+    Store keeping states in the default cache, which has to be shared by the bot processes
+
+    A transition claims the version it starts from with cache.add(), so only one of concurrent transitions from a
+    version succeeds. Unlike with the database store, a command started while a transition of the previous state is
+    being saved may be overwritten by it.
+    """
+
+    def get(self, chat_id: int) -> State | None:
+        data: dict | None = cache.get(STATE_KEY.format(chat_id=chat_id))
+        return State(**data) if data else None
+
+    def start(self, chat_id: int, command: str) -> State:
+        state = State(command=command)
+        self._save(chat_id, state)
+        return state
+
+    def advance(self, chat_id: int, state: State, data: str) -> State | None:
+        if not self._claim(chat_id, state):
+            return None
+        new_state = State(command=state.command, data=data)
+        self._save(chat_id, new_state)
+        return new_state
+
+    def finish(self, chat_id: int, state: State) -> bool:
+        if not self._claim(chat_id, state):
+            return False
+        self.clear(chat_id)
+        return True
+
+    def clear(self, chat_id: int) -> None:
+        cache.delete(STATE_KEY.format(chat_id=chat_id))
+
+    def _save(self, chat_id: int, state: State) -> None:
+        cache.set(STATE_KEY.format(chat_id=chat_id), dataclasses.asdict(state), timeout=self.ttl)
+
+    def _claim(self, chat_id: int, state: State) -> bool:
+        """Take the only transition from the state, if it is still the stored one"""
+        if not cache.add(CLAIM_KEY.format(chat_id=chat_id, version=state.version), True, timeout=self.ttl):
+            return False
+        return self.get(chat_id) == state
+
+
+def get_state_store() -> StateStore:
+    """Return an instance of the store class set in BOT_STATE_STORE"""
+    return import_string(settings.BOT_STATE_STORE)(ttl=settings.BOT_STATE_TTL)
@@ -1,32 +1,71 @@
 import logging
-import marshmallow_dataclass
+import time
 import requests
 from enum import Enum
+from requests.adapters import HTTPAdapter
 
 from django.conf import settings
 from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
+from bot.tg.decoding import decode
+from core.instrumentation import timer
+from core.metrics import tg_client_errors, tg_client_request_duration, tg_client_retries
 
 logger: logging.Logger = logging.getLogger(__name__)
 
-GetUpdatesResponseSchema = marshmallow_dataclass.class_schema(GetUpdatesResponse)
-SendMessageResponseSchema = marshmallow_dataclass.class_schema(SendMessageResponse)
-
 
 class BotMethod(str, Enum):
     """Telegram bot methods"""
     SEND_MESSAGE = 'sendMessage'
     GET_UPDATES = 'getUpdates'
+    SET_WEBHOOK = 'setWebhook'
+
+
+class TgClientError(ValueError):
+    """Error returned by the telegram bot API
+
+    Args:
+        status (int): HTTP status of the response
+        description (str): Error description given by telegram
+        retry_after (:obj:`float`, optional): Seconds to wait before the request may be repeated, given with 429
+
+    """
+    def __init__(self, status: int, description: str, retry_after: float | None = None):
+        super().__init__(f'{status}: {description}')
+        self.status: int = status
+        self.description: str = description
+        self.retry_after: float | None = retry_after
 
 
 class TgClient:
     """Telegram client
 
+    Requests are sent over a pool of keep-alive connections shared by the threads using the client. Failed
+    requests are repeated with exponential backoff up to `TELEGRAM_MAX_ATTEMPTS` times: after connection errors,
+    5xx responses and 429 responses, for which the `retry_after` given by telegram is waited instead. Read timeouts
+    are only retried for getUpdates, since a message may have been sent although its response was lost.
+
     Args:
         token (:obj:`str`, optional): Bot authorization token. If not provided, gets token from Django settings.
 
     """
     def __init__(self, token: str | None = None):
         self.token = token if token else settings.TELEGRAM_BOT_TOKEN
+        self.api_url: str = settings.TELEGRAM_API_URL
+        self.connect_timeout: float = settings.TELEGRAM_CONNECT_TIMEOUT
+        self.read_timeout: float = settings.TELEGRAM_READ_TIMEOUT
+        self.max_attempts: int = settings.TELEGRAM_MAX_ATTEMPTS
+        self.backoff: float = settings.TELEGRAM_BACKOFF
+        self.max_backoff: float = settings.TELEGRAM_MAX_BACKOFF
+
+        self.session = requests.Session()
+        # A connection for each handler thread and one for polling
+        self.resize_pool(settings.BOT_CONCURRENCY + 1)
+
+    def resize_pool(self, size: int) -> None:
+        """Keep up to the given number of connections alive, more are closed after their request"""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def get_url(self, method: BotMethod) -> str:
         """Get bot API url with the given method
@@ -38,10 +77,14 @@ class TgClient:
             str: URL string
 
         """
-        return f'https://api.telegram.org/bot{self.token}/{method}'
+        return f'{self.api_url}/bot{self.token}/{method.value}'
+
+    def get_backoff(self, attempt: int) -> float:
+        """Get the number of seconds to wait after the given failed attempt, counted from 0"""
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
 
-    def _get(self, method: BotMethod, **params) -> dict:
-        """Send GET request to the bot API with the given method and parameters
+    def _request(self, method: BotMethod, **params) -> dict:
+        """Send a request to the bot API with the given method and parameters, retrying failed requests
 
         Args:
             method (BotMethod): Method from Enum class
@@ -51,15 +94,54 @@ class TgClient:
             Response data dictionary
 
         Raises:
-            ValueError: If the response has a status other than 200
+            TgClientError: If the response has a status other than 200
+            requests.RequestException: If the request could not be sent or timed out
 
         """
         url: str = self.get_url(method=method)
-        response: requests.Response = requests.get(url, json=params)
-        if response.status_code != 200:
-            logger.error(f'{response.status_code}: {response.json().get("description")}')
-            raise ValueError('Invalid response')
-        return response.json()
+        # getUpdates holds the request for up to `timeout` seconds when there are no updates
+        timeout: tuple[float, float] = (self.connect_timeout, self.read_timeout + params.get('timeout', 0))
+        attempt: int = 0
+        while True:
+            error: Exception
+            retry: bool
+            delay: float
+            try:
+                with timer('telegram'), tg_client_request_duration.time(method=method.value):
+                    response: requests.Response = self.session.post(url, json=params, timeout=timeout)
+            except requests.RequestException as e:
+                error = e
+                retry = isinstance(e, requests.ConnectionError) or (
+                    isinstance(e, requests.Timeout) and method is BotMethod.GET_UPDATES
+                )
+                delay = self.get_backoff(attempt)
+                tg_client_errors.inc(method=method.value, error=type(e).__name__)
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = self.get_error(response)
+                retry = response.status_code == 429 or response.status_code >= 500
+                delay = error.retry_after if error.retry_after is not None else self.get_backoff(attempt)
+                tg_client_errors.inc(method=method.value, error=str(response.status_code))
+
+            attempt += 1
+            if not retry or attempt >= self.max_attempts:
+                logger.error(f'{method.value} failed after {attempt} attempts: {error}')
+                raise error
+            logger.warning(f'{method.value} failed, retrying in {delay:.1f} s: {error}')
+            tg_client_retries.inc(method=method.value)
+            time.sleep(delay)
+
+    @staticmethod
+    def get_error(response: requests.Response) -> TgClientError:
+        """Get the error described by an unsuccessful response"""
+        try:
+            data: dict = response.json()
+        except ValueError:
+            # E.g. an HTML page of a proxy
+            return TgClientError(response.status_code, response.reason)
+        retry_after: float | None = (data.get('parameters') or {}).get('retry_after')
+        return TgClientError(response.status_code, data.get('description', response.reason), retry_after)
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         """Get bot updates
@@ -68,8 +150,8 @@ class TgClient:
             GetUpdatesResponse: GetUpdatesResponse object with data from the response
 
         """
-        response_data: dict = self._get(BotMethod.GET_UPDATES, offset=offset, timeout=timeout)
-        return GetUpdatesResponseSchema().load(response_data)
+        response_data: dict = self._request(BotMethod.GET_UPDATES, offset=offset, timeout=timeout)
+        return decode(GetUpdatesResponse, response_data)
 
     def send_message(self, chat_id: int, text: str, reply_markup: dict = None) -> SendMessageResponse:
         """Send a message to a telegram chat with the given chat id
@@ -87,5 +169,20 @@ class TgClient:
         if reply_markup:
             params['reply_markup'] = reply_markup
 
-        response_data: dict = self._get(**params)
-        return SendMessageResponseSchema().load(response_data)
+        response_data: dict = self._request(**params)
+        return decode(SendMessageResponse, response_data)
+
+    def set_webhook(self, url: str, secret_token: str) -> dict:
+        """Have telegram send updates to the given url instead of serving them to get_updates
+
+        Args:
+            url (str): HTTPS URL of the webhook view
+            secret_token (str): Token sent by telegram in the X-Telegram-Bot-Api-Secret-Token header
+
+        Returns:
+            Response data dictionary
+
+        """
+        return self._request(
+            BotMethod.SET_WEBHOOK, url=url, secret_token=secret_token, allowed_updates=['message', 'callback_query']
+        )
@@ -0,0 +1,114 @@
+import dataclasses
+import types
+from functools import lru_cache
+from typing import Any, Callable, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from marshmallow import ValidationError
+
+T = TypeVar('T')
+Decoder = Callable[[Any], Any]
+
+MISSING_MESSAGE: str = 'Missing data for required field.'
+
+
+def nested_error(key: str | int, error: ValidationError) -> ValidationError:
+    """Get the error of a field or list item nested under its key, like marshmallow reports them"""
+    return ValidationError({key: error.messages})
+
+
+def get_scalar_decoder(tp: type) -> Decoder:
+    # bool is a subclass of int, but not a valid integer
+    excluded: tuple[type, ...] = (bool, ) if tp is int else ()
+    message: str = f'Not a valid {tp.__name__}.'
+
+    def decode(value: Any) -> Any:
+        if not isinstance(value, tp) or isinstance(value, excluded):
+            raise ValidationError([message])
+        return value
+    return decode
+
+
+def get_list_decoder(item_decoder: Decoder) -> Decoder:
+    def decode(value: Any) -> list:
+        if not isinstance(value, list):
+            raise ValidationError(['Not a valid list.'])
+        items: list = []
+        for i, item in enumerate(value):
+            try:
+                items.append(item_decoder(item))
+            except ValidationError as e:
+                raise nested_error(i, e)
+        return items
+    return decode
+
+
+def get_optional_decoder(decoder: Decoder) -> Decoder:
+    def decode(value: Any) -> Any:
+        return None if value is None else decoder(value)
+    return decode
+
+
+def get_dataclass_decoder(cls: type[T]) -> Callable[[Any], T]:
+    hints: dict[str, Any] = get_type_hints(cls)
+    # Name, decoder and whether the field is required, for the fields of the dataclass
+    fields: list[tuple[str, Decoder, bool]] = [
+        (
+            field.name, get_decoder(hints[field.name]),
+            field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING,
+        )
+        for field in dataclasses.fields(cls)
+    ]
+
+    def decode(value: Any) -> T:
+        if not isinstance(value, dict):
+            raise ValidationError({'_schema': ['Invalid input type.']})
+        kwargs: dict[str, Any] = {}
+        # Keys that are not fields are excluded
+        for name, field_decoder, required in fields:
+            if name in value:
+                try:
+                    kwargs[name] = field_decoder(value[name])
+                except ValidationError as e:
+                    raise nested_error(name, e)
+            elif required:
+                raise ValidationError({name: [MISSING_MESSAGE]})
+        return cls(**kwargs)
+    return decode
+
+
+@lru_cache
+def get_decoder(tp: Any) -> Decoder:
+    """
+    Get a function building an instance of the type from decoded JSON
+
+    Decoders are built once for a type from its annotations, which may be dataclasses, `int`, `str`, `bool`,
+    `list[...]` and optional types. Like the marshmallow schemas of the dataclasses with `unknown = EXCLUDE`, keys
+    that are not fields are left out, fields with a default may be missing and errors are raised as marshmallow
+    `ValidationError`. Unlike them, values are not coerced: an integer field does not accept a numeric string.
+
+    Args:
+        tp: Type to decode
+
+    Returns:
+        Decoder: Function taking the decoded JSON value and returning the instance
+
+    Raises:
+        TypeError: If the type is not supported
+
+    """
+    if dataclasses.is_dataclass(tp):
+        return get_dataclass_decoder(tp)
+    if tp in (int, str, bool):
+        return get_scalar_decoder(tp)
+    origin: Any = get_origin(tp)
+    args: tuple = get_args(tp)
+    if origin is list:
+        return get_list_decoder(get_decoder(args[0]))
+    if origin in (Union, types.UnionType) and len(args) == 2 and type(None) in args:
+        return get_optional_decoder(get_decoder(next(arg for arg in args if arg is not type(None))))
+    raise TypeError(f'Cannot decode {tp}')
+
+
+def decode(cls: type[T], data: Any) -> T:
+    """Build an instance of the dataclass from decoded JSON with its cached decoder"""
+    return get_decoder(cls)(data)
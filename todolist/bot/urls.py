@@ -1,9 +1,10 @@
 from django.urls import path
 
-from bot.views import BotVerifyView
+from bot.views import BotVerifyView, BotWebhookView
 
 app_name = 'bot'
 
 urlpatterns = [
-    path('verify', BotVerifyView.as_view(), name='verify-telegram-user')
+    path('verify', BotVerifyView.as_view(), name='verify-telegram-user'),
+    path('webhook', BotWebhookView.as_view(), name='webhook'),
 ]
@@ -1,10 +1,21 @@
+import json
+from typing import Any
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.generics import UpdateAPIView
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from rest_framework.serializers import BaseSerializer
 
 from bot.models import TgUser
+from bot.queue import enqueue_update
 from bot.tg.client import TgClient
 from core.models import User
+from core.renderers import orjson
 from bot.serializers import BotVerifySerializer
 
 
@@ -23,3 +34,29 @@ class BotVerifyView(UpdateAPIView):
         tg_user: TgUser = serializer.save()
         verify_success_msg = 'Congratulations! You have successfully linked your telegram account'
         TgClient().send_message(chat_id=tg_user.chat_id, text=verify_success_msg)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BotWebhookView(View):
+    """
+    Queue an update sent by telegram for the bot workers started by 'runbot --webhook'
+
+    Requires the TELEGRAM_WEBHOOK_SECRET setting in the X-Telegram-Bot-Api-Secret-Token header
+    """
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not settings.TELEGRAM_WEBHOOK_SECRET:
+            raise Http404
+        if not constant_time_compare(
+            request.headers.get('X-Telegram-Bot-Api-Secret-Token', ''), settings.TELEGRAM_WEBHOOK_SECRET
+        ):
+            return HttpResponseForbidden()
+
+        try:
+            data: Any = (orjson.loads if orjson else json.loads)(request.body)
+        except ValueError:
+            return HttpResponseBadRequest()
+        if not isinstance(data, dict) or type(data.get('update_id')) is not int:
+            return HttpResponseBadRequest()
+
+        enqueue_update(data)
+        return HttpResponse()
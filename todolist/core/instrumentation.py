@@ -0,0 +1,164 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from rest_framework.serializers import BaseSerializer
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Timings:
+    """
+    SQL statements and time spent in the parts of the handling of a request or a bot update
+
+    Attributes:
+        name: What was handled, e.g. the URL name of the request's view
+        queries: Number of SQL statements executed
+        durations: Seconds spent per part: 'db' for SQL statements, 'serializer' for serializing responses, etc.
+        total: Seconds spent on the whole handling
+        view_started: perf_counter() value at the start of the view, if one was called
+        running: Parts being timed by timer() blocks
+    """
+    name: str = ''
+    queries: int = 0
+    durations: dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    view_started: float | None = None
+    running: set[str] = field(default_factory=set)
+
+    def add(self, part: str, seconds: float) -> None:
+        self.durations[part] = self.durations.get(part, 0.0) + seconds
+
+    def execute_wrapper(self, execute: Callable, sql: str, params, many: bool, context: dict):
+        """Database execute wrapper counting and timing the statements"""
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - started)
+
+    def as_server_timing(self) -> str:
+        """Return the timings as a Server-Timing header value, durations in milliseconds"""
+        metrics: list[str] = [f'db;dur={self.durations.get("db", 0.0) * 1000:.2f};desc="{self.queries} queries"']
+        metrics += [
+            f'{part};dur={seconds * 1000:.2f}' for part, seconds in self.durations.items() if part != 'db'
+        ]
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def as_log_data(self) -> dict:
+        data: dict = {'name': self.name, 'queries': self.queries, 'db_ms': 0.0}
+        data |= {f'{part}_ms': round(seconds * 1000, 2) for part, seconds in self.durations.items()}
+        data['total_ms'] = round(self.total * 1000, 2)
+        return data
+
+
+_current: ContextVar[Timings | None] = ContextVar('timings', default=None)
+
+
+@contextmanager
+def collect_timings(name: str = '') -> Iterator[Timings]:
+    """Collect the SQL statements and timings of the block, on every database connection of the current thread"""
+    timings = Timings(name=name)
+    token = _current.set(timings)
+    started: float = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+            yield timings
+    finally:
+        timings.total = time.perf_counter() - started
+        _current.reset(token)
+
+
+def current_timings() -> Timings | None:
+    """Return the timings being collected by the innermost collect_timings() block, if any"""
+    return _current.get()
+
+
+@contextmanager
+def timer(part: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to the given part of the timings being collected
+
+    Does nothing when no timings are collected, and in blocks nested in a block timing the same part.
+    """
+    timings: Timings | None = _current.get()
+    if timings is None or part in timings.running:
+        yield
+        return
+
+    timings.running.add(part)
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.running.discard(part)
+        timings.add(part, time.perf_counter() - started)
+
+
+def log_timings(timings: Timings, **extra) -> None:
+    """Write the timings as a JSON log line"""
+    data: dict = timings.as_log_data() | extra
+    logger.info(json.dumps(data, separators=(',', ':')), extra={'timings': data})
+
+
+_serializer_data = BaseSerializer.data
+
+
+def instrument_serializers() -> None:
+    """Time the serialization done by DRF serializers' data property in the 'serializer' part of the timings"""
+    if getattr(BaseSerializer.data.fget, 'instrumented', False):
+        return
+
+    def data(self: BaseSerializer):
+        with timer('serializer'):
+            return _serializer_data.fget(self)
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+
+class ServerTimingMiddleware:
+    """
+    Report the SQL statements and time spent on each request
+
+    Adds a Server-Timing header with the SQL statement count and time, the serializer, view and total time, and
+    logs the same as a JSON line keyed by the URL name of the view. Work done while a streaming response is being
+    sent is not included. Enabled by the REQUEST_TIMING setting, should be the first middleware so the time spent
+    in the other ones is part of the total.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with collect_timings() as timings:
+            response: HttpResponse = self.get_response(request)
+            if timings.view_started is not None:
+                timings.add('view', time.perf_counter() - timings.view_started)
+
+        match = request.resolver_match
+        timings.name = match.view_name if match else 'unresolved'
+        response['Server-Timing'] = timings.as_server_timing()
+        log_timings(timings, method=request.method, status=response.status_code)
+        return response
+
+    @staticmethod
+    def process_view(request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        timings: Timings | None = current_timings()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
@@ -0,0 +1,369 @@
+"""
+Prometheus metrics shared by every process of the application
+
+Each process keeps the values of its samples in its own memory-mapped file in METRICS_DIR, named after its pid,
+and the metrics endpoint sums the files of all processes: gunicorn workers, the telegram bot, etc. Counters and
+histograms of processes that have exited are kept, so totals do not go down when a worker is replaced, while gauges
+only count processes that are still running. The directory should be emptied when the application is deployed.
+"""
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from core.instrumentation import Timings, collect_timings, current_timings
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, math.inf,
+)
+
+
+class ValuesFile:
+    """
+    Memory-mapped file of float samples keyed by strings, written by a single process
+
+    Layout: the number of used bytes (int32) and padding, then entries of the key length (int32), the UTF-8 key
+    padded to a multiple of 8 bytes and the value (float64). Entries are written before the used size is updated,
+    so other processes can read the file at any time.
+    """
+    initial_size: int = 64 * 1024
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self.lock = threading.Lock()
+        self.file = open(path, 'a+b')
+        size: int = os.fstat(self.file.fileno()).st_size
+        if size == 0:
+            self.file.truncate(self.initial_size)
+            size = self.initial_size
+        self.capacity: int = size
+        self.mmap = mmap.mmap(self.file.fileno(), self.capacity)
+
+        self.used: int = struct.unpack_from('i', self.mmap, 0)[0] or 8
+        self.positions: dict[str, int] = {key: position for key, position, _ in self.read_entries(self.mmap)}
+
+    @staticmethod
+    def read_entries(data: bytes | mmap.mmap) -> Iterator[tuple[str, int, float]]:
+        """Yield the key, value position and value of every entry"""
+        used: int = struct.unpack_from('i', data, 0)[0]
+        position: int = 8
+        while position < used:
+            length: int = struct.unpack_from('i', data, position)[0]
+            key: str = bytes(data[position + 4:position + 4 + length]).decode()
+            position += 4 + length + (-(4 + length) % 8)
+            yield key, position, struct.unpack_from('d', data, position)[0]
+            position += 8
+
+    @classmethod
+    def read(cls, path: Path) -> dict[str, float]:
+        """Return the samples of the file at the given path"""
+        data: bytes = path.read_bytes()
+        if len(data) < 8:
+            return {}
+        return {key: value for key, _, value in cls.read_entries(data)}
+
+    def add(self, key: str, amount: float) -> None:
+        self.add_many(((key, amount), ))
+
+    def add_many(self, amounts: Iterable[tuple[str, float]]) -> None:
+        with self.lock:
+            for key, amount in amounts:
+                position: int = self.get_position(key)
+                value: float = struct.unpack_from('d', self.mmap, position)[0]
+                struct.pack_into('d', self.mmap, position, value + amount)
+
+    def get_position(self, key: str) -> int:
+        """Return the position of the key's value, adding an entry with the value 0 for a new key"""
+        position: int | None = self.positions.get(key)
+        if position is not None:
+            return position
+
+        encoded: bytes = key.encode()
+        padded: bytes = encoded + b' ' * (-(4 + len(encoded)) % 8)
+        entry: bytes = struct.pack('i', len(encoded)) + padded + struct.pack('d', 0.0)
+        while self.used + len(entry) > self.capacity:
+            self.grow()
+
+        self.mmap[self.used:self.used + len(entry)] = entry
+        self.used += len(entry)
+        struct.pack_into('i', self.mmap, 0, self.used)
+
+        position = self.used - 8
+        self.positions[key] = position
+        return position
+
+    def grow(self) -> None:
+        self.mmap.close()
+        self.capacity *= 2
+        self.file.truncate(self.capacity)
+        self.mmap = mmap.mmap(self.file.fileno(), self.capacity)
+
+
+_values_file: ValuesFile | None = None
+_values_file_owner: tuple[str, int] | None = None
+_values_file_lock = threading.Lock()
+
+
+def get_values_file() -> ValuesFile | None:
+    """Return the values file of the current process, or None if metrics are disabled"""
+    global _values_file, _values_file_owner
+    if not settings.METRICS_ENABLED:
+        return None
+
+    owner: tuple[str, int] = (settings.METRICS_DIR, os.getpid())
+    if _values_file_owner != owner:
+        # First sample of this process, or of a process forked after recording one
+        with _values_file_lock:
+            if _values_file_owner != owner:
+                path = Path(owner[0], f'{owner[1]}.db')
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _values_file, _values_file_owner = ValuesFile(path), owner
+    return _values_file
+
+
+def is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Metric:
+    """
+    Metric family, registered for the metrics endpoint under its name
+
+    Samples are keyed by the JSON list of the family name, the sample name and the label values.
+    """
+    type: str = ''
+    registry: dict[str, 'Metric'] = {}
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = labelnames
+        self.keys: dict[tuple[str, ...], str] = {}
+        Metric.registry[name] = self
+
+    @property
+    def exposed_name(self) -> str:
+        return self.name
+
+    def get_key(self, sample: str, labels: dict[str, str]) -> str:
+        try:
+            values: tuple[str, ...] = (sample, *(labels[name] for name in self.labelnames))
+        except KeyError:
+            values = ()
+        key: str | None = self.keys.get(values)
+        if key is None:
+            if not values or len(labels) != len(self.labelnames):
+                raise ValueError(f'{self.name}: expected labels {", ".join(self.labelnames)}')
+            key = self.keys[values] = json.dumps([self.name, sample, [str(value) for value in values[1:]]])
+        return key
+
+    def add(self, sample: str, amount: float, labels: dict[str, str]) -> None:
+        values_file: ValuesFile | None = get_values_file()
+        if values_file is not None:
+            values_file.add(self.get_key(sample, labels), amount)
+
+    def expose(self, samples: dict[tuple[str, tuple[str, ...]], float]) -> list[str]:
+        """Return the text format lines of the family, given its aggregated samples"""
+        lines: list[str] = self.expose_header()
+        for (sample, values), value in sorted(samples.items()):
+            lines.append(format_sample(sample, dict(zip(self.labelnames, values)), value))
+        return lines
+
+    def expose_header(self) -> list[str]:
+        return [
+            f'# HELP {self.exposed_name} {escape(self.documentation, help_text=True)}',
+            f'# TYPE {self.exposed_name} {self.type}',
+        ]
+
+
+class Counter(Metric):
+    """Counter, exposed with the '_total' suffix"""
+    type: str = 'counter'
+
+    @property
+    def exposed_name(self) -> str:
+        return self.name + '_total'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self.add(self.name + '_total', amount, labels)
+
+
+class Gauge(Metric):
+    """Gauge summed over the running processes"""
+    type: str = 'gauge'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self.add(self.name, amount, labels)
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.add(self.name, -amount, labels)
+
+    @contextmanager
+    def track_in_progress(self, **labels: str) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    """Histogram whose per-bucket counts are recorded separately and made cumulative when exposed"""
+    type: str = 'histogram'
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets: tuple[float, ...] = buckets if buckets[-1] == math.inf else buckets + (math.inf, )
+        self.bucket_samples: tuple[str, ...] = tuple(f'bucket:{format_value(bound)}' for bound in self.buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        values_file: ValuesFile | None = get_values_file()
+        if values_file is None:
+            return
+
+        bucket: str = self.bucket_samples[bisect.bisect_left(self.buckets, value)]
+        values_file.add_many((
+            (self.get_key(bucket, labels), 1),
+            (self.get_key(self.name + '_sum', labels), value),
+            (self.get_key(self.name + '_count', labels), 1),
+        ))
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def expose(self, samples: dict[tuple[str, tuple[str, ...]], float]) -> list[str]:
+        lines: list[str] = self.expose_header()
+        for values in sorted({values for _, values in samples}):
+            labels: dict[str, str] = dict(zip(self.labelnames, values))
+            cumulative: float = 0
+            for bound in self.buckets:
+                cumulative += samples.get((f'bucket:{format_value(bound)}', values), 0)
+                lines.append(format_sample(self.name + '_bucket', labels | {'le': format_value(bound)}, cumulative))
+            lines.append(format_sample(self.name + '_sum', labels, samples.get((self.name + '_sum', values), 0)))
+            lines.append(format_sample(self.name + '_count', labels, samples.get((self.name + '_count', values), 0)))
+        return lines
+
+
+def escape(value: str, help_text: bool = False) -> str:
+    value = value.replace('\\', r'\\').replace('\n', r'\n')
+    return value if help_text else value.replace('"', r'\"')
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+def format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    if not labels:
+        return f'{name} {format_value(value)}'
+    label_text: str = ','.join(f'{label}="{escape(label_value)}"' for label, label_value in labels.items())
+    return f'{name}{{{label_text}}} {format_value(value)}'
+
+
+def generate_latest() -> str:
+    """Return the metrics of every process in the Prometheus text format"""
+    samples: dict[str, dict[tuple[str, tuple[str, ...]], float]] = defaultdict(lambda: defaultdict(float))
+    directory = Path(settings.METRICS_DIR)
+    for path in sorted(directory.glob('*.db')) if directory.is_dir() else []:
+        running: bool | None = None
+        for key, value in ValuesFile.read(path).items():
+            name, sample, values = json.loads(key)
+            metric: Metric | None = Metric.registry.get(name)
+            if metric is None:
+                continue
+            if isinstance(metric, Gauge):
+                if running is None:
+                    running = path.stem.isdigit() and is_running(int(path.stem))
+                if not running:
+                    continue
+            samples[name][(sample, tuple(values))] += value
+
+    lines: list[str] = []
+    for name, metric in Metric.registry.items():
+        lines += metric.expose(samples[name])
+    return '\n'.join(lines) + '\n'
+
+
+# Metrics of the web application
+
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'Time spent handling requests, by URL name', labelnames=('view', )
+)
+http_requests = Counter(
+    'http_requests', 'Requests handled, by URL name, method and response status',
+    labelnames=('view', 'method', 'status'),
+)
+http_db_queries = Counter('http_db_queries', 'SQL statements executed by requests, by URL name', labelnames=('view', ))
+http_requests_in_flight = Gauge('http_requests_in_flight', 'Requests being handled')
+
+# Metrics of the telegram bot
+
+bot_update_duration = Histogram(
+    'bot_update_duration_seconds', 'Time spent handling bot updates, by handler', labelnames=('handler', )
+)
+bot_updates = Counter('bot_updates', 'Bot updates processed, by handler', labelnames=('handler', ))
+bot_errors = Counter('bot_errors', 'Bot updates whose handling failed, by handler', labelnames=('handler', ))
+tg_client_request_duration = Histogram(
+    'tg_client_request_duration_seconds', 'Duration of telegram bot API calls, by method', labelnames=('method', )
+)
+tg_client_errors = Counter(
+    'tg_client_errors', 'Failed telegram bot API requests, by method and response status or exception',
+    labelnames=('method', 'error'),
+)
+tg_client_retries = Counter(
+    'tg_client_retries', 'Repeated telegram bot API requests, by method', labelnames=('method', )
+)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, response status and SQL statement count of each request under the URL name of its view
+
+    Statements are counted by the timings of ServerTimingMiddleware when it runs first, otherwise by timings
+    of its own. Enabled by the METRICS_ENABLED setting.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started: float = time.perf_counter()
+        # Nested timings would take the serializer and view parts from the Server-Timing header
+        outer: Timings | None = current_timings()
+        queries: int = outer.queries if outer is not None else 0
+        collecting = nullcontext(outer) if outer is not None else collect_timings()
+        with http_requests_in_flight.track_in_progress(), collecting as timings:
+            response: HttpResponse = self.get_response(request)
+
+        match = request.resolver_match
+        view: str = match.view_name if match else 'unresolved'
+        http_request_duration.observe(time.perf_counter() - started, view=view)
+        http_requests.inc(view=view, method=request.method, status=str(response.status_code))
+        http_db_queries.inc(timings.queries - queries, view=view)
+        return response
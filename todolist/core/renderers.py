@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson, producing the same bytes as JSONRenderer except for exponents of floats
+    (1e-7 rather than 1e-07)
+
+    Datetimes, dates, UUIDs and dict subclasses are encoded by orjson itself, other types (lazy translation
+    strings, Decimals, querysets...) are converted by DRF's encoder. Indented output, which orjson cannot produce
+    in the same form, and data orjson rejects, e.g. integers above 64 bits, are rendered by JSONRenderer,
+    as is everything when orjson is not installed.
+    """
+    encoder: JSONEncoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+        if orjson is None or not self.compact or self.ensure_ascii or self.get_indent(
+                accepted_media_type, renderer_context or {}
+        ) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret: bytes = orjson.dumps(
+                data, default=self.encoder.default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # JSONRenderer escapes the line and paragraph separators, so the output is valid JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
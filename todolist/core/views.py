@@ -1,15 +1,20 @@
 from typing import Any
 
+from django.conf import settings
 from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.contrib.auth import login, logout
+from django.views import View
 from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView, UpdateAPIView
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
+from core.metrics import generate_latest
 from core.models import User
 from core.serializers import (
     UserCreateSerializer, ProfileSerializer, UpdatePasswordSerializer, LoginSerializer,
@@ -52,3 +57,21 @@ class UpdatePasswordView(UpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class MetricsView(View):
+    """
+    Return the metrics of every process in the Prometheus text format
+
+    Requires the METRICS_TOKEN setting as a bearer token, if it is set
+    """
+    content_type: str = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not settings.METRICS_ENABLED:
+            raise Http404
+        if settings.METRICS_TOKEN and not constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'
+        ):
+            return HttpResponseForbidden()
+        return HttpResponse(generate_latest(), content_type=self.content_type)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
+from goals.models import GoalCategory, Goal, GoalComment, GoalCounter, Board, BoardParticipant, CascadeTask
 
 
 @admin.register(GoalCategory)
@@ -36,3 +36,17 @@ class BoardParticipantAdmin(admin.ModelAdmin):
     list_display = ('user', 'board', 'role', 'created', 'updated')
     search_fields = ('user__username', )
     readonly_fields = ('created', 'updated')
+
+
+@admin.register(CascadeTask)
+class CascadeTaskAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'user', 'status', 'processed', 'created', 'updated')
+    list_filter = ('status', )
+    readonly_fields = ('created', 'updated')
+
+
+@admin.register(GoalCounter)
+class GoalCounterAdmin(admin.ModelAdmin):
+    list_display = ('board', 'status', 'priority', 'due_date', 'count')
+    list_filter = ('status', 'priority')
+    search_fields = ('board__title', )
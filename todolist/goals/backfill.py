@@ -0,0 +1,44 @@
+from typing import Iterator
+
+from django.db.models import Model, OuterRef, QuerySet, Subquery
+
+
+def backfill_boards(goal_model: type[Model], comment_model: type[Model], batch_size: int) -> Iterator[tuple[str, int]]:
+    """Fill the denormalized board of goals, then of comments, in batches of consecutive ids
+
+    Every batch is a single UPDATE committed on its own when running outside of a transaction. Only rows without
+    a board are changed and the scan starts at the first of them, so an interrupted backfill continues where it
+    stopped. Model classes are passed in to allow running it from a migration with the historical models.
+
+    Args:
+        goal_model (type[Model]): Goal model
+        comment_model (type[Model]): Goal comment model
+        batch_size (int): Number of ids scanned by one statement
+
+    Yields:
+        tuple[str, int]: Model name and number of rows changed by the batch
+
+    """
+    category_model: type[Model] = goal_model._meta.get_field('category').related_model
+    sources: tuple[tuple[type[Model], QuerySet], ...] = (
+        (goal_model, category_model.objects.filter(id=OuterRef('category_id')).values('board_id')),
+        (comment_model, goal_model.objects.filter(id=OuterRef('goal_id')).values('board_id')),
+    )
+
+    for model, board_id in sources:
+        pending: QuerySet = model.objects.filter(board__isnull=True)
+        first_id: int | None = pending.order_by('id').values_list('id', flat=True).first()
+        if first_id is None:
+            continue
+
+        last_id: int = first_id - 1
+        while True:
+            batch_ids: list[int] = list(
+                model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not batch_ids:
+                break
+            last_id = batch_ids[-1]
+            yield model.__name__, pending.filter(id__gte=batch_ids[0], id__lte=last_id).update(
+                board_id=Subquery(board_id)
+            )
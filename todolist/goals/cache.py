@@ -0,0 +1,107 @@
+import hashlib
+import uuid
+from typing import Any, Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.permissions import BoardRoles
+
+BOARD_VERSION_KEY: str = 'goals:board-version:{board_id}'
+RESPONSE_KEY: str = 'goals:response:{digest}'
+
+
+def _new_version() -> str:
+    # Versions are random rather than incremented, so a counter evicted from the cache never comes back
+    # with a value that a stale response was cached under
+    return uuid.uuid4().hex
+
+
+def bump_board_versions(board_ids: Iterable[int]) -> None:
+    """
+    Invalidate cached responses that depend on the given boards once the current transaction is committed
+
+    Args:
+        board_ids: Ids of the changed boards
+    """
+    keys: dict[str, str] = {BOARD_VERSION_KEY.format(board_id=board_id): _new_version() for board_id in board_ids}
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(keys, timeout=None))
+
+
+def get_board_versions(board_ids: Iterable[int]) -> dict[int, str]:
+    """
+    Return current versions of the given boards, initializing the missing ones
+
+    Args:
+        board_ids: Board ids
+
+    Returns:
+        dict: Versions by board id
+    """
+    keys: dict[str, int] = {BOARD_VERSION_KEY.format(board_id=board_id): board_id for board_id in board_ids}
+    versions: dict[str, str] = cache.get_many(keys)
+
+    for key in keys.keys() - versions.keys():
+        # add() keeps a version set concurrently by another process
+        cache.add(key, _new_version(), timeout=None)
+        versions[key] = cache.get(key)
+
+    return {board_id: versions[key] for key, board_id in keys.items()}
+
+
+def get_if_none_match(request: Request) -> list[str]:
+    """Return entity tags from the request's If-None-Match header"""
+    header: str = request.headers.get('If-None-Match', '')
+    return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+
+class BoardVersionCacheMixin:
+    """
+    List view mixin caching responses per user and query string
+
+    Cached responses are invalidated through per-board versions that are bumped on every write to the boards
+    the user participates in, see goals.signals. Responses carry an ETag derived from the same versions,
+    and requests with a matching If-None-Match header are answered with 304 without querying the list.
+
+    Versions are kept in the default cache, so all application processes have to share it: with more than one
+    process use the database cache backend rather than the local-memory one.
+    """
+    cache_timeout: int = 60 * 60
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        digest: str = self.get_cache_digest(request)
+        etag: str = f'"{digest}"'
+
+        if etag in get_if_none_match(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        cache_key: str = RESPONSE_KEY.format(digest=digest)
+        data = cache.get(cache_key)
+        if data is None:
+            response: Response = super().list(request, *args, **kwargs)
+            cache.set(cache_key, response.data, timeout=self.cache_timeout)
+        else:
+            response = Response(data)
+
+        response['ETag'] = etag
+        return response
+
+    @staticmethod
+    def get_cache_digest(request: Request) -> str:
+        """
+        Return a digest of everything the response depends on: the view, the user, the query string,
+        the response format and versions of the boards the user participates in
+        """
+        versions: dict[int, str] = get_board_versions(BoardRoles.for_request(request).roles)
+        key_parts: tuple = (
+            request.path,
+            request.user.id,
+            request.accepted_renderer.format,
+            sorted(request.query_params.lists()),
+            sorted(versions.items()),
+        )
+        return hashlib.md5(repr(key_parts).encode(), usedforsecurity=False).hexdigest()
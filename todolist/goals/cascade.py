@@ -0,0 +1,85 @@
+import logging
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from goals.cache import bump_board_versions
+from goals.models import CascadeTask, Goal, GoalCategory
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def get_pending_goals(task: CascadeTask) -> QuerySet:
+    """Return goals of the task's board or category that are not archived yet"""
+    goals: QuerySet = Goal.objects.exclude(status=Goal.Status.archived)
+    if task.board_id:
+        return goals.filter(board_id=task.board_id)
+    return goals.filter(category_id=task.category_id)
+
+
+def get_pending_categories(task: CascadeTask) -> QuerySet:
+    """Return categories of the task's board that are not deleted yet, none for a category task"""
+    if task.board_id:
+        return GoalCategory.objects.filter(board_id=task.board_id, is_deleted=False)
+    return GoalCategory.objects.none()
+
+
+def run_batch(task: CascadeTask, batch_size: int) -> int:
+    """Archive one batch of the task's goals, or delete one batch of its categories once all goals are archived
+
+    Each batch is a single UPDATE limited to batch_size rows. Rows that were already processed are skipped,
+    so running a task again after an interruption continues where it stopped.
+
+    Args:
+        task (CascadeTask): Task to process, locked by the caller
+        batch_size (int): Maximum number of rows changed by the batch
+
+    Returns:
+        int: Number of changed rows, 0 if nothing is left to do
+
+    """
+    now = timezone.now()
+    for pending, changes in (
+        (get_pending_goals(task), {'status': Goal.Status.archived}),
+        (get_pending_categories(task), {'is_deleted': True}),
+    ):
+        batch_ids: QuerySet = pending.order_by('id').values('id')[:batch_size]
+        changed: int = pending.model.objects.filter(id__in=batch_ids).update(updated=now, **changes)
+        if changed:
+            return changed
+    return 0
+
+
+def process_next_batch(batch_size: int) -> CascadeTask | None:
+    """Process one batch of the oldest unfinished task that is not locked by another worker
+
+    The task row stays locked only while its batch runs, so several workers can share the queue.
+
+    Args:
+        batch_size (int): Maximum number of rows changed by the batch
+
+    Returns:
+        CascadeTask | None: The processed task or None if there are no tasks to process
+
+    """
+    with transaction.atomic():
+        task: CascadeTask | None = (
+            CascadeTask.objects.select_for_update(skip_locked=True, of=('self', ))
+            .select_related('category')
+            .exclude(status=CascadeTask.Status.done)
+            .order_by('id')
+            .first()
+        )
+        if task is None:
+            return None
+
+        changed: int = run_batch(task, batch_size)
+        task.processed += changed
+        task.status = CascadeTask.Status.running if changed else CascadeTask.Status.done
+        task.save(update_fields=('processed', 'status', 'updated'))
+
+        bump_board_versions([task.board_id or task.category.board_id])
+
+    logger.info(f'{task}: {task.processed} objects processed, {task.get_status_display().lower()}')
+    return task
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Iterable
+
+import psycopg2
+from django.conf import settings
+from django.db import connection, transaction
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL: str = 'goals_events'
+# Keeps notification payloads well below the 8000 bytes limit of Postgres
+NOTIFY_MAX_IDS: int = 500
+
+
+@dataclass
+class Event:
+    """
+    Change of one kind of objects of a board
+
+    Events only say what changed, clients get the changed objects through the sync endpoint.
+    """
+    kind: str
+    action: str
+    board: int
+    ids: list[int]
+    # Users whose participation in the board changed, participant events only
+    users: list[int] = field(default_factory=list)
+
+    @property
+    def topics(self) -> list[str]:
+        return [board_topic(self.board)] + [user_topic(user_id) for user_id in self.users]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(',', ':'))
+
+
+def board_topic(board_id: int) -> str:
+    return f'board:{board_id}'
+
+
+def user_topic(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+class Subscription:
+    """
+    Queue of events of the subscribed topics, consumed by one stream connection in the event loop it was created in
+    """
+    def __init__(self, broadcaster: 'Broadcaster', topics: Iterable[str], max_size: int):
+        self.broadcaster = broadcaster
+        self.topics: set[str] = set(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.overflowed: bool = False
+
+    def put(self, event: Event) -> None:
+        """Queue the event, called in the subscription's event loop"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow client misses events: close its stream, so it reconnects and syncs
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Event | None:
+        """Return the next event, None if there was none for `timeout` seconds
+
+        Raises:
+            OverflowError: If events were dropped because the subscriber did not keep up
+
+        """
+        try:
+            event: Event | None = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            raise OverflowError('Subscription queue overflowed')
+        return event
+
+    def add_topics(self, topics: Iterable[str]) -> None:
+        self.broadcaster.update(self, add=topics)
+
+    def remove_topics(self, topics: Iterable[str]) -> None:
+        self.broadcaster.update(self, remove=topics)
+
+    def close(self) -> None:
+        self.broadcaster.unsubscribe(self)
+
+
+class Broadcaster:
+    """
+    In-process fan-out of events to the subscriptions of their topics
+
+    Events can be dispatched from any thread, each subscription receives them in its own event loop.
+    """
+    def __init__(self):
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics: Iterable[str], max_size: int = 100) -> Subscription:
+        """Return a new subscription to the given topics, must be called in the consuming event loop"""
+        subscription = Subscription(self, topics, max_size)
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def update(self, subscription: Subscription, add: Iterable[str] = (), remove: Iterable[str] = ()) -> None:
+        with self._lock:
+            for topic in remove:
+                subscription.topics.discard(topic)
+                self._discard(topic, subscription)
+            for topic in add:
+                subscription.topics.add(topic)
+                self._subscriptions[topic].add(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                self._discard(topic, subscription)
+
+    def _discard(self, topic: str, subscription: Subscription) -> None:
+        subscriptions: set[Subscription] | None = self._subscriptions.get(topic)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[topic]
+
+    def dispatch(self, event: Event) -> None:
+        """Pass the event to every subscription of any of its topics"""
+        with self._lock:
+            subscriptions: set[Subscription] = set().union(
+                *(self._subscriptions.get(topic, ()) for topic in event.topics)
+            )
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, event)
+
+    @property
+    def subscription_count(self) -> int:
+        with self._lock:
+            return len(set().union(*self._subscriptions.values()))
+
+
+broadcaster = Broadcaster()
+
+
+class LocalBackend:
+    """
+    Dispatch events to the broadcaster of the current process once the transaction is committed
+
+    Only suitable for a single application process.
+    """
+    def publish(self, event: Event) -> None:
+        transaction.on_commit(lambda: broadcaster.dispatch(event))
+
+    def start(self) -> None:
+        pass
+
+
+class PostgresBackend:
+    """
+    Send events with Postgres NOTIFY, which delivers them to every process once the transaction is committed
+
+    Each process LISTENs on a dedicated connection in a background thread and dispatches received events
+    to its own broadcaster.
+    """
+    reconnect_delay: float = 1
+
+    def __init__(self):
+        self._listener: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def publish(self, event: Event) -> None:
+        with connection.cursor() as cursor:
+            for start in range(0, max(len(event.ids), 1), NOTIFY_MAX_IDS):
+                chunk = Event(**{**asdict(event), 'ids': event.ids[start:start + NOTIFY_MAX_IDS]})
+                cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, chunk.to_json()])
+
+    def start(self) -> None:
+        """Start the listener thread unless it is running already"""
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self.listen, name='goals-events-listener', daemon=True)
+                self._listener.start()
+
+    def listen(self) -> None:
+        while True:
+            try:
+                self._listen_once()
+            except psycopg2.Error:
+                logger.exception('Event listener connection failed, reconnecting')
+                time.sleep(self.reconnect_delay)
+
+    def _listen_once(self) -> None:
+        listener = psycopg2.connect(**connection.get_connection_params())
+        listener.autocommit = True
+        try:
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            while True:
+                if select.select([listener], [], [], 5) == ([], [], []):
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    notify = listener.notifies.pop(0)
+                    broadcaster.dispatch(Event(**json.loads(notify.payload)))
+        finally:
+            listener.close()
+
+
+BACKENDS: dict[str, type] = {'local': LocalBackend, 'postgres': PostgresBackend}
+_backend: LocalBackend | PostgresBackend | None = None
+
+
+def get_backend() -> LocalBackend | PostgresBackend:
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[settings.EVENT_STREAM_BACKEND]()
+    return _backend
+
+
+def publish(kind: str, action: str, board_id: int | None, ids: Iterable[int], users: Iterable[int] = ()) -> None:
+    """
+    Publish a change of objects of the given kind to the board's stream subscribers once the transaction is committed
+
+    Args:
+        kind: Kind of the changed objects, e.g. 'goal'
+        action: 'created', 'updated' or 'deleted'
+        board_id: Id of the objects' board. Nothing is published for objects without a board
+        ids: Ids of the changed objects
+        users: Ids of users whose participation in the board changed
+    """
+    if board_id is not None:
+        get_backend().publish(Event(kind=kind, action=action, board=board_id, ids=list(ids), users=list(users)))
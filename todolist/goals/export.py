@@ -0,0 +1,157 @@
+import asyncio
+import csv
+import datetime
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterable, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Model
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+FORMATS: tuple[str, ...] = ('ndjson', 'csv')
+CONTENT_TYPES: dict[str, str] = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv', 'gzip': 'application/gzip'}
+
+# Exported tables of a board: model and columns
+TABLES: dict[str, tuple[type[Model], tuple[str, ...]]] = {
+    'participants': (BoardParticipant, ('id', 'user_id', 'user__username', 'role', 'created', 'updated')),
+    'categories': (GoalCategory, ('id', 'title', 'user_id', 'is_deleted', 'created', 'updated')),
+    'goals': (
+        Goal,
+        (
+            'id', 'category_id', 'title', 'description', 'due_date', 'status', 'priority', 'user_id',
+            'created', 'updated',
+        ),
+    ),
+    'comments': (GoalComment, ('id', 'goal_id', 'text', 'user_id', 'created', 'updated')),
+}
+
+
+class Echo:
+    """File-like object returning what is written to it, lets csv.writer format single rows"""
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping the microseconds of times, which DjangoJSONEncoder drops"""
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+@contextmanager
+def snapshot() -> Iterator[None]:
+    """Atomic block reading all tables as of its start, when it is the outermost one"""
+    outermost: bool = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        yield
+
+
+def iter_rows(board_id: int, table: str) -> Iterator[dict]:
+    """Yield rows of the board's table ordered by id, fetched from a server-side cursor in chunks"""
+    model, fields = TABLES[table]
+    return model.objects.filter(board_id=board_id).order_by('id').values(*fields).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+
+
+def export_ndjson(board: Board, tables: Iterable[str]) -> Iterator[str]:
+    """Yield JSON lines: the board first, then rows of the given tables, each with a "table" key"""
+    encoder = ExportEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield encoder.encode({'table': 'board', 'id': board.id, 'title': board.title,
+                          'created': board.created, 'updated': board.updated}) + '\n'
+    for table in tables:
+        for row in iter_rows(board.id, table):
+            yield encoder.encode({'table': table, **row}) + '\n'
+
+
+def export_csv(board: Board, table: str) -> Iterator[str]:
+    """Yield CSV lines of one table of the board, starting with the header"""
+    writer = csv.writer(Echo())
+    _, fields = TABLES[table]
+    yield writer.writerow(fields)
+    for row in iter_rows(board.id, table):
+        yield writer.writerow(row[field] for field in fields)
+
+
+def buffered(lines: Iterable[str], size: int) -> Iterator[bytes]:
+    """Join lines into encoded chunks of at least `size` bytes, except for the last one"""
+    chunk: list[bytes] = []
+    length: int = 0
+    for line in lines:
+        encoded: bytes = line.encode()
+        chunk.append(encoded)
+        length += len(encoded)
+        if length >= size:
+            yield b''.join(chunk)
+            chunk, length = [], 0
+    if chunk:
+        yield b''.join(chunk)
+
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress chunks into a gzip stream on the fly"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_board(board: Board, output: str = 'ndjson', tables: Iterable[str] | None = None,
+                 compress: bool = False) -> Iterator[bytes]:
+    """
+    Yield the export of the board's participants, categories, goals and comments
+
+    Rows are fetched in chunks and written out as they arrive, so memory use does not depend on the board's size.
+    All tables are read from one snapshot.
+
+    Args:
+        board (Board): Exported board
+        output (str): 'ndjson' or 'csv'. Defaults to 'ndjson'.
+        tables (Iterable[str] | None): Exported tables, all of them if None. CSV exports exactly one table.
+        compress (bool): Compress the export with gzip. Defaults to False.
+
+    Returns:
+        Iterator[bytes]: Chunks of the export
+
+    """
+    tables = list(TABLES) if tables is None else list(tables)
+    if output == 'csv' and len(tables) != 1:
+        raise ValueError('CSV export requires exactly one table')
+
+    with snapshot():
+        lines: Iterator[str] = export_csv(board, tables[0]) if output == 'csv' else export_ndjson(board, tables)
+        chunks: Iterator[bytes] = buffered(lines, settings.EXPORT_BUFFER_SIZE)
+        yield from gzipped(chunks) if compress else chunks
+
+
+def close_in_thread(chunks: Iterator[bytes]) -> None:
+    """End the export and release the connection of the thread it ran in"""
+    chunks.close()
+    connection.close()
+
+
+async def iterate_in_thread(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pull export chunks one at a time from a dedicated thread, so ASGI servers stream them as they come
+
+    The thread is not shared with other sync code: the export keeps its snapshot transaction open there between chunks.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+    try:
+        while (chunk := await loop.run_in_executor(executor, next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        await loop.run_in_executor(executor, close_in_thread, chunks)
+        executor.shutdown(wait=False)
@@ -1,6 +1,13 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db.models import Expression, QuerySet
 from django_filters import IsoDateTimeFilter
 from django.db import models
 from django_filters.rest_framework import FilterSet
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 
 from goals.models import Goal
 
@@ -21,3 +28,56 @@ class GoalFilter(FilterSet):
     filter_overrides = {
         models.DateTimeField: {'filter_class': IsoDateTimeFilter},
     }
+
+
+class SearchVectorColumn(Expression):
+    """
+    Reference to a tsvector column of the queried model's table that is not declared as a model field
+
+    Used for database-generated columns, which Django 4.2 models cannot declare without writing to them on save.
+    """
+    output_field = SearchVectorField()
+
+    def __init__(self, column: str):
+        super().__init__()
+        self.column = column
+
+    def as_sql(self, compiler, connection) -> tuple[str, list]:
+        alias: str = compiler.query.get_initial_alias()
+        return f'{compiler.quote_name_unless_alias(alias)}.{connection.ops.quote_name(self.column)}', []
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Search filter backend using PostgreSQL full-text search over a stored tsvector column
+
+    Takes the same 'search' query parameter as the default SearchFilter. Every search term is matched as a prefix
+    and all terms must match. Unless the client requests an explicit ordering, results are ordered by rank first.
+    """
+    search_vector_column: str = 'search_vector'
+    search_config: str = 'english'
+    rank_annotation: str = 'search_rank'
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        search_query: SearchQuery | None = self.get_search_query(request)
+        if search_query is None:
+            return queryset
+
+        vector = SearchVectorColumn(self.search_vector_column)
+        queryset = queryset.alias(search_vector=vector).filter(search_vector=search_query)
+        queryset = queryset.annotate(**{self.rank_annotation: SearchRank(vector, search_query)})
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by(f'-{self.rank_annotation}', *queryset.query.order_by)
+        return queryset
+
+    def get_search_query(self, request: Request) -> SearchQuery | None:
+        """
+        Build a prefix-matching tsquery from the search terms, e.g. 'buy milk' becomes 'buy:* & milk:*'
+
+        Terms are reduced to word characters, so user input cannot produce an invalid tsquery.
+        """
+        words: list[str] = [word for term in self.get_search_terms(request) for word in re.findall(r'\w+', term)]
+        if not words:
+            return None
+        return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=self.search_config)
@@ -0,0 +1,319 @@
+import datetime
+import io
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from core.models import User
+from goals import events
+from goals.cache import bump_board_versions
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+# Characters escaped in the text format of COPY
+COPY_ESCAPES: dict[int, str] = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# Columns of imported rows that are loaded as they are, validated with the model fields. Ids and references
+# to other rows are remapped to the ids of the created rows, see BoardImporter
+COLUMNS: dict[str, tuple[type[Model], tuple[str, ...]]] = {
+    'board': (Board, ('title', 'created')),
+    'participants': (BoardParticipant, ('role', 'created')),
+    'categories': (GoalCategory, ('title', 'is_deleted', 'created')),
+    'goals': (Goal, ('title', 'description', 'due_date', 'status', 'priority', 'created')),
+    'comments': (GoalComment, ('text', 'created')),
+}
+
+# Types of the keys of imported rows that are not model columns: ids of the source rows and the participants'
+# usernames. Values of other types are rejected before the keys are used to look rows up
+KEY_TYPES: dict[str, type] = {
+    'table': str, 'id': int, 'user_id': int, 'category_id': int, 'goal_id': int, 'user__username': str,
+}
+
+
+def copy_value(value: Any) -> str:
+    """Format a value for the text format of COPY"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    return str(value)
+
+
+def copy_rows(model: type[Model], fields: Iterable[str], rows: list[tuple]) -> list[int]:
+    """
+    Insert rows into the model's table with COPY and return their ids
+
+    Ids are taken from the table's sequence beforehand. COPY fires the table's triggers like INSERT does,
+    but neither save() nor signals are involved.
+
+    Args:
+        model: Model of the table
+        fields: Names of the fields of the rows' values, except for the id
+        rows: Tuples of values
+
+    Returns:
+        list[int]: Ids of the rows, in the order of the rows
+    """
+    if not rows:
+        return []
+    table: str = model._meta.db_table
+    columns: str = ', '.join(
+        connection.ops.quote_name(model._meta.get_field(name).column) for name in ('id', *fields)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)", [table, len(rows)]
+        )
+        ids: list[int] = [row_id for row_id, in cursor.fetchall()]
+
+        data = io.StringIO()
+        for row_id, row in zip(ids, rows):
+            data.write('\t'.join(map(copy_value, (row_id, *row))))
+            data.write('\n')
+        data.seek(0)
+        cursor.copy_expert(f'COPY {connection.ops.quote_name(table)} ({columns}) FROM STDIN', data)
+    return ids
+
+
+class InvalidRow(ValueError):
+    """Row of an import that cannot be loaded, nothing of the import is saved"""
+    def __init__(self, line: int, message: str):
+        super().__init__(f'Line {line}: {message}')
+        self.line = line
+
+
+@dataclass
+class ImportResult:
+    boards: list[int] = field(default_factory=list)
+    rows: Counter = field(default_factory=Counter)
+    skipped: int = 0
+    seconds: float = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return sum(self.rows.values()) / self.seconds if self.seconds else 0
+
+
+class BoardImporter:
+    """
+    Load boards with their participants, categories, goals and comments from NDJSON lines in the export format
+
+    Each "board" line starts a new board, the rows following it belong to it. Rows are validated and inserted
+    in batches of consecutive rows of the same table with COPY, which neither calls save() nor sends signals.
+    Ids of boards, categories and goals are remapped to the ids of the created rows. The importing user becomes
+    the only owner of every imported board.
+
+    Participants are only imported with `with_participants`, which is meant for trusted imports such as the
+    importboards command: they are matched to existing users by username, participants without a user and owners
+    of the source board are skipped. Otherwise every participant row is skipped. Authors that are not participants
+    of the imported board are replaced with the importing user.
+
+    The whole import is loaded in a single transaction.
+    """
+    def __init__(self, owner: User, batch_size: int | None = None, with_participants: bool = False):
+        self.owner = owner
+        self.with_participants: bool = with_participants
+        self.batch_size: int = batch_size or settings.IMPORT_BATCH_SIZE
+        self.now = timezone.now()
+        self.result = ImportResult()
+        self.board_id: int | None = None
+        # Maps of source ids to created rows' ids, categories and goals also keep the id of their board
+        self.user_ids: dict[int, int] = {}
+        self.category_ids: dict[int, tuple[int, int]] = {}
+        self.goal_ids: dict[int, tuple[int, int]] = {}
+        self.participants: dict[int, dict[int, int]] = {}
+
+    def run(self, lines: Iterable[bytes | str]) -> ImportResult:
+        """Import the lines and return the numbers of created rows
+
+        Raises:
+            InvalidRow: If a line cannot be imported
+
+        """
+        started: float = time.perf_counter()
+        batch: list[tuple[int, dict]] = []
+        table: str | None = None
+
+        with transaction.atomic():
+            for number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    raise InvalidRow(number, 'Invalid JSON')
+                if not isinstance(row, dict):
+                    raise InvalidRow(number, f'Expected an object with "table" one of {", ".join(COLUMNS)}')
+                self.check_keys(number, row)
+                if row.get('table') not in COLUMNS:
+                    raise InvalidRow(number, f'Expected an object with "table" one of {", ".join(COLUMNS)}')
+
+                if batch and (row['table'] != table or len(batch) >= self.batch_size):
+                    self.load(table, batch)
+                    batch = []
+                table = row['table']
+                batch.append((number, row))
+                # Boards are created at once, following rows refer to them
+                if table == 'board':
+                    self.load(table, batch)
+                    batch = []
+            if batch:
+                self.load(table, batch)
+            self.finish()
+
+        self.result.seconds = time.perf_counter() - started
+        return self.result
+
+    def load(self, table: str, batch: list[tuple[int, dict]]) -> None:
+        if table != 'board' and self.board_id is None:
+            raise InvalidRow(batch[0][0], 'Rows must follow a board')
+        created: int = getattr(self, f'load_{table}')(batch)
+        self.result.rows[table] += created
+
+    @staticmethod
+    def check_keys(number: int, row: dict) -> None:
+        """Check the types of the row's keys that are not model columns"""
+        for key, key_type in KEY_TYPES.items():
+            value = row.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, key_type) or isinstance(value, bool):
+                raise InvalidRow(number, f'{key}: expected {"an integer" if key_type is int else "a string"}')
+            if key_type is str and '\x00' in value:
+                raise InvalidRow(number, f'{key}: NUL characters are not allowed')
+
+    def clean(self, number: int, row: dict, table: str) -> dict:
+        """Return the row's columns converted and validated by the model fields, missing ones get their defaults"""
+        model, columns = COLUMNS[table]
+        values: dict = {}
+        for name in columns:
+            model_field = model._meta.get_field(name)
+            if name in row:
+                value = row[name]
+            elif name == 'created':
+                value = self.now
+            else:
+                value = model_field.get_default()
+            if value is None and model_field.null:
+                values[name] = None
+                continue
+            try:
+                values[name] = model_field.clean(value, None)
+            except ValidationError as error:
+                raise InvalidRow(number, f'{name}: {" ".join(error.messages)}')
+            except (TypeError, ValueError):
+                # Fields parsing strings, e.g. dates, fail on values of other types
+                raise InvalidRow(number, f'{name}: invalid value')
+            # Postgres text cannot hold NUL characters
+            if isinstance(values[name], str) and '\x00' in values[name]:
+                raise InvalidRow(number, f'{name}: NUL characters are not allowed')
+        return values
+
+    def get_user_id(self, row: dict) -> int:
+        user_id: int | None = self.user_ids.get(row.get('user_id'))
+        if user_id not in self.participants[self.board_id]:
+            return self.owner.id
+        return user_id
+
+    def get_reference(self, number: int, row: dict, key: str, ids: dict[int, tuple[int, int]]) -> int:
+        reference: tuple[int, int] | None = ids.get(row.get(key))
+        if reference is None or reference[1] != self.board_id:
+            raise InvalidRow(number, f'{key}: no such row in the imported board')
+        return reference[0]
+
+    def load_board(self, batch: list[tuple[int, dict]]) -> int:
+        number, row = batch[0]
+        values: dict = self.clean(number, row, 'board')
+        [self.board_id] = copy_rows(
+            Board, ('is_deleted', 'updated', *values), [(False, self.now, *values.values())]
+        )
+        [owner_id] = copy_rows(
+            BoardParticipant, ('board', 'user', 'role', 'created', 'updated'),
+            [(self.board_id, self.owner.id, BoardParticipant.Role.owner, self.now, self.now)],
+        )
+        self.participants[self.board_id] = {self.owner.id: owner_id}
+        self.result.boards.append(self.board_id)
+        return 1
+
+    def load_participants(self, batch: list[tuple[int, dict]]) -> int:
+        if not self.with_participants:
+            self.result.skipped += len(batch)
+            return 0
+
+        editable_roles: dict[int, str] = dict(BoardParticipant.Role.editable_choices)
+        usernames: set[str] = {row.get('user__username') for _, row in batch}
+        users: dict[str, int] = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        board_participants: dict[int, int] = self.participants[self.board_id]
+
+        user_ids: list[int] = []
+        rows: list[tuple] = []
+        for number, row in batch:
+            values: dict = self.clean(number, row, 'participants')
+            user_id: int | None = users.get(row.get('user__username'))
+            # The importing user is the only owner of the board
+            if user_id is None or values['role'] not in editable_roles:
+                self.result.skipped += 1
+                continue
+            if 'user_id' in row:
+                self.user_ids[row['user_id']] = user_id
+            if user_id in board_participants or user_id in user_ids:
+                continue
+            user_ids.append(user_id)
+            rows.append((self.board_id, user_id, self.now, *values.values()))
+
+        ids: list[int] = copy_rows(BoardParticipant, ('board', 'user', 'updated', *COLUMNS['participants'][1]), rows)
+        board_participants.update(zip(user_ids, ids))
+        return len(ids)
+
+    def load_categories(self, batch: list[tuple[int, dict]]) -> int:
+        rows: list[tuple] = [
+            (self.board_id, self.get_user_id(row), self.now, *self.clean(number, row, 'categories').values())
+            for number, row in batch
+        ]
+        ids: list[int] = copy_rows(GoalCategory, ('board', 'user', 'updated', *COLUMNS['categories'][1]), rows)
+        self.remap(batch, ids, self.category_ids)
+        return len(ids)
+
+    def load_goals(self, batch: list[tuple[int, dict]]) -> int:
+        rows: list[tuple] = [
+            (
+                self.get_reference(number, row, 'category_id', self.category_ids), self.board_id,
+                self.get_user_id(row), self.now, *self.clean(number, row, 'goals').values(),
+            )
+            for number, row in batch
+        ]
+        ids: list[int] = copy_rows(Goal, ('category', 'board', 'user', 'updated', *COLUMNS['goals'][1]), rows)
+        self.remap(batch, ids, self.goal_ids)
+        return len(ids)
+
+    def load_comments(self, batch: list[tuple[int, dict]]) -> int:
+        rows: list[tuple] = [
+            (
+                self.get_reference(number, row, 'goal_id', self.goal_ids), self.board_id,
+                self.get_user_id(row), self.now, *self.clean(number, row, 'comments').values(),
+            )
+            for number, row in batch
+        ]
+        return len(copy_rows(GoalComment, ('goal', 'board', 'user', 'updated', *COLUMNS['comments'][1]), rows))
+
+    def remap(self, batch: list[tuple[int, dict]], ids: list[int], id_map: dict[int, tuple[int, int]]) -> None:
+        for (_, row), new_id in zip(batch, ids):
+            if 'id' in row:
+                id_map[row['id']] = (new_id, self.board_id)
+
+    def finish(self) -> None:
+        """Invalidate cached lists and notify the participants of the imported boards"""
+        bump_board_versions(self.participants)
+        for board_id, participants in self.participants.items():
+            events.publish('participant', 'created', board_id, participants.values(), participants.keys())
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from goals.backfill import backfill_boards
+from goals.models import Goal, GoalComment
+
+
+class Command(BaseCommand):
+    """Django management command that fills the denormalized board of existing goals and comments
+
+    Every batch is committed on its own, so the command can be stopped at any moment and run again later
+    to continue. The goals migrations fill the same rows, running it beforehand shortens the deployment.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Fill the board of goals and comments created before it was stored on them'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size', type=int, default=5000, help='Number of rows scanned by one statement. Defaults to 5000'
+        )
+
+    def handle(self, *args, **options) -> None:
+        totals: dict[str, int] = {Goal.__name__: 0, GoalComment.__name__: 0}
+        for model_name, changed in backfill_boards(Goal, GoalComment, options['batch_size']):
+            totals[model_name] += changed
+            self.stdout.write(f'{model_name}: {totals[model_name]} rows filled', ending='\r')
+            self.stdout.flush()
+
+        for model_name, total in totals.items():
+            self.stdout.write(self.style.SUCCESS(f'{model_name}: {total} rows filled'))
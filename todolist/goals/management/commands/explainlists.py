@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListAPIView
+from rest_framework.request import Request
+
+from core.models import User
+from goals.views import board, category, comment, goal
+
+
+class Command(BaseCommand):
+    """Django management command that prints query plans for the goals list endpoints
+
+    The queries are built by the list views themselves, so the plans always match what the endpoints run.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+        views (dict): List views to explain, by URL name.
+
+    """
+    help = 'Print EXPLAIN ANALYZE output for the canonical query of each goals list endpoint'
+    views: dict[str, type[ListAPIView]] = {
+        'goals:board-list': board.BoardListView,
+        'goals:category-list': category.GoalCategoryListView,
+        'goals:goal-list': goal.GoalListView,
+        'goals:comment-list': comment.GoalCommentListView,
+    }
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('username', help='Username of the user whose lists are queried')
+        parser.add_argument(
+            '--query', default='', help='Query string passed to every endpoint, e.g. "status__in=1,2&ordering=-created"'
+        )
+        parser.add_argument('--limit', type=int, default=100, help='Page size. Defaults to 100')
+        parser.add_argument(
+            '--endpoint', action='append', choices=tuple(self.views), help='Explain only the given endpoint(s)'
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            user: User = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist')
+
+        for url_name in options['endpoint'] or self.views:
+            queryset: QuerySet = self.get_queryset(self.views[url_name], user, options['query'])
+
+            self.stdout.write(self.style.MIGRATE_HEADING(url_name))
+            self.stdout.write(queryset[:options['limit']].explain(analyze=True, buffers=True))
+            self.stdout.write('')
+
+    @staticmethod
+    def get_queryset(view_class: type[ListAPIView], user: User, query: str) -> QuerySet:
+        """Return the filtered queryset the given list view would paginate for the given user and query string
+
+        Args:
+            view_class (type[ListAPIView]): List view class
+            user (User): Requesting user
+            query (str): Request query string
+
+        Returns:
+            QuerySet: Queryset with the view's filters and ordering applied
+
+        """
+        request = Request(RequestFactory().get(f'/?{query}'))
+        request.user = user
+        view: ListAPIView = view_class(request=request, args=(), kwargs={}, format_kwarg=None)
+
+        try:
+            return view.filter_queryset(view.get_queryset())
+        except ValidationError as e:
+            raise CommandError(f'Invalid query: {e.detail}')
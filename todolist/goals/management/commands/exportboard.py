@@ -0,0 +1,50 @@
+import sys
+from typing import BinaryIO, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from goals.export import FORMATS, TABLES, export_board
+from goals.models import Board
+
+
+class Command(BaseCommand):
+    """Django management command that writes the export of a board to a file or to the standard output
+
+    The export is written as it is read, memory use does not depend on the board's size.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Export participants, categories, goals and comments of a board as NDJSON, or one of them as CSV'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('board', type=int, help='Id of the exported board')
+        parser.add_argument('--output', choices=FORMATS, default='ndjson', help='Export format, ndjson by default')
+        parser.add_argument(
+            '--table', choices=tuple(TABLES), action='append', help='Export the given table(s) only, one for CSV'
+        )
+        parser.add_argument('--gzip', action='store_true', help='Compress the export with gzip')
+        parser.add_argument('--file', default='-', help='Path of the written file, standard output by default')
+
+    def handle(self, *args, **options) -> None:
+        try:
+            board: Board = Board.objects.get(id=options['board'])
+        except Board.DoesNotExist:
+            raise CommandError(f'Board {options["board"]} does not exist')
+        if options['output'] == 'csv' and len(options['table'] or ()) != 1:
+            raise CommandError('CSV export requires exactly one --table')
+
+        chunks: Iterator[bytes] = export_board(board, options['output'], options['table'], options['gzip'])
+        if options['file'] == '-':
+            self.write(chunks, sys.stdout.buffer)
+        else:
+            with open(options['file'], 'wb') as file:
+                self.write(chunks, file)
+            self.stderr.write(self.style.SUCCESS(f'Board {board.id} exported to {options["file"]}'))
+
+    @staticmethod
+    def write(chunks: Iterator[bytes], file: BinaryIO) -> None:
+        for chunk in chunks:
+            file.write(chunk)
+        file.flush()
@@ -0,0 +1,58 @@
+import gzip
+import sys
+from typing import BinaryIO
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.models import User
+from goals.importer import BoardImporter, ImportResult, InvalidRow
+
+GZIP_MAGIC: bytes = b'\x1f\x8b'
+
+
+class Command(BaseCommand):
+    """Django management command that imports boards from NDJSON files in the format of the board export
+
+    Files are imported in a single transaction each, gzip-compressed files are decompressed on the fly.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Import boards with their participants, categories, goals and comments from NDJSON files'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('files', nargs='+', help='Paths of the imported files, "-" for the standard input')
+        parser.add_argument('--owner', required=True, help='Username of the owner of the imported boards')
+        parser.add_argument('--batch-size', type=int, help='Rows inserted with one statement')
+
+    def handle(self, *args, **options) -> None:
+        try:
+            owner: User = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["owner"]}" does not exist')
+
+        for path in options['files']:
+            file: BinaryIO = sys.stdin.buffer if path == '-' else open(path, 'rb')
+            try:
+                result: ImportResult = BoardImporter(
+                    owner, options['batch_size'], with_participants=True
+                ).run(self.decompressed(file))
+            except InvalidRow as error:
+                raise CommandError(f'{path}: {error}')
+            finally:
+                if file is not sys.stdin.buffer:
+                    file.close()
+
+            rows: str = ', '.join(f'{count} {table}' for table, count in result.rows.items())
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: {rows} imported, {result.skipped} participants skipped '
+                f'in {result.seconds:.1f} s ({result.rows_per_second:.0f} rows/s)'
+            ))
+
+    @staticmethod
+    def decompressed(file: BinaryIO) -> BinaryIO:
+        """Return the file, or a decompressing reader of it if it starts with the gzip magic number"""
+        if file.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+            return gzip.GzipFile(fileobj=file)
+        return file
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from goals.models import Tombstone
+
+
+class Command(BaseCommand):
+    """Django management command that deletes tombstones older than SYNC_TOMBSTONE_TTL
+
+    Sync tokens of that age are rejected anyway, so their tombstones are no longer needed.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Delete tombstones of deleted objects that sync tokens can no longer refer to'
+
+    def handle(self, *args, **options) -> None:
+        deleted, _ = Tombstone.objects.filter(deleted__lt=timezone.now() - settings.SYNC_TOMBSTONE_TTL).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} tombstones deleted'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from goals.models import Goal, GoalCounter
+from goals.statistics import rebuild_goal_counters
+
+
+class Command(BaseCommand):
+    """Django management command that rebuilds the goal counters behind the board statistics from scratch
+
+    Goal writes wait until the rebuild is finished.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Rebuild goal counters of all boards or of the given boards from the goals table'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--board', type=int, action='append', help='Rebuild counters of the given board(s) only')
+
+    def handle(self, *args, **options) -> None:
+        created: int = rebuild_goal_counters(Goal, GoalCounter, options['board'])
+        self.stdout.write(self.style.SUCCESS(f'{created} goal counters rebuilt'))
@@ -0,0 +1,41 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from goals.cascade import process_next_batch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command that archives child objects of deleted boards and categories in the background
+
+    Processes the queued cascade tasks batch by batch. Several workers can run at the same time, and a worker
+    can be stopped at any moment: the interrupted task is continued by the next run.
+
+    Attributes:
+        help (str): Description of the command, which will be printed in help messages.
+
+    """
+    help = 'Process queued cascade tasks of deleted boards and categories'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.CASCADE_BATCH_SIZE,
+            help=f'Maximum number of rows changed by one statement. Defaults to {settings.CASCADE_BATCH_SIZE}',
+        )
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty instead of polling')
+        parser.add_argument(
+            '--poll-interval', type=float, default=5, help='Seconds to wait while the queue is empty. Defaults to 5'
+        )
+
+    def handle(self, *args, **options) -> None:
+        logger.info('Cascade worker started')
+        while True:
+            if process_next_batch(options['batch_size']) is not None:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:26
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently to avoid locking the tables for writes, which requires a non-atomic migration
+    atomic = False
+
+    dependencies = [
+        ('goals', '0007_alter_goalcategory_board'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='board',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['title', 'id'], name='board_active_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(fields=['user', 'board', 'role'], name='participant_user_board_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'title', 'id'], name='goal_active_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'created', 'id'], name='goal_active_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'due_date'], name='goal_active_due_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'status', 'priority'], name='goal_active_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'title', 'id'], name='category_active_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'created', 'id'], name='category_active_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['goal', '-created', '-id'], name='comment_goal_created_idx'),
+        ),
+    ]
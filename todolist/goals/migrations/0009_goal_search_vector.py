@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_list_view_indexes'),
+    ]
+
+    # The column is generated by the database and is not part of the model state: Django 4.2 models cannot declare
+    # generated columns. It is queried through goals.filters.SearchVectorColumn.
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE goals_goal ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+                ) STORED;
+                CREATE INDEX goal_search_vector_idx ON goals_goal USING gin (search_vector);
+            """,
+            reverse_sql='ALTER TABLE goals_goal DROP COLUMN search_vector;',
+        ),
+    ]
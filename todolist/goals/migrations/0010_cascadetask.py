@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0009_goal_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CascadeTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(verbose_name='Created')),
+                ('updated', models.DateTimeField(verbose_name='Updated')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'Running'), (3, 'Done')], default=1, verbose_name='Status')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Processed objects')),
+                ('board', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='goals.board', verbose_name='Board')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='goals.goalcategory', verbose_name='Category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL, verbose_name='Requested by')),
+            ],
+            options={
+                'verbose_name': 'Cascade task',
+                'verbose_name_plural': 'Cascade tasks',
+                'indexes': [models.Index(condition=models.Q(('status', 3), _negated=True), fields=['id'], name='cascadetask_unfinished_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cascadetask',
+            constraint=models.CheckConstraint(check=models.Q(('board__isnull', True), ('category__isnull', True), _connector='XOR'), name='cascadetask_one_target'),
+        ),
+    ]
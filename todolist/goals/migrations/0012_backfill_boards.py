@@ -0,0 +1,48 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:53
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+# Table to fill and the query of the board of one of its rows
+SOURCES = (
+    ('goals_goal', 'SELECT c.board_id FROM goals_goalcategory c WHERE c.id = goals_goal.category_id'),
+    ('goals_goalcomment', 'SELECT g.board_id FROM goals_goal g WHERE g.id = goals_goalcomment.goal_id'),
+)
+
+
+def fill_boards(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for table, board_id in SOURCES:
+            cursor.execute(f'SELECT min(id) FROM {table} WHERE board_id IS NULL')
+            last_id: int | None = cursor.fetchone()[0]
+            if last_id is None:
+                continue
+
+            last_id -= 1
+            while True:
+                cursor.execute(
+                    f'SELECT min(id), max(id) FROM (SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s) batch',
+                    [last_id, BATCH_SIZE],
+                )
+                first_id, last_id = cursor.fetchone()
+                if first_id is None:
+                    break
+                cursor.execute(
+                    f'UPDATE {table} SET board_id = ({board_id}) WHERE board_id IS NULL AND id BETWEEN %s AND %s',
+                    [first_id, last_id],
+                )
+
+
+class Migration(migrations.Migration):
+    # Every batch of the backfill is committed separately, an interrupted migration continues where it stopped.
+    # The statements are inlined so the migration does not change along with goals.backfill
+    atomic = False
+
+    dependencies = [
+        ('goals', '0011_goal_comment_board'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_boards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:53
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently to avoid locking the tables for writes, which requires a non-atomic migration
+    atomic = False
+
+    dependencies = [
+        ('goals', '0012_backfill_boards'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['board', 'title', 'id'], name='goal_active_board_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['board', 'created', 'id'], name='goal_active_board_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['board', '-created', '-id'], name='comment_board_created_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='goal',
+            name='goal_active_title_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='goal',
+            name='goal_active_created_idx',
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Statement level triggers see all rows changed by a statement in transition tables and apply their net change
+# to the counters with a single upsert. Counters are upserted in key order to avoid deadlocks between statements.
+UPSERT_COUNTERS = """
+    INSERT INTO goals_goalcounter (board_id, status, priority, due_date, count)
+    SELECT board_id, status, priority, due_date, sum(delta) FROM ({changes}) AS changes
+    WHERE board_id IS NOT NULL
+    GROUP BY board_id, status, priority, due_date
+    HAVING sum(delta) <> 0
+    ORDER BY board_id, status, priority, due_date
+    ON CONFLICT (board_id, status, priority, due_date)
+    DO UPDATE SET count = goals_goalcounter.count + EXCLUDED.count
+"""
+ADDED = 'SELECT board_id, status, priority, due_date, 1 AS delta FROM new_goals'
+REMOVED = 'SELECT board_id, status, priority, due_date, -1 AS delta FROM old_goals'
+
+TRIGGERS: dict[str, tuple[str, str]] = {
+    'INSERT': ('REFERENCING NEW TABLE AS new_goals', ADDED),
+    'UPDATE': ('REFERENCING OLD TABLE AS old_goals NEW TABLE AS new_goals', f'{ADDED} UNION ALL {REMOVED}'),
+    'DELETE': ('REFERENCING OLD TABLE AS old_goals', REMOVED),
+}
+
+CREATE_TRIGGERS = ''.join(
+    f"""
+    CREATE FUNCTION goals_goal_count_{event.lower()}() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        {UPSERT_COUNTERS.format(changes=changes)};
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER goals_goal_count_{event.lower()} AFTER {event} ON goals_goal {transition_tables}
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_count_{event.lower()}();
+    """
+    for event, (transition_tables, changes) in TRIGGERS.items()
+)
+DROP_TRIGGERS = ''.join(
+    f"""
+    DROP TRIGGER goals_goal_count_{event.lower()} ON goals_goal;
+    DROP FUNCTION goals_goal_count_{event.lower()}();
+    """
+    for event in TRIGGERS
+)
+
+# Counts of the existing goals. Creating the triggers locks the goals table against writes until the migration
+# commits, so no change is missed or counted twice.
+FILL_COUNTERS = """
+    INSERT INTO goals_goalcounter (board_id, status, priority, due_date, count)
+    SELECT board_id, status, priority, due_date, count(*) FROM goals_goal
+    WHERE board_id IS NOT NULL
+    GROUP BY board_id, status, priority, due_date
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0013_goal_comment_board_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'To do'), (2, 'In progress'), (3, 'Done'), (4, 'Archived')], verbose_name='Status')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Low'), (2, 'Medium'), (3, 'High'), (4, 'Critical')], verbose_name='Priority')),
+                ('due_date', models.DateField(null=True, verbose_name='Due date')),
+                ('count', models.IntegerField(default=0, verbose_name='Goals')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goal_counters', to='goals.board', verbose_name='Board')),
+            ],
+            options={
+                'verbose_name': 'Goal counter',
+                'verbose_name_plural': 'Goal counters',
+            },
+        ),
+        # Django 4.2 cannot declare NULLS NOT DISTINCT constraints, which let goals without a due date share a counter
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        ALTER TABLE goals_goalcounter ADD CONSTRAINT goalcounter_key
+                        UNIQUE NULLS NOT DISTINCT (board_id, status, priority, due_date);
+                    """,
+                    reverse_sql='ALTER TABLE goals_goalcounter DROP CONSTRAINT goalcounter_key;',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='goalcounter',
+                    constraint=models.UniqueConstraint(fields=('board', 'status', 'priority', 'due_date'), name='goalcounter_key'),
+                ),
+            ],
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+        migrations.RunSQL(sql=FILL_COUNTERS, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Statement level triggers record all rows deleted by a statement with a single insert
+CREATE_TRIGGERS = """
+    CREATE FUNCTION goals_goalcomment_tombstone() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO goals_tombstone (kind, object_id, board_id, user_id, deleted)
+        SELECT 1, id, board_id, NULL, statement_timestamp() FROM old_rows;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER goals_goalcomment_tombstone AFTER DELETE ON goals_goalcomment REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goalcomment_tombstone();
+
+    CREATE FUNCTION goals_boardparticipant_tombstone() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO goals_tombstone (kind, object_id, board_id, user_id, deleted)
+        SELECT 2, id, board_id, user_id, statement_timestamp() FROM old_rows;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER goals_boardparticipant_tombstone AFTER DELETE ON goals_boardparticipant
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION goals_boardparticipant_tombstone();
+"""
+DROP_TRIGGERS = """
+    DROP TRIGGER goals_goalcomment_tombstone ON goals_goalcomment;
+    DROP FUNCTION goals_goalcomment_tombstone();
+    DROP TRIGGER goals_boardparticipant_tombstone ON goals_boardparticipant;
+    DROP FUNCTION goals_boardparticipant_tombstone();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0014_goalcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Comment'), (2, 'Participant')], verbose_name='Kind')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('deleted', models.DateTimeField(verbose_name='Deleted')),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+            },
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='board',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='goals.board', verbose_name='Board'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['board', 'deleted'], name='tombstone_board_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(condition=models.Q(('user__isnull', False)), fields=['user', 'deleted'], name='tombstone_user_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted'], name='tombstone_deleted_idx'),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:03
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently to avoid locking the tables for writes, which requires a non-atomic migration
+    atomic = False
+
+    dependencies = [
+        ('goals', '0015_tombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(fields=['board', 'updated'], name='participant_board_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(fields=['board', 'updated'], name='goal_board_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(fields=['board', 'updated'], name='category_board_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['board', 'updated'], name='comment_board_updated_idx'),
+        ),
+    ]
@@ -33,6 +33,9 @@ class Board(DatesModelMixin):
     class Meta:
         verbose_name = _('Board')
         verbose_name_plural = _('Boards')
+        indexes = [
+            models.Index(fields=('title', 'id'), condition=models.Q(is_deleted=False), name='board_active_title_idx'),
+        ]
 
 
 class BoardParticipant(DatesModelMixin):
@@ -54,20 +57,76 @@ class BoardParticipant(DatesModelMixin):
         unique_together = ('board', 'user')
         verbose_name = _('Participant')
         verbose_name_plural = _('Participants')
+        indexes = [
+            # Every list view and permission check looks up participants by user first
+            models.Index(fields=('user', 'board', 'role'), name='participant_user_board_idx'),
+            models.Index(fields=('board', 'updated'), name='participant_board_updated_idx'),
+        ]
 
 
-class GoalCategory(DatesModelMixin):
+class LoadedValuesMixin(models.Model):
+    """
+    Remember field values as they were loaded from or last saved to the database to detect changes on save
+    """
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+        return result
+
+    def has_changed(self, field_name: str) -> bool:
+        """
+        Check that the given field was changed since the instance was loaded, False for new instances
+        """
+        loaded_values: dict = getattr(self, '_loaded_values', {})
+        return field_name in loaded_values and loaded_values[field_name] != getattr(self, field_name)
+
+
+class GoalCategory(LoadedValuesMixin, DatesModelMixin):
     title = models.CharField(verbose_name=_('Title'), max_length=255)
     user = models.ForeignKey(User, verbose_name=_('Author'), on_delete=models.PROTECT)
     board = models.ForeignKey(Board, verbose_name=_('Board'), on_delete=models.PROTECT, related_name='categories')
     is_deleted = models.BooleanField(verbose_name=_('Deleted'), default=False)
 
+    def save(self, *args, **kwargs):
+        """
+        Move goals and comments of the category along with it when its board changes
+        """
+        moved: bool = self.has_changed('board_id')
+        result = super().save(*args, **kwargs)
+        if moved:
+            Goal.objects.filter(category_id=self.id).update(board_id=self.board_id, updated=self.updated)
+            GoalComment.objects.filter(goal__category_id=self.id).update(board_id=self.board_id, updated=self.updated)
+        return result
+
     class Meta:
         verbose_name = _('Category')
         verbose_name_plural = _('Categories')
+        indexes = [
+            models.Index(
+                fields=('board', 'title', 'id'), condition=models.Q(is_deleted=False), name='category_active_title_idx'
+            ),
+            models.Index(
+                fields=('board', 'created', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='category_active_created_idx',
+            ),
+            models.Index(fields=('board', 'updated'), name='category_board_updated_idx'),
+        ]
 
 
-class Goal(DatesModelMixin):
+class Goal(LoadedValuesMixin, DatesModelMixin):
     class Status(models.IntegerChoices):
         to_do = 1, _('To do')
         in_progress = 2, _('In progress')
@@ -87,6 +146,12 @@ class Goal(DatesModelMixin):
     category = models.ForeignKey(
         to=GoalCategory, verbose_name=_('Category'), on_delete=models.PROTECT, related_name='goals'
     )
+    # Copy of category.board, lets list views and permission checks reach the board without joining categories.
+    # Kept in sync on save. Nullable because the previous release keeps inserting rows without it while migrations
+    # run, the backfillboards command fills those after the deployment
+    board = models.ForeignKey(
+        Board, verbose_name=_('Board'), on_delete=models.PROTECT, related_name='goals', null=True, editable=False
+    )
     status = models.PositiveSmallIntegerField(verbose_name=_('Status'), choices=Status.choices, default=Status.to_do)
     priority = models.PositiveSmallIntegerField(
         verbose_name=_('Priority'), choices=Priority.choices, default=Priority.medium
@@ -95,13 +160,149 @@ class Goal(DatesModelMixin):
     class Meta:
         verbose_name = _('Goal')
         verbose_name_plural = _('Goals')
+        # Partial indexes cover the active goals only, i.e. the ones with status other than Status.archived
+        indexes = [
+            models.Index(
+                fields=('board', 'title', 'id'), condition=~models.Q(status=4), name='goal_active_board_title_idx'
+            ),
+            models.Index(
+                fields=('board', 'created', 'id'), condition=~models.Q(status=4), name='goal_active_board_created_idx'
+            ),
+            models.Index(
+                fields=('category', 'due_date'), condition=~models.Q(status=4), name='goal_active_due_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'status', 'priority'), condition=~models.Q(status=4), name='goal_active_status_idx'
+            ),
+            models.Index(fields=('board', 'updated'), name='goal_board_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Take the board from the category and move comments along with the goal when its board changes
+        """
+        if self.board_id is None or self.has_changed('category_id'):
+            self.board_id = self.category.board_id
+        moved: bool = self.has_changed('board_id')
+        result = super().save(*args, **kwargs)
+        if moved:
+            self.goalcomment_set.update(board_id=self.board_id, updated=self.updated)
+        return result
 
 
-class GoalComment(DatesModelMixin):
+class GoalComment(LoadedValuesMixin, DatesModelMixin):
     text = models.TextField(verbose_name=_('Text'), validators=[MinLengthValidator(1)])
     user = models.ForeignKey(User, verbose_name=_('Author'), on_delete=models.PROTECT)
     goal = models.ForeignKey(Goal, verbose_name=_('Goal'), on_delete=models.CASCADE)
+    # Copy of goal.board, see Goal.board
+    board = models.ForeignKey(
+        Board, verbose_name=_('Board'), on_delete=models.PROTECT, related_name='comments', null=True, editable=False
+    )
 
     class Meta:
         verbose_name = _('Comment')
         verbose_name_plural = _('Comments')
+        indexes = [
+            models.Index(fields=('goal', '-created', '-id'), name='comment_goal_created_idx'),
+            models.Index(fields=('board', '-created', '-id'), name='comment_board_created_idx'),
+            models.Index(fields=('board', 'updated'), name='comment_board_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Take the board from the goal
+        """
+        if self.board_id is None or self.has_changed('goal_id'):
+            self.board_id = self.goal.board_id
+        return super().save(*args, **kwargs)
+
+
+class GoalCounter(models.Model):
+    """
+    Number of goals of a board with the given status, priority and due date
+
+    Maintained by database triggers on the goals table, so every write to goals, including bulk and queryset updates,
+    changes the counters in the same transaction. See goals.statistics.
+    """
+    board = models.ForeignKey(Board, verbose_name=_('Board'), on_delete=models.CASCADE, related_name='goal_counters')
+    status = models.PositiveSmallIntegerField(verbose_name=_('Status'), choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(verbose_name=_('Priority'), choices=Goal.Priority.choices)
+    due_date = models.DateField(verbose_name=_('Due date'), null=True)
+    count = models.IntegerField(verbose_name=_('Goals'), default=0)
+
+    class Meta:
+        verbose_name = _('Goal counter')
+        verbose_name_plural = _('Goal counters')
+        constraints = [
+            # Created with NULLS NOT DISTINCT by the migration, so goals without a due date share a counter
+            models.UniqueConstraint(fields=('board', 'status', 'priority', 'due_date'), name='goalcounter_key'),
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted comment or a removed board participant, returned by the sync endpoint
+
+    Written by database triggers, so deletions through querysets are recorded as well. See goals.sync.
+    """
+    class Kind(models.IntegerChoices):
+        comment = 1, _('Comment')
+        participant = 2, _('Participant')
+
+    kind = models.PositiveSmallIntegerField(verbose_name=_('Kind'), choices=Kind.choices)
+    object_id = models.BigIntegerField(verbose_name=_('Object id'))
+    board = models.ForeignKey(
+        Board, verbose_name=_('Board'), on_delete=models.CASCADE, related_name='+', null=True, db_index=False
+    )
+    # The removed participant's user, who also has to learn about the removal
+    user = models.ForeignKey(
+        User, verbose_name=_('User'), on_delete=models.CASCADE, related_name='+', null=True, db_index=False
+    )
+    deleted = models.DateTimeField(verbose_name=_('Deleted'))
+
+    class Meta:
+        verbose_name = _('Tombstone')
+        verbose_name_plural = _('Tombstones')
+        indexes = [
+            models.Index(fields=('board', 'deleted'), name='tombstone_board_deleted_idx'),
+            models.Index(
+                fields=('user', 'deleted'), condition=models.Q(user__isnull=False), name='tombstone_user_deleted_idx'
+            ),
+            models.Index(fields=('deleted', ), name='tombstone_deleted_idx'),
+        ]
+
+
+class CascadeTask(DatesModelMixin):
+    """
+    Queued archiving of the child objects of a deleted board or category
+
+    Processed in bounded batches by the runcascade management command. Exactly one of board and category is set.
+    """
+    class Status(models.IntegerChoices):
+        pending = 1, _('Pending')
+        running = 2, _('Running')
+        done = 3, _('Done')
+
+    board = models.ForeignKey(Board, verbose_name=_('Board'), on_delete=models.PROTECT, null=True, blank=True)
+    category = models.ForeignKey(
+        GoalCategory, verbose_name=_('Category'), on_delete=models.PROTECT, null=True, blank=True
+    )
+    user = models.ForeignKey(User, verbose_name=_('Requested by'), on_delete=models.PROTECT)
+    status = models.PositiveSmallIntegerField(verbose_name=_('Status'), choices=Status.choices, default=Status.pending)
+    processed = models.PositiveIntegerField(verbose_name=_('Processed objects'), default=0)
+
+    def __str__(self):
+        target = f'board {self.board_id}' if self.board_id else f'category {self.category_id}'
+        return f'Cascade task {self.id}: {target}'
+
+    class Meta:
+        verbose_name = _('Cascade task')
+        verbose_name_plural = _('Cascade tasks')
+        indexes = [
+            models.Index(fields=('id', ), condition=~models.Q(status=3), name='cascadetask_unfinished_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(board__isnull=True) ^ models.Q(category__isnull=True), name='cascadetask_one_target'
+            ),
+        ]
@@ -0,0 +1,290 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Decoded keyset cursor
+
+    Attributes:
+        ordering: Ordering of the queryset the cursor was issued for, including the tiebreak field
+        position: Values of the ordering fields of the boundary row, as strings
+        reverse: If True, the cursor points to the page before the boundary row
+    """
+    ordering: tuple[str, ...]
+    position: tuple[str, ...]
+    reverse: bool = False
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination keyed on the queryset's ordering fields with 'id' as a tiebreak
+
+    A page is addressed by an opaque cursor holding the ordering values of the row at its boundary, so the database
+    seeks directly to the page instead of scanning and discarding every row before an offset, and no COUNT(*) query
+    is made. Ordering fields are expected to be non-nullable fields of the model itself.
+    """
+    cursor_query_param: str = 'cursor'
+    limit_query_param: str = 'limit'
+    default_limit: int = 100
+    max_limit: int = 1000
+    tiebreak_field: str = 'id'
+    invalid_cursor_message: str = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list[Model]:
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset)
+        self.model: type[Model] = queryset.model
+
+        cursor: Cursor | None = self.decode_cursor(request)
+        if cursor and cursor.ordering != self.ordering:
+            # The client changed the ordering but kept a cursor issued for another one
+            raise NotFound(self.invalid_cursor_message)
+
+        reverse: bool = bool(cursor and cursor.reverse)
+        order_by: tuple[str, ...] = self.invert_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*order_by)
+        if cursor:
+            try:
+                queryset = queryset.filter(self.get_seek_filter(queryset.model, order_by, cursor.position))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to find out whether there is anything past this page
+        results: list[Model] = list(queryset[:self.limit + 1])
+        has_more: bool = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if results:
+            first, last = self.get_position(results[0]), self.get_position(results[-1])
+            if has_more or reverse:
+                self.next_cursor = Cursor(ordering=self.ordering, position=last)
+            if (has_more and reverse) or (cursor and not reverse):
+                self.previous_cursor = Cursor(ordering=self.ordering, position=first, reverse=True)
+        elif cursor:
+            # Past either end of the list, point back at the rows on the other side of the cursor
+            if reverse:
+                self.next_cursor = Cursor(ordering=self.ordering, position=cursor.position)
+            else:
+                self.previous_cursor = Cursor(ordering=self.ordering, position=cursor.position, reverse=True)
+
+        return results
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({
+            'next': self.get_link(self.next_cursor),
+            'previous': self.get_link(self.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(limit, self.max_limit) if limit > 0 else self.default_limit
+
+    def get_ordering(self, queryset: QuerySet) -> tuple[str, ...]:
+        """
+        Return the ordering applied to the queryset by the filter backends, with the tiebreak field appended
+
+        The tiebreak follows the direction of the first ordering field, so an index on (field, id) serves both.
+        Ordering by annotations, e.g. search rank, cannot be seeked on and is left out.
+        """
+        field_names: set[str] = {field.name for field in queryset.model._meta.concrete_fields}
+        ordering: list[str] = [
+            field for field in queryset.query.order_by if isinstance(field, str) and field.lstrip('-') in field_names
+        ]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering)
+
+        if self.tiebreak_field not in {field.lstrip('-') for field in ordering}:
+            direction: str = '-' if ordering and ordering[0].startswith('-') else ''
+            ordering.append(direction + self.tiebreak_field)
+        return tuple(ordering)
+
+    @staticmethod
+    def invert_ordering(ordering: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+    @staticmethod
+    def get_seek_filter(model: type[Model], ordering: tuple[str, ...], position: tuple[str, ...]) -> Q:
+        """
+        Build a filter selecting the rows that come after the given position in the given ordering
+
+        For the ordering (a, -b, id) this is: a > A OR (a = A AND b < B) OR (a = A AND b = B AND id > ID)
+        """
+        seek_filter = Q()
+        equal_filter = Q()
+        for field, raw_value in zip(ordering, position):
+            name: str = field.lstrip('-')
+            value = model._meta.get_field(name).to_python(raw_value)
+            lookup: str = 'lt' if field.startswith('-') else 'gt'
+
+            seek_filter |= equal_filter & Q(**{f'{name}__{lookup}': value})
+            equal_filter &= Q(**{name: value})
+        return seek_filter
+
+    def get_position(self, instance: Model | dict) -> tuple[str, ...]:
+        names: list[str] = [field.lstrip('-') for field in self.ordering]
+        if isinstance(instance, dict):
+            # Row of a values() queryset
+            instance = self.model(**{name: instance[name] for name in names})
+        opts = instance._meta
+        return tuple(opts.get_field(name).value_to_string(instance) for name in names)
+
+    def decode_cursor(self, request: Request) -> Cursor | None:
+        encoded: str = request.query_params.get(self.cursor_query_param, '')
+        if not encoded:
+            return None
+
+        try:
+            data: dict = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            cursor = Cursor(
+                ordering=tuple(data['o']),
+                position=tuple(data['p']),
+                reverse=bool(data.get('r', False)),
+            )
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(cursor.position) != len(cursor.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    @staticmethod
+    def encode_cursor(cursor: Cursor) -> str:
+        data: dict = {'o': cursor.ordering, 'p': cursor.position}
+        if cursor.reverse:
+            data['r'] = 1
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode('ascii')
+
+    def get_link(self, cursor: Cursor | None) -> str | None:
+        if cursor is None:
+            return None
+        url: str = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(cursor))
+
+
+class LimitOffsetCountPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that can estimate the total count or leave it out
+
+    The 'count' query parameter selects how the 'count' of the response is made:
+
+    - 'true' (default): exact COUNT(*) query, as in LimitOffsetPagination
+    - 'estimate': the planner's row estimate for the list query, or an exact count when the estimate is below
+      PAGINATION_COUNT_ESTIMATE_THRESHOLD and counting is cheap
+    - 'false': no count, 'count' is null
+
+    Without an exact count one extra row is fetched to find out whether there is a next page. Responses to
+    'estimate' and 'false' requests tell whether the count is exact in 'count_exact'.
+    """
+    count_query_param: str = 'count'
+    count_modes: tuple[str, ...] = ('true', 'estimate', 'false')
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        self.count_mode: str = request.query_params.get(self.count_query_param, 'true')
+        if self.count_mode not in self.count_modes:
+            self.count_mode = 'true'
+        self.has_next: bool | None = None
+
+        if self.count_mode == 'true':
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        self.count = None
+        if self.count_mode == 'estimate':
+            estimate: int = self.get_count_estimate(queryset)
+            if estimate < settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+                return super().paginate_queryset(queryset, request, view)
+            self.count = estimate
+
+        results: list = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    @staticmethod
+    def get_count_estimate(queryset: QuerySet) -> int:
+        """Return the number of rows the planner expects the queryset to return, without running it"""
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def get_next_link(self) -> str | None:
+        if self.has_next is None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url: str = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data: list) -> Response:
+        response: Response = super().get_paginated_response(data)
+        if self.count_mode != 'true':
+            response.data['count_exact'] = self.has_next is None
+        return response
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema: dict = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        response_schema['properties']['count_exact'] = {'type': 'boolean'}
+        return response_schema
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetCountPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode
+
+    Clients switch to keyset pagination by sending the 'cursor' query parameter; an empty value requests
+    the first page. Without it the endpoint behaves like LimitOffsetCountPagination.
+    """
+    keyset_class: type[KeysetPagination] = KeysetPagination
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        self.keyset: KeysetPagination | None = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
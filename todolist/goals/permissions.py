@@ -1,34 +1,79 @@
+from functools import cached_property
+from typing import Iterable
+
 from rest_framework import permissions
 from rest_framework.request import Request
 
 from goals.models import BoardParticipant, Board, GoalCategory, Goal, GoalComment
 
+# Roles that allow creating and changing categories, goals and comments on a board
+WRITE_ROLES: tuple[int, ...] = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+
+class BoardRoles:
+    """
+    The requesting user's roles on boards, loaded with a single query the first time they are needed in a request
+
+    Use BoardRoles.for_request() to get the instance shared by the permission classes and serializer validators
+    handling the same request.
+    """
+    request_attr: str = '_board_roles'
+
+    def __init__(self, user_id: int | None):
+        self.user_id = user_id
+
+    @classmethod
+    def for_request(cls, request: Request) -> 'BoardRoles':
+        board_roles: BoardRoles | None = getattr(request, cls.request_attr, None)
+        if board_roles is None or board_roles.user_id != request.user.id:
+            board_roles = cls(request.user.id)
+            setattr(request, cls.request_attr, board_roles)
+        return board_roles
+
+    @cached_property
+    def roles(self) -> dict[int, int]:
+        """Map of {board_id: role} for every board the user participates in"""
+        if self.user_id is None:
+            return {}
+        return dict(BoardParticipant.objects.filter(user_id=self.user_id).values_list('board_id', 'role'))
+
+    def get_role(self, board_id: int) -> int | None:
+        return self.roles.get(board_id)
+
+    def has_role(self, board_id: int, roles: Iterable[int] | None = None) -> bool:
+        """
+        Check that the user participates in the given board with one of the given roles, or with any role
+        if roles are not given
+        """
+        role: int | None = self.get_role(board_id)
+        return role is not None and (roles is None or role in roles)
+
 
 class BoardPermission(permissions.IsAuthenticated):
     def has_object_permission(self, request: Request, view, obj: Board) -> bool:
-        _filters: dict = {'user_id': request.user.id, 'board_id': obj.id}
+        roles: tuple[int, ...] | None = None
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
+            roles = (BoardParticipant.Role.owner, )
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return BoardRoles.for_request(request).has_role(obj.id, roles)
 
 
 class CategoryPermission(permissions.IsAuthenticated):
     def has_object_permission(self, request: Request, view, obj: GoalCategory) -> bool:
-        _filters: dict = {'user_id': request.user.id, 'board_id': obj.board_id}
+        roles: tuple[int, ...] | None = None
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+            roles = WRITE_ROLES
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return BoardRoles.for_request(request).has_role(obj.board_id, roles)
 
 
 class GoalPermission(permissions.IsAuthenticated):
     def has_object_permission(self, request: Request, view, obj: Goal) -> bool:
-        _filters: dict = {'user_id': request.user.id, 'board_id': obj.category.board_id}
+        roles: tuple[int, ...] | None = None
         if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+            roles = WRITE_ROLES
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return BoardRoles.for_request(request).has_role(obj.board_id, roles)
 
 
 class CommentPermission(permissions.IsAuthenticated):
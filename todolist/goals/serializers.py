@@ -1,10 +1,18 @@
-from django.db import transaction
-from django.db.models import QuerySet
+from typing import Any
+
+from django.db import connection, transaction
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
+from django.utils import timezone
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 
 from core.models import User
-from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
+from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant, CascadeTask, Tombstone
 from core.serializers import ProfileSerializer
+from goals import events
+from goals.cache import bump_board_versions
+from goals.export import FORMATS, TABLES
+from goals.permissions import BoardRoles, WRITE_ROLES
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -14,14 +22,48 @@ class BoardCreateSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    Slug related field resolving instances from a {slug: instance} map stored in the serializer context
+
+    Used by list serializers, which load related instances for all of their items with a single query
+    """
+    def __init__(self, context_key: str, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data: Any):
+        instances: dict | None = self.context.get(self.context_key)
+        if instances is None:
+            return super().to_internal_value(data)
+        try:
+            return instances[str(data)]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=smart_str(data))
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """
+    List serializer loading the users of all participants with a single query before the items are validated
+    """
+    def to_internal_value(self, data: Any) -> list[dict]:
+        if isinstance(data, list):
+            usernames: set[str] = {
+                str(item['user']) for item in data if isinstance(item, dict) and item.get('user') is not None
+            }
+            self.context['users'] = User.objects.in_bulk(usernames, field_name='username')
+        return super().to_internal_value(data)
+
+
 class BoardParticipantSerializer(serializers.ModelSerializer):
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.Role.editable_choices)
-    user = serializers.SlugRelatedField(slug_field='username', queryset=User.objects.all())
+    user = PrefetchedSlugRelatedField('users', slug_field='username', queryset=User.objects.all())
 
     class Meta:
         model = BoardParticipant
         fields = '__all__'
         read_only_fields = ('id', 'created', 'updated', 'board')
+        list_serializer_class = BoardParticipantListSerializer
 
 
 class BoardSerializer(serializers.ModelSerializer):
@@ -33,41 +75,100 @@ class BoardSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('id', 'created', 'updated', 'is_deleted')
 
+    def to_representation(self, instance: Board) -> dict:
+        # Load participants with their users in one query, unless they were already prefetched
+        prefetch_related_objects(
+            [instance], Prefetch('participants', queryset=BoardParticipant.objects.select_related('user'))
+        )
+        return super().to_representation(instance)
+
     def update(self, instance: Board, validated_data: dict) -> Board:
         owner: User = validated_data.pop('user')
         new_participants: list[dict] = validated_data.pop('participants')
-        new_by_id: dict[int, dict] = {pa['user'].id: pa for pa in new_participants}
+        # The board's owner cannot be changed or removed through the participant list
+        new_by_id: dict[int, dict] = {pa['user'].id: pa for pa in new_participants if pa['user'].id != owner.id}
 
         # Exclude the owner from the query since the board's owner should not be deleted
         existing_participants: QuerySet = instance.participants.exclude(user=owner)
         existing_by_id: dict[int, BoardParticipant] = {pa.user_id: pa for pa in existing_participants}
 
+        now = timezone.now()
+        changed: list[BoardParticipant] = []
+        added: list[BoardParticipant] = []
+        for uid, participant_data in new_by_id.items():
+            role = participant_data['role']
+            existing_participant: BoardParticipant | None = existing_by_id.get(uid)
+
+            if existing_participant is None:
+                added.append(BoardParticipant(
+                    user=participant_data['user'], board=instance, role=role, created=now, updated=now,
+                ))
+            elif existing_participant.role != role:
+                existing_participant.role = role
+                existing_participant.updated = now
+                changed.append(existing_participant)
+
+        removed: list[BoardParticipant] = [pa for uid, pa in existing_by_id.items() if uid not in new_by_id]
+
         with transaction.atomic():
-            # Delete existing participants that are not in the new_participants
-            for uid, existing_participant in existing_by_id.items():
-                if uid not in new_by_id.keys():
-                    existing_participant.delete()
-
-            # Add new participants, change roles for the existing ones
-            for uid, participant_data in new_by_id.items():
-                role = participant_data['role']
-
-                if uid in existing_by_id.keys() and existing_by_id[uid].role != role:
-                    existing_by_id[uid].role = role
-                    existing_by_id[uid].save()
-                else:
-                    BoardParticipant.objects.create(
-                        user=participant_data['user'],
-                        board=instance,
-                        role=role,
+            # One statement for each kind of change regardless of the number of participants
+            if removed:
+                # Deleted with a single statement: QuerySet.delete() would send a post_delete signal, and so an
+                # event, for every participant. Nothing refers to participants, so there is nothing to collect
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'DELETE FROM {BoardParticipant._meta.db_table} WHERE id = ANY(%s)', [[pa.id for pa in removed]]
                     )
-
-        if title := validated_data.get('title'):
-            instance.title = title
-            instance.save()
+                events.publish(
+                    'participant', 'deleted', instance.id, [pa.id for pa in removed], [pa.user_id for pa in removed]
+                )
+            if changed:
+                BoardParticipant.objects.bulk_update(changed, fields=('role', 'updated'))
+                events.publish(
+                    'participant', 'updated', instance.id, [pa.id for pa in changed], [pa.user_id for pa in changed]
+                )
+            if added:
+                BoardParticipant.objects.bulk_create(added)
+                events.publish(
+                    'participant', 'created', instance.id, [pa.id for pa in added], [pa.user_id for pa in added]
+                )
+
+            if title := validated_data.get('title'):
+                instance.title = title
+                instance.save()
+            elif removed or changed or added:
+                # Bulk queries do not send signals that invalidate cached board lists
+                bump_board_versions([instance.id])
         return instance
 
 
+class BoardStatisticsSerializer(serializers.Serializer):
+    board = serializers.IntegerField(read_only=True)
+    total = serializers.IntegerField(read_only=True)
+    overdue = serializers.IntegerField(read_only=True)
+    by_status = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    by_priority = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+
+class BoardExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=FORMATS, default='ndjson')
+    table = serializers.ChoiceField(choices=tuple(TABLES), required=False)
+    gzip = serializers.BooleanField(default=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs['output'] == 'csv' and 'table' not in attrs:
+            raise serializers.ValidationError({'table': 'CSV export requires a table'})
+        return attrs
+
+
+class BoardImportSerializer(serializers.Serializer):
+    boards = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    rows = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    skipped = serializers.IntegerField(read_only=True)
+    seconds = serializers.FloatField(read_only=True)
+    rows_per_second = serializers.FloatField(read_only=True)
+
+
 class GoalCategorySerializer(serializers.ModelSerializer):
     user = ProfileSerializer(read_only=True)
 
@@ -86,11 +187,7 @@ class GoalCategoryCreateSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def validate(self, attrs: dict) -> dict:
-        if not BoardParticipant.objects.filter(
-            user_id=attrs['user'].id,
-            board_id=attrs['board'].id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not BoardRoles.for_request(self.context['request']).has_role(attrs['board'].id, WRITE_ROLES):
             raise serializers.ValidationError('No permission to create categories on this board')
 
         return attrs
@@ -102,13 +199,14 @@ class GoalSerializer(serializers.ModelSerializer):
     class Meta:
         model = Goal
         read_only_fields = ('id', 'created', 'updated', 'user')
-        fields = '__all__'
+        # The board is a copy of the category's one
+        exclude = ('board', )
 
     def validate_category(self, category: GoalCategory) -> GoalCategory:
         if category.is_deleted:
             raise serializers.ValidationError('Cannot use a deleted category')
 
-        if category.user != self.context['request'].user:
+        if category.user_id != self.context['request'].user.id:
             raise serializers.ValidationError('Not an owner of this category')
 
         return category
@@ -118,24 +216,213 @@ class GoalCreateSerializer(GoalSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
 
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field resolving instances from a {pk: instance} map stored in the serializer context
+
+    Used by the bulk serializers, which load related instances for the whole batch with a single query
+    """
+    def __init__(self, context_key: str, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data: Any):
+        instances: dict | None = self.context.get(self.context_key)
+        if instances is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return instances[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class GoalBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer validating and writing a batch of goals with a constant number of queries
+
+    Categories and goals referenced by the batch are loaded with one query each before the items are validated.
+    Goals are written with bulk_create / bulk_update in a single transaction.
+    """
+    default_max_length: int = 1000
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', self.default_max_length)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data: Any) -> list[dict]:
+        if isinstance(data, list):
+            self.context['categories'] = GoalCategory.objects.in_bulk(self.collect_ids(data, 'category'))
+            if self.instance is not None:
+                self.context['goals'] = self.instance.in_bulk(self.collect_ids(data, 'id'))
+        return super().to_internal_value(data)
+
+    def validate(self, attrs: list[dict]) -> list[dict]:
+        goal_ids: list[int] = [item['id'].id for item in attrs if 'id' in item]
+        if len(goal_ids) != len(set(goal_ids)):
+            raise serializers.ValidationError('Each goal can only be listed once')
+        return attrs
+
+    @staticmethod
+    def collect_ids(data: list, key: str) -> set[int]:
+        ids: set[int] = set()
+        for item in data:
+            value = item.get(key) if isinstance(item, dict) else None
+            if isinstance(value, int) and not isinstance(value, bool):
+                ids.add(value)
+            elif isinstance(value, str) and value.isdigit():
+                ids.add(int(value))
+        return ids
+
+    def create(self, validated_data: list[dict]) -> list[Goal]:
+        now = timezone.now()
+        goals: list[Goal] = [
+            Goal(created=now, updated=now, board_id=item['category'].board_id, **item) for item in validated_data
+        ]
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals)
+            bump_board_versions({goal.board_id for goal in goals})
+            self.publish_events('created', goals)
+        return goals
+
+    def update(self, instance: QuerySet, validated_data: list[dict]) -> list[Goal]:
+        now = timezone.now()
+        goals: list[Goal] = []
+        fields: set[str] = {'updated'}
+        board_ids: set[int] = set()
+        moved: dict[int, list[int]] = {}
+
+        for item in validated_data:
+            goal: Goal = item.pop('id')
+            board_ids.add(goal.board_id)
+            for attr, value in item.items():
+                setattr(goal, attr, value)
+            goal.updated = now
+
+            if 'category' in item and goal.board_id != goal.category.board_id:
+                goal.board_id = goal.category.board_id
+                moved.setdefault(goal.board_id, []).append(goal.id)
+                fields.add('board')
+            board_ids.add(goal.board_id)
+
+            fields.update(item)
+            goals.append(goal)
+
+        with transaction.atomic():
+            Goal.objects.bulk_update(goals, fields=sorted(fields))
+            # Comments follow goals moved to another board, one statement per target board
+            for board_id, goal_ids in moved.items():
+                GoalComment.objects.filter(goal_id__in=goal_ids).update(board_id=board_id, updated=now)
+            bump_board_versions(board_ids)
+            self.publish_events('updated', goals)
+        return goals
+
+    @staticmethod
+    def publish_events(action: str, goals: list[Goal]) -> None:
+        """Publish one stream event per board, bulk writes do not send signals"""
+        ids_by_board: dict[int, list[int]] = {}
+        for goal in goals:
+            ids_by_board.setdefault(goal.board_id, []).append(goal.id)
+        for board_id, goal_ids in ids_by_board.items():
+            events.publish('goal', action, board_id, goal_ids)
+
+
+class GoalBulkCreateSerializer(GoalCreateSerializer):
+    category = PrefetchedPrimaryKeyRelatedField('categories', queryset=GoalCategory.objects.all())
+
+    class Meta(GoalCreateSerializer.Meta):
+        list_serializer_class = GoalBulkListSerializer
+
+    def validate_category(self, category: GoalCategory) -> GoalCategory:
+        category = super().validate_category(category)
+        if not BoardRoles.for_request(self.context['request']).has_role(category.board_id, WRITE_ROLES):
+            raise serializers.ValidationError('No permission to create goals on this board')
+        return category
+
+
+class GoalBulkUpdateSerializer(GoalSerializer):
+    id = PrefetchedPrimaryKeyRelatedField('goals', queryset=Goal.objects.all())
+    category = PrefetchedPrimaryKeyRelatedField('categories', queryset=GoalCategory.objects.all())
+
+    class Meta(GoalSerializer.Meta):
+        list_serializer_class = GoalBulkListSerializer
+
+    def validate_id(self, goal: Goal) -> Goal:
+        if not BoardRoles.for_request(self.context['request']).has_role(goal.board_id, WRITE_ROLES):
+            raise serializers.ValidationError('No permission to change goals on this board')
+        return goal
+
+    def validate_category(self, category: GoalCategory) -> GoalCategory:
+        category = super().validate_category(category)
+        if not BoardRoles.for_request(self.context['request']).has_role(category.board_id, WRITE_ROLES):
+            raise serializers.ValidationError('No permission to move goals to this board')
+        return category
+
+    def validate(self, attrs: dict) -> dict:
+        # Partial updates do not require any field, but every item must say which goal it changes
+        if 'id' not in attrs:
+            raise serializers.ValidationError({'id': [self.fields['id'].error_messages['required']]})
+        return attrs
+
+
+class GoalBulkArchiveSerializer(GoalBulkUpdateSerializer):
+    class Meta(GoalBulkUpdateSerializer.Meta):
+        fields = ('id', )
+        exclude = None
+        read_only_fields = ()
+
+    def validate(self, attrs: dict) -> dict:
+        attrs = super().validate(attrs)
+        attrs['status'] = Goal.Status.archived
+        return attrs
+
+
 class GoalCommentSerializer(serializers.ModelSerializer):
     user = ProfileSerializer(read_only=True)
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        # The board is a copy of the goal's one
+        exclude = ('board', )
         read_only_fields = ('id', 'created', 'updated', 'user')
 
 
 class GoalCommentCreateSerializer(GoalCommentSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.all())
 
     def validate(self, attrs: dict) -> dict:
-        if not BoardParticipant.objects.filter(
-            user_id=attrs['user'].id,
-            board_id=attrs['goal'].category.board_id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not BoardRoles.for_request(self.context['request']).has_role(attrs['goal'].board_id, WRITE_ROLES):
             raise serializers.ValidationError('No permission to create comments on this board')
 
         return attrs
+
+
+class CascadeTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CascadeTask
+        exclude = ('user', )
+        read_only_fields = ('id', 'created', 'updated', 'board', 'category', 'status', 'processed')
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    user = serializers.SlugRelatedField(slug_field='username', read_only=True)
+
+    class Meta:
+        model = Tombstone
+        fields = ('kind', 'object_id', 'board', 'user', 'deleted')
+
+
+class SyncSerializer(serializers.Serializer):
+    token = serializers.CharField(read_only=True)
+    boards = BoardCreateSerializer(many=True, read_only=True)
+    participants = BoardParticipantSerializer(many=True, read_only=True)
+    categories = GoalCategorySerializer(many=True, read_only=True)
+    goals = GoalSerializer(many=True, read_only=True)
+    comments = GoalCommentSerializer(many=True, read_only=True)
+    deleted = TombstoneSerializer(many=True, read_only=True)
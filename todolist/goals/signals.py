@@ -0,0 +1,44 @@
+from django.db.models import Model
+from django.db.models.signals import ModelSignal, post_delete, post_save
+from django.dispatch import receiver
+
+from goals import events
+from goals.cache import bump_board_versions
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+def get_action(signal: ModelSignal, created: bool = False) -> str:
+    if signal is post_delete:
+        return 'deleted'
+    return 'created' if created else 'updated'
+
+
+@receiver((post_save, post_delete), sender=Board)
+def board_changed(sender: type[Model], instance: Board, signal: ModelSignal, **kwargs) -> None:
+    bump_board_versions([instance.id])
+    events.publish('board', get_action(signal, kwargs.get('created')), instance.id, [instance.id])
+
+
+@receiver((post_save, post_delete), sender=BoardParticipant)
+def participant_changed(sender: type[Model], instance: BoardParticipant, signal: ModelSignal, **kwargs) -> None:
+    bump_board_versions([instance.board_id])
+    events.publish(
+        'participant', get_action(signal, kwargs.get('created')), instance.board_id, [instance.id], [instance.user_id]
+    )
+
+
+@receiver((post_save, post_delete), sender=GoalCategory)
+def category_changed(sender: type[Model], instance: GoalCategory, signal: ModelSignal, **kwargs) -> None:
+    bump_board_versions([instance.board_id])
+    events.publish('category', get_action(signal, kwargs.get('created')), instance.board_id, [instance.id])
+
+
+@receiver((post_save, post_delete), sender=Goal)
+def goal_changed(sender: type[Model], instance: Goal, signal: ModelSignal, **kwargs) -> None:
+    bump_board_versions([instance.board_id])
+    events.publish('goal', get_action(signal, kwargs.get('created')), instance.board_id, [instance.id])
+
+
+@receiver((post_save, post_delete), sender=GoalComment)
+def comment_changed(sender: type[Model], instance: GoalComment, signal: ModelSignal, **kwargs) -> None:
+    events.publish('comment', get_action(signal, kwargs.get('created')), instance.board_id, [instance.id])
@@ -0,0 +1,77 @@
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count, Model, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from goals.models import Goal, GoalCounter
+
+# Goals with these statuses are overdue once their due date has passed
+OPEN_STATUSES: tuple[int, ...] = (Goal.Status.to_do, Goal.Status.in_progress)
+
+
+def rebuild_goal_counters(
+        goal_model: type[Model], counter_model: type[Model], board_ids: Iterable[int] | None = None
+) -> int:
+    """Replace the goal counters of the given boards, or of all boards, with counts computed from the goals table
+
+    Goal writes are blocked while the counters are rebuilt, so no concurrent change is lost. Model classes
+    are passed in to allow running it from a migration with the historical models.
+
+    Args:
+        goal_model (type[Model]): Goal model
+        counter_model (type[Model]): Goal counter model
+        board_ids (Iterable[int] | None): Boards to rebuild the counters of. Defaults to all boards
+
+    Returns:
+        int: Number of created counters
+
+    """
+    goals: QuerySet = goal_model.objects.filter(board__isnull=False)
+    counters: QuerySet = counter_model.objects.all()
+    if board_ids is not None:
+        board_ids = list(board_ids)
+        goals = goals.filter(board_id__in=board_ids)
+        counters = counters.filter(board_id__in=board_ids)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Waits for transactions that already changed goals and keeps new ones from changing them
+            cursor.execute(f'LOCK TABLE {goal_model._meta.db_table} IN SHARE MODE')
+
+        counters.delete()
+        rows: QuerySet = goals.values('board_id', 'status', 'priority', 'due_date').annotate(count=Count('id'))
+        return len(counter_model.objects.bulk_create((counter_model(**row) for row in rows.order_by()), 1000))
+
+
+def get_board_statistics(board_id: int) -> dict:
+    """Return goal counts of the given board, computed from its goal counters with a single query
+
+    Counts by status include archived goals, all other counts are of active goals only.
+
+    Args:
+        board_id (int): Board id
+
+    Returns:
+        dict: Total, overdue, by status and by priority goal counts
+
+    """
+    active: Q = ~Q(status=Goal.Status.archived)
+    aggregates: dict[str, Q] = {
+        'total': active,
+        'overdue': Q(status__in=OPEN_STATUSES, due_date__lt=timezone.localdate()),
+        **{f'status_{status}': Q(status=status) for status in Goal.Status.values},
+        **{f'priority_{priority}': active & Q(priority=priority) for priority in Goal.Priority.values},
+    }
+    counts: dict[str, int] = GoalCounter.objects.filter(board_id=board_id).aggregate(**{
+        name: Coalesce(Sum('count', filter=condition), 0) for name, condition in aggregates.items()
+    })
+
+    return {
+        'board': board_id,
+        'total': counts['total'],
+        'overdue': counts['overdue'],
+        'by_status': {status: counts[f'status_{status}'] for status in Goal.Status.values},
+        'by_priority': {priority: counts[f'priority_{priority}'] for priority in Goal.Priority.values},
+    }
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import logging
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http import parse_cookie
+
+from goals.events import Event, Subscription, board_topic, broadcaster, get_backend, user_topic
+from goals.models import BoardParticipant
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+EVENT_STREAM_PATH: str = '/goals/stream'
+
+
+@sync_to_async
+def authenticate(scope: dict) -> int | None:
+    """Return id of the user logged in with the session cookie of the connection, None for anonymous users"""
+    headers: dict[bytes, bytes] = dict(scope['headers'])
+    cookies: dict[str, str] = parse_cookie(headers.get(b'cookie', b'').decode('latin1'))
+    session = import_module(settings.SESSION_ENGINE).SessionStore(cookies.get(settings.SESSION_COOKIE_NAME))
+    return get_user(SimpleNamespace(session=session)).id
+
+
+@sync_to_async
+def get_board_ids(user_id: int) -> list[int]:
+    return list(BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', flat=True))
+
+
+async def send_response(send, status: int, detail: str) -> None:
+    await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': detail}).encode()})
+
+
+async def event_stream(scope: dict, receive, send) -> None:
+    """
+    ASGI application streaming change events of the requesting user's boards as server-sent events
+
+    Every event is a JSON object with the kind of the changed objects, the action, the board and the objects' ids.
+    Events carry no object data: on every event, and after every reconnect, clients get the changes from the sync
+    endpoint. The stream is closed when the client does not keep up with the events.
+
+    Connections are served by the event loop without a thread each, so a process can hold thousands of idle ones.
+    Served in front of Django by todolist.asgi, not available under WSGI.
+    """
+    if scope['method'] != 'GET':
+        await send_response(send, 405, f'Method "{scope["method"]}" not allowed.')
+        return
+
+    user_id: int | None = await authenticate(scope)
+    if user_id is None:
+        await send_response(send, 403, 'Authentication credentials were not provided.')
+        return
+
+    get_backend().start()
+    topics: list[str] = [user_topic(user_id)] + [board_topic(board_id) for board_id in await get_board_ids(user_id)]
+    subscription: Subscription = broadcaster.subscribe(topics, max_size=settings.EVENT_STREAM_QUEUE_SIZE)
+    # Django 4.2 does not stop streaming responses on disconnect, so the connection is watched here
+    watcher: asyncio.Task = asyncio.create_task(wait_disconnect(receive, asyncio.current_task()))
+
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Disables response buffering in nginx
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send_chunk(send, f'retry: {settings.EVENT_STREAM_RETRY}\n\n')
+
+        while True:
+            event: Event | None = await subscription.get(timeout=settings.EVENT_STREAM_HEARTBEAT)
+            if event is None:
+                await send_chunk(send, ': keepalive\n\n')
+                continue
+
+            await send_chunk(send, f'data: {event.to_json()}\n\n')
+            if event.kind == 'participant' and user_id in event.users:
+                if event.action == 'deleted':
+                    subscription.remove_topics([board_topic(event.board)])
+                else:
+                    subscription.add_topics([board_topic(event.board)])
+    except OverflowError:
+        logger.info(f'Event stream of user {user_id} closed: the client does not keep up')
+        await send({'type': 'http.response.body', 'body': b''})
+    except asyncio.CancelledError:
+        if not watcher.done():
+            raise
+    finally:
+        subscription.close()
+        watcher.cancel()
+
+
+async def send_chunk(send, chunk: str) -> None:
+    await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+
+async def wait_disconnect(receive, stream: asyncio.Task) -> None:
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+    stream.cancel()
@@ -0,0 +1,86 @@
+import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment, Tombstone
+
+TOKEN_SALT: str = 'goals.sync'
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The token is too old or there are too many changes since it, reload the lists and start over'
+    default_code = 'resync_required'
+
+
+def make_token(since: datetime.datetime) -> str:
+    """Return an opaque signed token for changes made after the given time"""
+    return signing.dumps({'s': since.isoformat()}, salt=TOKEN_SALT, compress=True)
+
+
+def read_token(token: str) -> datetime.datetime:
+    """Return the time encoded in the given token
+
+    Raises:
+        ValidationError: If the token was not issued by the sync endpoint
+        ResyncRequired: If tombstones of the token's period were already purged
+
+    """
+    try:
+        since: datetime.datetime = datetime.datetime.fromisoformat(signing.loads(token, salt=TOKEN_SALT)['s'])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError({'token': 'Invalid token'})
+
+    if since < timezone.now() - settings.SYNC_TOMBSTONE_TTL:
+        raise ResyncRequired()
+    return since
+
+
+def get_changes(user_id: int, since: datetime.datetime) -> dict[str, list]:
+    """Return objects of the user's boards created, updated or deleted after the given time
+
+    Boards the user joined after that time are returned with all of their objects, since nothing of them was
+    synced before. Every kind of objects is loaded with a single query.
+
+    Args:
+        user_id (int): Requesting user's id
+        since (datetime.datetime): Time of the previous sync
+
+    Returns:
+        dict: Lists of changed boards, participants, categories, goals, comments and tombstones of deleted objects
+
+    Raises:
+        ResyncRequired: If any kind of objects has more than SYNC_MAX_CHANGES changes
+
+    """
+    memberships: list[tuple[int, datetime.datetime]] = list(
+        BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', 'created')
+    )
+    board_ids: list[int] = [board_id for board_id, _ in memberships]
+    joined_ids: list[int] = [board_id for board_id, created in memberships if created > since]
+    changed: Q = Q(updated__gt=since) | Q(board_id__in=joined_ids)
+
+    querysets: dict[str, QuerySet] = {
+        'boards': Board.objects.filter(Q(updated__gt=since) | Q(id__in=joined_ids), id__in=board_ids),
+        'participants': BoardParticipant.objects.filter(changed, board_id__in=board_ids).select_related('user'),
+        'categories': GoalCategory.objects.filter(changed, board_id__in=board_ids).select_related('user'),
+        'goals': Goal.objects.filter(changed, board_id__in=board_ids).select_related('user'),
+        'comments': GoalComment.objects.filter(changed, board_id__in=board_ids).select_related('user'),
+        # Removed participants learn about their own removal as well
+        'deleted': Tombstone.objects.filter(
+            Q(board_id__in=board_ids) | Q(kind=Tombstone.Kind.participant, user_id=user_id), deleted__gt=since
+        ).select_related('user'),
+    }
+
+    changes: dict[str, list] = {}
+    for name, queryset in querysets.items():
+        objects: list = list(queryset.order_by('id')[:settings.SYNC_MAX_CHANGES + 1])
+        if len(objects) > settings.SYNC_MAX_CHANGES:
+            raise ResyncRequired()
+        changes[name] = objects
+    return changes
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from goals.views import category, goal, comment, board
+from goals.views import category, goal, comment, board, cascade, sync
 
 app_name = 'goals'
 
@@ -12,13 +12,23 @@ urlpatterns = [
     # Goal views
     path('goal/create', goal.GoalCreateView.as_view(), name='create-goal'),
     path('goal/list', goal.GoalListView.as_view(), name='goal-list'),
+    path('goal/bulk_create', goal.GoalBulkCreateView.as_view(), name='bulk-create-goal'),
+    path('goal/bulk_update', goal.GoalBulkUpdateView.as_view(), name='bulk-update-goal'),
+    path('goal/bulk_archive', goal.GoalBulkArchiveView.as_view(), name='bulk-archive-goal'),
     path('goal/<pk>', goal.GoalView.as_view(), name='goal'),
     # Comment views
     path('goal_comment/create', comment.GoalCommentCreateView.as_view(), name='create-comment'),
     path('goal_comment/list', comment.GoalCommentListView.as_view(), name='comment-list'),
     path('goal_comment/<pk>', comment.GoalCommentView.as_view(), name='comment'),
+    # Cascade task views
+    path('cascade_task/<pk>', cascade.CascadeTaskView.as_view(), name='cascade-task'),
+    # Sync views
+    path('sync', sync.SyncView.as_view(), name='sync'),
     # Board views
     path('board/create', board.BoardCreateView.as_view(), name='create-board'),
+    path('board/import', board.BoardImportView.as_view(), name='import-board'),
     path('board/list', board.BoardListView.as_view(), name='board-list'),
     path('board/<pk>', board.BoardView.as_view(), name='board'),
+    path('board/<pk>/statistics', board.BoardStatisticsView.as_view(), name='board-statistics'),
+    path('board/<pk>/export', board.BoardExportView.as_view(), name='board-export'),
 ]
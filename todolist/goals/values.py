@@ -0,0 +1,149 @@
+import datetime
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.instrumentation import timer
+
+# Fields whose representation of a value loaded from their model field is the value itself
+IDENTITY_FIELDS: tuple[type[serializers.Field], ...] = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+Converter = Callable[[Any], Any]
+
+
+def get_converter(field: serializers.Field) -> Converter | None:
+    """
+    Return a function representing non-null values loaded for the field the way its to_representation does
+
+    ISO 8601 dates and datetimes are converted directly, resolving the datetime field's timezone once instead of
+    per value, so converters are made per list rather than kept with the plan.
+    """
+    if type(field) in IDENTITY_FIELDS:
+        return None
+
+    if type(field) is serializers.DateField and getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601:
+        return datetime.date.isoformat
+
+    if type(field) is serializers.DateTimeField and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601:
+        field_timezone = getattr(field, 'timezone', field.default_timezone())
+        if field_timezone is not None:
+            def convert_datetime(value: datetime.datetime) -> str:
+                if value.tzinfo is None:
+                    return field.to_representation(value)
+                text: str = value.astimezone(field_timezone).isoformat()
+                return text[:-6] + 'Z' if text.endswith('+00:00') else text
+            return convert_datetime
+
+    return field.to_representation
+
+
+class ValuesPlan:
+    """
+    Precomputed plan building a serializer's representation of an instance from a values() row
+
+    The plan is made once per serializer class from its bound fields: every readable field maps to a values()
+    lookup and, unless its representation is the loaded value itself, to a converter equivalent to the field's
+    to_representation. Nested serializers of a single related object are planned over lookups across the relation.
+    Fields the plan cannot reproduce from a row, e.g. SerializerMethodField or many=True relations, raise
+    a ValueError.
+
+    Attributes:
+        lookups: Arguments for values(), loading every column the representation needs
+        steps: Output key, values() lookup or nested plan and field of each field, in the serializer's order
+        relation: Lookup of the relation of a nested plan, used to represent a missing related object as None
+    """
+    def __init__(self, serializer: serializers.Serializer, relation: str | None = None):
+        self.relation: str | None = relation
+        self.lookups: list[str] = [relation] if relation else []
+        self.steps: list[tuple[str, 'str | ValuesPlan', serializers.Field]] = []
+
+        prefix: str = f'{relation}__' if relation else ''
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+                raise ValueError(f'{type(serializer).__name__}.{name}: cannot be built from a values() row')
+
+            lookup: str = prefix + '__'.join(field.source_attrs)
+            if isinstance(field, serializers.Serializer):
+                nested = ValuesPlan(field, relation=lookup)
+                self.lookups += nested.lookups
+                self.steps.append((name, nested, field))
+                continue
+
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                if field.pk_field is not None:
+                    raise ValueError(f'{type(serializer).__name__}.{name}: pk_field is not supported')
+            elif isinstance(field, (serializers.RelatedField, serializers.SerializerMethodField)):
+                raise ValueError(f'{type(serializer).__name__}.{name}: cannot be built from a values() row')
+
+            self.lookups.append(lookup)
+            self.steps.append((name, lookup, field))
+
+    def get_builder(self) -> Callable[[dict], dict]:
+        """Return a function building the representation of a values() row, with converters made for this call"""
+        steps: list[tuple[str, str | None, Converter | None]] = []
+        for name, source, field in self.steps:
+            if isinstance(source, ValuesPlan):
+                steps.append((name, None, source.get_nested_builder()))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                steps.append((name, source, None))
+            else:
+                steps.append((name, source, get_converter(field)))
+
+        def build(row: dict) -> dict:
+            data: dict = {}
+            for name, lookup, convert in steps:
+                if lookup is None:
+                    data[name] = convert(row)
+                    continue
+                value = row[lookup]
+                data[name] = value if convert is None or value is None else convert(value)
+            return data
+        return build
+
+    def get_nested_builder(self) -> Converter:
+        build: Callable[[dict], dict] = self.get_builder()
+        relation: str = self.relation
+        return lambda row: None if row[relation] is None else build(row)
+
+    def build_many(self, rows: Iterable[dict]) -> list[dict]:
+        """Return the representations of the values() rows, equal to the serializer's ones of the same instances"""
+        build: Callable[[dict], dict] = self.get_builder()
+        return [build(row) for row in rows]
+
+
+@lru_cache
+def get_values_plan(serializer_class: type[serializers.Serializer]) -> ValuesPlan:
+    return ValuesPlan(serializer_class())
+
+
+class ValuesListMixin:
+    """
+    List view mixin building the response from values() rows instead of a serializer instance per object
+
+    The rows are loaded with the lookups of the serializer class's values plan after filtering, and are represented
+    the same way the serializer represents the objects, without instantiating models and field copies per row.
+    """
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        plan: ValuesPlan = get_values_plan(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*plan.lookups)
+
+        page: list[dict] | None = self.paginate_queryset(queryset)
+        if page is not None:
+            with timer('serializer'):
+                data: list[dict] = plan.build_many(page)
+            return self.get_paginated_response(data)
+
+        rows: list[dict] = list(queryset)
+        with timer('serializer'):
+            return Response(plan.build_many(rows))
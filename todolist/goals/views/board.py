@@ -1,13 +1,34 @@
+import gzip
+import zlib
+from typing import AsyncIterator, Iterator
+
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework import status
 from rest_framework.filters import BaseFilterBackend, OrderingFilter
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import (
+    CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView,
+)
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
+from goals.cache import BoardVersionCacheMixin
+from goals.export import CONTENT_TYPES, export_board, iterate_in_thread
+from goals.importer import BoardImporter, ImportResult, InvalidRow
 from goals.models import Board, Goal, BoardParticipant
+from goals.pagination import LimitOffsetCountPagination
 from goals.permissions import BoardPermission
-from goals.serializers import BoardCreateSerializer, BoardSerializer
+from goals.statistics import get_board_statistics
+from goals.views.cascade import DeferredCascadeDestroyMixin
+from goals.serializers import (
+    BoardCreateSerializer, BoardExportSerializer, BoardImportSerializer, BoardSerializer, BoardStatisticsSerializer,
+)
 
 
 class BoardCreateView(CreateAPIView):
@@ -22,12 +43,43 @@ class BoardCreateView(CreateAPIView):
         BoardParticipant.objects.create(user=self.request.user, board=serializer.save())
 
 
-class BoardListView(ListAPIView):
+class BoardImportView(GenericAPIView):
+    """
+    Import boards with their participants, categories, goals and comments from an NDJSON request body in the
+    format of the board export, the requesting user becomes the owner of the imported boards
+
+    Participants are not imported, every imported row is credited to the requesting user.
+
+    Bodies may be sent gzip-compressed with Content-Encoding: gzip. Either the whole body is imported or nothing.
+    Returns ids of the created boards, numbers of created rows by table and the import's throughput
+    """
+    permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
+    serializer_class: BaseSerializer = BoardImportSerializer
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        # The body is read line by line rather than parsed as a whole
+        stream = request.stream
+        if stream is None:
+            raise ValidationError({'detail': 'Request body is empty'})
+        if request.headers.get('Content-Encoding') == 'gzip':
+            stream = gzip.GzipFile(fileobj=stream)
+
+        try:
+            result: ImportResult = BoardImporter(request.user).run(stream)
+        except (InvalidRow, EOFError, OSError, zlib.error) as error:
+            raise ValidationError({'detail': str(error)})
+        return Response(self.get_serializer(result).data, status=status.HTTP_201_CREATED)
+
+
+class BoardListView(BoardVersionCacheMixin, ListAPIView):
     """
     Return a list of all active boards with the requesting user as the board's participant
+
+    Responses are cached and support conditional requests with ETag / If-None-Match
     """
     permission_classes: tuple[BasePermission, ...] = (IsAuthenticated,)
     serializer_class: BaseSerializer = BoardCreateSerializer
+    pagination_class: BasePagination = LimitOffsetCountPagination
     filter_backends: tuple[BaseFilterBackend, ...] = (OrderingFilter, )
     ordering: tuple[str, ...] = ('title', )
 
@@ -35,7 +87,7 @@ class BoardListView(ListAPIView):
         return Board.objects.filter(participants__user_id=self.request.user.id, is_deleted=False)
 
 
-class BoardView(RetrieveUpdateDestroyAPIView):
+class BoardView(DeferredCascadeDestroyMixin, RetrieveUpdateDestroyAPIView):
     """
     retrieve:
     Return the given board
@@ -47,10 +99,11 @@ class BoardView(RetrieveUpdateDestroyAPIView):
     Update title or participants of the given board
 
     destroy:
-    Set the given board's is_deleted flag to True, update all child objects accordingly
+    Set the given board's is_deleted flag to True, update all child objects accordingly or queue their update
     """
     serializer_class: BaseSerializer = BoardSerializer
     permission_classes: tuple[BasePermission, ...] = (BoardPermission, )
+    cascade_task_field: str = 'board'
 
     def get_queryset(self) -> QuerySet:
         return Board.objects.filter(participants__user=self.request.user, is_deleted=False)
@@ -60,5 +113,55 @@ class BoardView(RetrieveUpdateDestroyAPIView):
             instance.is_deleted = True
             instance.save()
 
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+            # Child objects get the board's timestamp, so the sync endpoint returns them as changed
+            instance.categories.update(is_deleted=True, updated=instance.updated)
+            Goal.objects.filter(board=instance).update(status=Goal.Status.archived, updated=instance.updated)
+
+
+class BoardStatisticsView(RetrieveAPIView):
+    """
+    Return goal counts of the given board by status and priority, and the number of overdue goals
+
+    Counts are read from counters maintained on every goal write, not computed from the goals
+    """
+    serializer_class: BaseSerializer = BoardStatisticsSerializer
+    permission_classes: tuple[BasePermission, ...] = (BoardPermission, )
+
+    def get_queryset(self) -> QuerySet:
+        return Board.objects.filter(participants__user_id=self.request.user.id, is_deleted=False)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        board: Board = self.get_object()
+        return Response(self.get_serializer(get_board_statistics(board.id)).data)
+
+
+class BoardExportView(RetrieveAPIView):
+    """
+    Stream participants, categories, goals and comments of the given board as NDJSON, or one of them as CSV
+
+    Query parameters: output ("ndjson" or "csv"), table (required for CSV, limits NDJSON to one table)
+    and gzip ("true" to compress the file)
+    """
+    serializer_class: BaseSerializer = BoardExportSerializer
+    permission_classes: tuple[BasePermission, ...] = (BoardPermission, )
+
+    def get_queryset(self) -> QuerySet:
+        return Board.objects.filter(participants__user_id=self.request.user.id, is_deleted=False)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        board: Board = self.get_object()
+        serializer: BaseSerializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        output: str = serializer.validated_data['output']
+        table: str | None = serializer.validated_data.get('table')
+        compress: bool = serializer.validated_data['gzip']
+
+        tables: list[str] | None = None if table is None else [table]
+        chunks: Iterator[bytes] | AsyncIterator[bytes] = export_board(board, output, tables, compress)
+        # Under ASGI, sync streaming content is read whole before the first byte is sent
+        if isinstance(request._request, ASGIRequest):
+            chunks = iterate_in_thread(chunks)
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES['gzip' if compress else output])
+        filename: str = '-'.join(filter(None, ['board', str(board.id), table])) + f'.{output}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}{".gz" if compress else ""}"'
+        return response
@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model, QuerySet
+from rest_framework import status
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from goals.models import CascadeTask
+from goals.serializers import CascadeTaskSerializer
+
+
+class DeferredCascadeDestroyMixin:
+    """
+    Destroy view mixin marking the object as deleted and, if DEFERRED_CASCADE_DELETE is set, queueing a cascade task
+    for its child objects instead of updating them in the request
+
+    In the deferred mode the response is 202 with the queued task, which can be polled at its own endpoint.
+    """
+    cascade_task_field: str
+
+    def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        instance: Model = self.get_object()
+
+        if not settings.DEFERRED_CASCADE_DELETE:
+            self.perform_destroy(instance)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        with transaction.atomic():
+            instance.is_deleted = True
+            instance.save()
+            task: CascadeTask = CascadeTask.objects.create(user=request.user, **{self.cascade_task_field: instance})
+        return Response(CascadeTaskSerializer(task).data, status=status.HTTP_202_ACCEPTED)
+
+
+class CascadeTaskView(RetrieveAPIView):
+    """
+    Return the given cascade task requested by the user, with the progress of archiving
+    """
+    serializer_class: BaseSerializer = CascadeTaskSerializer
+    permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
+
+    def get_queryset(self) -> QuerySet:
+        return CascadeTask.objects.filter(user_id=self.request.user.id)
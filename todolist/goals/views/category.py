@@ -3,12 +3,17 @@ from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.serializers import BaseSerializer
 
+from goals.cache import BoardVersionCacheMixin
 from goals.models import GoalCategory, Goal
+from goals.pagination import LimitOffsetOrKeysetPagination
 from goals.permissions import CategoryPermission
 from goals.serializers import GoalCategoryCreateSerializer, GoalCategorySerializer
+from goals.values import ValuesListMixin
+from goals.views.cascade import DeferredCascadeDestroyMixin
 
 
 class GoalCategoryCreateView(CreateAPIView):
@@ -20,12 +25,15 @@ class GoalCategoryCreateView(CreateAPIView):
     serializer_class: BaseSerializer = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(ListAPIView):
+class GoalCategoryListView(BoardVersionCacheMixin, ValuesListMixin, ListAPIView):
     """
     Return a list of all active goal categories owned by the requesting user
+
+    Responses are cached and support conditional requests with ETag / If-None-Match
     """
     permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
     serializer_class: BaseSerializer = GoalCategorySerializer
+    pagination_class: BasePagination = LimitOffsetOrKeysetPagination
 
     filter_backends: tuple[BaseFilterBackend, ...] = (OrderingFilter, SearchFilter, DjangoFilterBackend)
     ordering_fields: tuple[str, ...] = ('title', 'created')
@@ -34,10 +42,12 @@ class GoalCategoryListView(ListAPIView):
     filterset_fields: tuple[str, ...] = ('board', )
 
     def get_queryset(self) -> QuerySet:
-        return GoalCategory.objects.filter(board__participants__user_id=self.request.user.id, is_deleted=False)
+        return GoalCategory.objects.filter(
+            board__participants__user_id=self.request.user.id, board__is_deleted=False, is_deleted=False
+        ).select_related('user')
 
 
-class GoalCategoryView(RetrieveUpdateDestroyAPIView):
+class GoalCategoryView(DeferredCascadeDestroyMixin, RetrieveUpdateDestroyAPIView):
     """
     retrieve:
     Return the given category
@@ -49,16 +59,19 @@ class GoalCategoryView(RetrieveUpdateDestroyAPIView):
     Update the 'title' field of the given category
 
     destroy:
-    Set the given category's is_deleted flag to True, set the child goals' statuses to 'archived'
+    Set the given category's is_deleted flag to True, set the child goals' statuses to 'archived' or queue it
     """
     serializer_class: BaseSerializer = GoalCategorySerializer
     permission_classes: tuple[BasePermission, ...] = (CategoryPermission, )
+    cascade_task_field: str = 'category'
 
     def get_queryset(self) -> QuerySet:
-        return GoalCategory.objects.filter(board__participants__user_id=self.request.user.id, is_deleted=False)
+        return GoalCategory.objects.filter(
+            board__participants__user_id=self.request.user.id, board__is_deleted=False, is_deleted=False
+        ).select_related('user')
 
     def perform_destroy(self, instance: GoalCategory) -> None:
         with transaction.atomic():
             instance.is_deleted = True
             instance.save()
-            instance.goals.update(status=Goal.Status.archived)
+            instance.goals.update(status=Goal.Status.archived, updated=instance.updated)
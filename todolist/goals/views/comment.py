@@ -2,12 +2,15 @@ from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import BaseFilterBackend, OrderingFilter
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.serializers import BaseSerializer
 
 from goals.models import GoalComment
+from goals.pagination import LimitOffsetOrKeysetPagination
 from goals.permissions import CommentPermission
 from goals.serializers import GoalCommentCreateSerializer, GoalCommentSerializer
+from goals.values import ValuesListMixin
 
 
 class GoalCommentCreateView(CreateAPIView):
@@ -19,12 +22,13 @@ class GoalCommentCreateView(CreateAPIView):
     serializer_class: BaseSerializer = GoalCommentCreateSerializer
 
 
-class GoalCommentListView(ListAPIView):
+class GoalCommentListView(ValuesListMixin, ListAPIView):
     """
     Return a list of all comments owned by the requesting user
     """
     permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
     serializer_class: BaseSerializer = GoalCommentSerializer
+    pagination_class: BasePagination = LimitOffsetOrKeysetPagination
 
     filter_backends: tuple[BaseFilterBackend, ...] = (OrderingFilter, DjangoFilterBackend)
     ordering: tuple[str, ...] = ('-created', )
@@ -32,7 +36,9 @@ class GoalCommentListView(ListAPIView):
     filterset_fields: tuple[str, ...] = ('goal', )
 
     def get_queryset(self) -> QuerySet:
-        return GoalComment.objects.filter(goal__category__board__participants__user_id=self.request.user.id)
+        return GoalComment.objects.filter(
+            board__participants__user_id=self.request.user.id
+        ).select_related('user')
 
 
 class GoalCommentView(RetrieveUpdateDestroyAPIView):
@@ -53,4 +59,6 @@ class GoalCommentView(RetrieveUpdateDestroyAPIView):
     permission_classes: tuple[BasePermission, ...] = (CommentPermission, )
 
     def get_queryset(self) -> QuerySet:
-        return GoalComment.objects.filter(goal__category__board__participants__user_id=self.request.user.id)
+        return GoalComment.objects.filter(
+            board__participants__user_id=self.request.user.id
+        ).select_related('user')
@@ -1,14 +1,21 @@
 from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
-from goals.filters import GoalFilter
+from goals.filters import FullTextSearchFilter, GoalFilter
 from goals.models import Goal
+from goals.pagination import LimitOffsetOrKeysetPagination
 from goals.permissions import GoalPermission
-from goals.serializers import GoalCreateSerializer, GoalSerializer
+from goals.serializers import (
+    GoalBulkArchiveSerializer, GoalBulkCreateSerializer, GoalBulkUpdateSerializer, GoalCreateSerializer, GoalSerializer,
+)
+from goals.values import ValuesListMixin
 
 
 class GoalCreateView(CreateAPIView):
@@ -20,24 +27,82 @@ class GoalCreateView(CreateAPIView):
     serializer_class: BaseSerializer = GoalCreateSerializer
 
 
-class GoalListView(ListAPIView):
+class GoalBulkCreateView(CreateAPIView):
+    """
+    Create a list of new goal instances with the requesting user as an author
+
+    All goals are validated first and created in a single transaction, an error in any of them fails the whole list
+    """
+    queryset: QuerySet = Goal.objects.all()
+    permission_classes: tuple[BasePermission, ...] = (IsAuthenticated,)
+    serializer_class: BaseSerializer = GoalBulkCreateSerializer
+
+    def get_serializer(self, *args, **kwargs) -> BaseSerializer:
+        kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+
+class GoalBulkUpdateView(GenericAPIView):
+    """
+    partial_update:
+    Update one or more of the alterable fields of each goal in the list
+
+    All goals are validated first and updated in a single transaction, an error in any of them fails the whole list
+    """
+    permission_classes: tuple[BasePermission, ...] = (IsAuthenticated,)
+    serializer_class: BaseSerializer = GoalBulkUpdateSerializer
+
+    def get_queryset(self) -> QuerySet:
+        return Goal.objects.filter(
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
+            category__is_deleted=False,
+        ).exclude(status=Goal.Status.archived).select_related('user')
+
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_update(request)
+
+    def bulk_update(self, request: Request) -> Response:
+        serializer: BaseSerializer = self.get_serializer(
+            self.get_queryset(), data=request.data, many=True, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class GoalBulkArchiveView(GoalBulkUpdateView):
+    """
+    Set the status of each goal in the list to 'archived'
+
+    All goals are validated first and archived in a single transaction, an error in any of them fails the whole list
+    """
+    serializer_class: BaseSerializer = GoalBulkArchiveSerializer
+    http_method_names: list[str] = ['post', 'options']
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_update(request)
+
+
+class GoalListView(ValuesListMixin, ListAPIView):
     """
     Return a list of all goals owned by the requesting user
     """
     permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
     serializer_class: BaseSerializer = GoalSerializer
+    pagination_class: BasePagination = LimitOffsetOrKeysetPagination
 
-    filter_backends: tuple[BaseFilterBackend, ...] = (OrderingFilter, SearchFilter, DjangoFilterBackend)
+    filter_backends: tuple[BaseFilterBackend, ...] = (OrderingFilter, FullTextSearchFilter, DjangoFilterBackend)
     filterset_class = GoalFilter
     ordering_fields: tuple[str, ...] = ('title', 'created')
     ordering: tuple[str, ...] = ('title', )
-    search_fields: tuple[str, ...] = ('title', 'description')
 
     def get_queryset(self) -> QuerySet:
         return Goal.objects.filter(
-            category__board__participants__user_id=self.request.user.id,
-            category__is_deleted=False
-        ).exclude(status=Goal.Status.archived)
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
+            category__is_deleted=False,
+        ).exclude(status=Goal.Status.archived).select_related('user')
 
 
 class GoalView(RetrieveUpdateDestroyAPIView):
@@ -59,9 +124,10 @@ class GoalView(RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self) -> QuerySet:
         return Goal.objects.filter(
-            category__board__participants__user_id=self.request.user.id,
-            category__is_deleted=False
-        ).exclude(status=Goal.Status.archived)
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
+            category__is_deleted=False,
+        ).exclude(status=Goal.Status.archived).select_related('user')
 
     def perform_destroy(self, instance: Goal) -> None:
         instance.status = instance.Status.archived
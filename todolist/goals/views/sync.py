@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from goals.serializers import SyncSerializer
+from goals.sync import get_changes, make_token, read_token
+
+
+class SyncView(GenericAPIView):
+    """
+    Return boards, participants, categories, goals and comments of the user's boards changed since the given token,
+    tombstones of deleted comments and removed participants, and the token for the next request
+
+    Request without a token returns a token only: get it before loading the lists, then pass the last returned
+    token to get the changes made since. Changes may be returned more than once and should be applied as upserts.
+    A 410 response means the lists have to be loaded again.
+    """
+    permission_classes: tuple[BasePermission, ...] = (IsAuthenticated, )
+    serializer_class: BaseSerializer = SyncSerializer
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        # Changes of transactions still running now get older timestamps than the next token's time, an overlap
+        # makes the next request return them once they are committed
+        next_token: str = make_token(timezone.now() - settings.SYNC_OVERLAP)
+
+        data: dict = {'token': next_token}
+        if token := request.query_params.get('token'):
+            data |= get_changes(request.user.id, read_token(token))
+        return Response(self.get_serializer(data).data)
@@ -0,0 +1,52 @@
+import marshmallow_dataclass
+import pytest
+from marshmallow import ValidationError
+
+from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
+from bot.tg.decoding import decode, get_decoder
+
+MESSAGE: dict = {
+    'message_id': 2, 'from': {'id': 5, 'is_bot': False, 'first_name': 'Name'},
+    'chat': {'id': 5, 'first_name': 'Name', 'type': 'private'}, 'date': 1700000000, 'text': '/goals',
+    'entities': [{'offset': 0, 'length': 6, 'type': 'bot_command'}],
+}
+
+
+class TestDecoding:
+    @pytest.mark.parametrize('cls, data', [
+        (GetUpdatesResponse, {'ok': True, 'result': []}),
+        (GetUpdatesResponse, {'ok': True, 'result': [
+            {'update_id': 1, 'message': MESSAGE},
+            {'update_id': 2, 'callback_query': {'id': '3', 'message': MESSAGE, 'data': 'goal', 'chat_instance': '1'}},
+            {'update_id': 3, 'edited_message': MESSAGE},
+            {'update_id': 4, 'message': None},
+        ]}),
+        (SendMessageResponse, {'ok': True, 'result': MESSAGE}),
+    ])
+    def test_schema_parity(self, cls, data):
+        """Responses decode to the same objects as with the marshmallow schemas, unknown fields are excluded"""
+        assert decode(cls, data) == marshmallow_dataclass.class_schema(cls)().load(data)
+
+    @pytest.mark.parametrize('data, messages', [
+        ({'ok': True}, {'result': ['Missing data for required field.']}),
+        (
+            {'ok': True, 'result': [{'update_id': 1, 'message': {'chat': {'id': 1}}}]},
+            {'result': {0: {'message': {'text': ['Missing data for required field.']}}}},
+        ),
+        ({'ok': True, 'result': [{'update_id': '1'}]}, {'result': {0: {'update_id': ['Not a valid int.']}}}),
+        ({'ok': True, 'result': {}}, {'result': ['Not a valid list.']}),
+        ([], {'_schema': ['Invalid input type.']}),
+    ])
+    def test_invalid(self, data, messages):
+        """Invalid responses raise marshmallow errors nested under the path of the invalid value"""
+        with pytest.raises(ValidationError) as error:
+            decode(GetUpdatesResponse, data)
+
+        assert error.value.messages == messages
+
+    def test_cached(self):
+        assert get_decoder(GetUpdatesResponse) is get_decoder(GetUpdatesResponse)
+
+    def test_unsupported(self):
+        with pytest.raises(TypeError):
+            get_decoder(dict[str, int])
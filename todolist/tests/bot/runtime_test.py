@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from bot.runtime import AsyncRuntime
+from bot.tg.dc import CallbackQuery, Chat, GetUpdatesResponse, Message, Update
+
+
+class StopPolling(Exception):
+    pass
+
+
+class FakeClient:
+    """Client returning the given batches of updates, then stopping the runtime"""
+    def __init__(self, *batches: list[Update]):
+        self.batches: list[list[Update]] = list(batches)
+        self.offsets: list[int] = []
+
+    def get_updates(self, offset: int = 0) -> GetUpdatesResponse:
+        self.offsets.append(offset)
+        if not self.batches:
+            raise StopPolling
+        return GetUpdatesResponse(ok=True, result=self.batches.pop(0))
+
+
+def message(update_id: int, chat_id: int) -> Update:
+    return Update(update_id=update_id, message=Message(chat=Chat(id=chat_id), text=str(update_id)))
+
+
+class TestAsyncRuntime:
+    def test_ordering_and_concurrency(self):
+        """Updates of a chat are handled in order, chats are handled concurrently up to the limit"""
+        updates: list[Update] = [message(i, chat_id=i % 4) for i in range(1, 21)]
+        updates.append(Update(
+            update_id=21, callback_query=CallbackQuery(message=Message(chat=Chat(id=1), text=''), data='x')
+        ))
+        handled: list[tuple[int, int]] = []
+        running: list[int] = [0, 0]
+        lock = threading.Lock()
+
+        def handler(update: Update) -> None:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+                chat: Message = update.message or update.callback_query.message
+                handled.append((chat.chat.id, update.update_id))
+
+        client = FakeClient(updates[:10], updates[10:])
+        with pytest.raises(StopPolling):
+            AsyncRuntime(client, handler, concurrency=3).run()
+
+        assert sorted(update_id for _, update_id in handled) == list(range(1, 22))
+        for chat_id in range(4):
+            chat_updates: list[int] = [update_id for chat, update_id in handled if chat == chat_id]
+            assert chat_updates == sorted(chat_updates)
+        assert 1 < running[1] <= 3
+        assert client.offsets == [0, 11, 22]
+
+    def test_failed_update(self, caplog):
+        """A failing update is logged and does not stop the chat"""
+        handled: list[int] = []
+
+        def handler(update: Update) -> None:
+            if update.update_id == 1:
+                raise ValueError('Failed')
+            handled.append(update.update_id)
+
+        with pytest.raises(StopPolling):
+            AsyncRuntime(FakeClient([message(1, 1), message(2, 1)]), handler, concurrency=2).run()
+
+        assert handled == [2]
+        assert 'Failed to handle update 1' in caplog.text
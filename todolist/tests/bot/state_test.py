@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from bot.management.commands.runbot import Command
+from bot.models import ChatState, TgUser
+from bot.state import CacheStateStore, DatabaseStateStore, State, StateStore, get_state_store
+from bot.tg.dc import CallbackQuery, Chat, Message, Update
+from core.models import User
+from goals.models import Goal
+
+STORES: list[str] = ['bot.state.DatabaseStateStore', 'bot.state.CacheStateStore']
+
+
+def message(update_id: int, text: str) -> Update:
+    return Update(update_id=update_id, message=Message(chat=Chat(id=1), text=text))
+
+
+def callback(update_id: int, data: str) -> Update:
+    query = CallbackQuery(message=Message(chat=Chat(id=1), text=''), data=data)
+    return Update(update_id=update_id, callback_query=query)
+
+
+@pytest.mark.django_db
+class TestStateStore:
+    @pytest.mark.parametrize('store_class', [DatabaseStateStore, CacheStateStore])
+    def test_transitions(self, store_class):
+        """A transition only succeeds from the stored version of the state"""
+        store: StateStore = store_class(ttl=60)
+        started: State = store.start(1, '/creategoal')
+        assert store.get(1) == started
+        assert store.get(2) is None
+
+        advanced: State = store.advance(1, started, data='Category')
+        assert (advanced.command, advanced.data) == ('/creategoal', 'Category')
+        assert store.get(1) == advanced
+        # The step was already taken
+        assert store.advance(1, started, data='Other category') is None
+
+        assert store.finish(1, advanced) is True
+        assert store.finish(1, advanced) is False
+        assert store.get(1) is None
+
+    @pytest.mark.parametrize('store_class', [DatabaseStateStore, CacheStateStore])
+    def test_restarted(self, store_class):
+        """A state replaced by a new command cannot be finished"""
+        store: StateStore = store_class(ttl=60)
+        started: State = store.start(1, '/createboard')
+        restarted: State = store.start(1, '/createboard')
+
+        assert store.finish(1, started) is False
+        assert store.finish(1, restarted) is True
+
+    @pytest.mark.parametrize('store_class', [DatabaseStateStore, CacheStateStore])
+    def test_expired(self, store_class):
+        store: StateStore = store_class(ttl=0)
+        started: State = store.start(1, '/createboard')
+
+        assert store.get(1) is None
+        assert store.advance(1, started, data='Board') is None
+        assert store.finish(1, started) is False
+
+    def test_expired_rows_deleted(self):
+        """Expired states are deleted when a command is started"""
+        ChatState.objects.create(chat_id=2, command='/createboard', version='1', expires=timezone.now())
+        ChatState.objects.create(
+            chat_id=3, command='/createboard', version='1', expires=timezone.now() + timedelta(minutes=1)
+        )
+
+        DatabaseStateStore(ttl=60).start(1, '/createboard')
+
+        assert set(ChatState.objects.values_list('chat_id', flat=True)) == {1, 3}
+
+    def test_incomplete_store(self, settings):
+        """A store class that does not implement every transition fails when the bot starts"""
+        settings.BOT_STATE_STORE = 'bot.state.StateStore'
+
+        with pytest.raises(TypeError):
+            get_state_store()
+
+
+@pytest.mark.django_db
+class TestCreationFlow:
+    @pytest.mark.parametrize('store', STORES)
+    def test_shared_by_workers(self, settings, store, user: User, board_factory, goal_category_factory):
+        """Steps of a creation are handled by different bot processes, a repeated last step creates one goal"""
+        settings.BOT_STATE_STORE = store
+        TgUser.objects.create(chat_id=1, user=user)
+        goal_category_factory.create(title='Category', user=user, board=board_factory.create(with_owner=user))
+        workers: list[Command] = [Command(), Command()]
+        updates: list[Update] = [
+            message(1, '/creategoal'),
+            callback(2, 'Category'),
+            message(3, 'Goal'),
+            message(4, 'Goal'),
+        ]
+
+        with patch.object(workers[0].tg_client, 'send_message') as first, \
+                patch.object(workers[1].tg_client, 'send_message') as second:
+            for i, update in enumerate(updates):
+                workers[i % 2].handle_update(update)
+
+        assert [call.kwargs['text'] for call in first.call_args_list] == [
+            'Please choose a category from the following:\n', 'Goal successfully created',
+        ]
+        assert [call.kwargs['text'] for call in second.call_args_list] == [
+            'Please enter goal title:', 'Unknown command',
+        ]
+        assert list(Goal.objects.values_list('title', 'category__title')) == [('Goal', 'Category')]
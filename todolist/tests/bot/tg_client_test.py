@@ -0,0 +1,145 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from bot.tg.client import TgClient, TgClientError
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    """Telegram bot API answering requests with the given responses in turn, then with a sent message"""
+    daemon_threads: bool = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.responses: list[tuple[int, dict | str | float]] = []
+        self.requests: list[tuple[str, dict]] = []
+        self.connections: set[int] = set()
+
+    def respond(self, *responses: tuple[int, dict | str | float]) -> None:
+        self.responses += responses
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    server: FakeTelegram
+    protocol_version: str = 'HTTP/1.1'
+
+    def do_POST(self) -> None:
+        params: dict = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        method: str = self.path.rsplit('/', 1)[1]
+        self.server.requests.append((method, params))
+        self.server.connections.add(self.client_address[1])
+        status, data = self.server.responses.pop(0) if self.server.responses else (200, {})
+        if isinstance(data, float):
+            # Answer too late. time.sleep is patched by the tests.
+            threading.Event().wait(data)
+            data = {}
+        if isinstance(data, dict):
+            result: list | dict = [] if method == 'getUpdates' else {'chat': {'id': 1}, 'text': 'text'}
+            data = json.dumps({'ok': status == 200, 'result': result} | data)
+
+        body: bytes = data.encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def telegram(settings):
+    server = FakeTelegram()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.TELEGRAM_API_URL = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.TELEGRAM_BOT_TOKEN = 'token'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    sleeps: list[float] = []
+    monkeypatch.setattr('bot.tg.client.time.sleep', sleeps.append)
+    return sleeps
+
+
+class TestTgClient:
+    def test_keep_alive(self, telegram):
+        """Requests reuse the connection"""
+        client = TgClient()
+
+        for i in range(3):
+            client.send_message(chat_id=1, text=str(i))
+
+        assert telegram.requests == [('sendMessage', {'chat_id': 1, 'text': str(i)}) for i in range(3)]
+        assert len(telegram.connections) == 1
+
+    def test_retry_after(self, telegram, sleeps):
+        """A 429 response is retried after the time given by telegram, 5xx responses with exponential backoff"""
+        telegram.respond(
+            (429, {'description': 'Too Many Requests: retry after 3', 'parameters': {'retry_after': 3}}),
+            (502, '<html>Bad Gateway</html>'),
+            (500, {'description': 'Internal Server Error'}),
+        )
+
+        response = TgClient().send_message(chat_id=1, text='text')
+
+        assert response.ok is True
+        assert len(telegram.requests) == 4
+        assert sleeps == [3, 1, 2]
+
+    def test_attempts_exhausted(self, telegram, sleeps, settings):
+        settings.TELEGRAM_MAX_ATTEMPTS = 3
+        telegram.respond(*[(500, {'description': 'Internal Server Error'})] * 3)
+
+        with pytest.raises(TgClientError) as error:
+            TgClient().send_message(chat_id=1, text='text')
+
+        assert error.value.status == 500
+        assert len(telegram.requests) == 3
+        assert sleeps == [0.5, 1]
+
+    def test_client_error(self, telegram, sleeps):
+        """Other errors are not retried"""
+        telegram.respond((400, {'description': 'Bad Request: chat not found'}))
+
+        with pytest.raises(TgClientError, match='400: Bad Request: chat not found'):
+            TgClient().send_message(chat_id=1, text='text')
+
+        assert len(telegram.requests) == 1
+        assert sleeps == []
+
+    def test_read_timeout(self, telegram, sleeps, settings):
+        """A timed out message is not sent again, a timed out poll is"""
+        settings.TELEGRAM_READ_TIMEOUT = 0.1
+        telegram.respond((200, 0.3), (200, 0.3))
+
+        with pytest.raises(requests.Timeout):
+            TgClient().send_message(chat_id=1, text='text')
+        assert len(telegram.requests) == 1
+
+        response = TgClient().get_updates(offset=5, timeout=0)
+        assert response.ok is True
+        assert telegram.requests[1:] == [('getUpdates', {'offset': 5, 'timeout': 0})] * 2
+        assert sleeps == [0.5]
+
+    def test_connection_error(self, settings, sleeps):
+        settings.TELEGRAM_API_URL = 'http://127.0.0.1:9'
+        settings.TELEGRAM_MAX_ATTEMPTS = 2
+
+        with pytest.raises(requests.ConnectionError):
+            TgClient().send_message(chat_id=1, text='text')
+        assert sleeps == [0.5]
+
+    def test_set_webhook(self, telegram):
+        TgClient().set_webhook('https://example.com/bot/webhook', secret_token='secret')
+
+        assert telegram.requests == [('setWebhook', {
+            'url': 'https://example.com/bot/webhook', 'secret_token': 'secret',
+            'allowed_updates': ['message', 'callback_query'],
+        })]
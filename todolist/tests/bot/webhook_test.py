@@ -0,0 +1,145 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bot.models import QueuedUpdate
+from bot.queue import QueueWorker, enqueue_update, process_next_update
+from bot.tg.dc import Update
+
+
+def message(update_id: int, chat_id: int) -> dict:
+    return {'update_id': update_id, 'message': {'message_id': 1, 'chat': {'id': chat_id}, 'text': str(update_id)}}
+
+
+@pytest.fixture
+def webhook(settings):
+    settings.TELEGRAM_WEBHOOK_SECRET = 'secret'
+    return reverse('bot:webhook')
+
+
+@pytest.mark.django_db
+class TestWebhookView:
+    def test_enqueued(self, client, webhook):
+        """Updates are queued with their chat, repeated ones once"""
+        callback: dict = {
+            'update_id': 2, 'callback_query': {'id': '1', 'message': message(1, 20)['message'], 'data': 'x'},
+        }
+        for data in (message(1, 10), callback, {'update_id': 3, 'my_chat_member': {}}, message(1, 10)):
+            response = client.post(webhook, data, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN='secret')
+            assert response.status_code == status.HTTP_200_OK
+
+        assert list(QueuedUpdate.objects.order_by('update_id').values_list('update_id', 'chat_id', 'data')) == [
+            (1, 10, message(1, 10)), (2, 20, callback), (3, None, {'update_id': 3, 'my_chat_member': {}}),
+        ]
+
+    def test_secret(self, client, webhook):
+        for headers in ({}, {'HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN': 'wrong'}):
+            response = client.post(webhook, message(1, 10), format='json', **headers)
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not QueuedUpdate.objects.exists()
+
+    def test_invalid(self, client, webhook):
+        for body in (b'{', b'[]', b'{"update_id": "1"}'):
+            response = client.post(
+                webhook, body, content_type='application/json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN='secret'
+            )
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_disabled(self, client):
+        response = client.post(reverse('bot:webhook'), message(1, 10), format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestQueue:
+    def test_processed(self, caplog):
+        """Updates are handled in order and deleted, a failed update is logged and deleted too"""
+        assert [enqueue_update(message(update_id, 10)) for update_id in (3, 1, 2, 3)] == [True, True, True, False]
+        handled: list[int] = []
+
+        def handler(update: Update) -> None:
+            handled.append(update.update_id)
+            if update.update_id == 2:
+                raise ValueError('Failed')
+
+        while process_next_update(handler) is not None:
+            pass
+
+        assert handled == [1, 2, 3]
+        assert not QueuedUpdate.objects.exists()
+        assert 'Failed to handle update 2' in caplog.text
+
+    def test_claimed(self):
+        """A claimed update is skipped and holds back its chat until the claim expires"""
+        for update_id, chat_id in ((1, 10), (2, 10), (3, 20)):
+            enqueue_update(message(update_id, chat_id))
+        QueuedUpdate.objects.filter(update_id=1).update(claimed_until=timezone.now() + timedelta(minutes=1))
+        handled: list[int] = []
+
+        while process_next_update(lambda update: handled.append(update.update_id)) is not None:
+            pass
+        assert handled == [3]
+
+        QueuedUpdate.objects.filter(update_id=1).update(claimed_until=timezone.now() - timedelta(seconds=1))
+        while process_next_update(lambda update: handled.append(update.update_id)) is not None:
+            pass
+        assert handled == [3, 1, 2]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueueWorkers:
+    def test_chat_locked(self):
+        """While an update is handled by a worker, its claim is committed and other workers skip its chat"""
+        for update_id, chat_id in ((1, 10), (2, 10), (3, 20)):
+            enqueue_update(message(update_id, chat_id))
+        started, release = threading.Event(), threading.Event()
+
+        def handle_first() -> None:
+            def handler(update: Update) -> None:
+                started.set()
+                release.wait(5)
+            try:
+                process_next_update(handler)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=handle_first)
+        worker.start()
+        started.wait(5)
+        handled: list[int] = []
+        try:
+            assert QueuedUpdate.objects.get(update_id=1).claimed_until is not None
+            while process_next_update(lambda update: handled.append(update.update_id)) is not None:
+                pass
+        finally:
+            release.set()
+            worker.join()
+
+        assert handled == [3]
+        process_next_update(lambda update: handled.append(update.update_id))
+        assert handled == [3, 2]
+
+    def test_woken_up(self):
+        """A waiting worker is woken up by a new update"""
+        worker = QueueWorker(lambda update: None, poll_interval=10)
+        # Starts listening
+        worker.wait()
+
+        def enqueue() -> None:
+            time.sleep(0.1)
+            enqueue_update(message(1, 10))
+            connection.close()
+
+        threading.Thread(target=enqueue).start()
+        started: float = time.perf_counter()
+        worker.wait()
+
+        assert time.perf_counter() - started < 5
+        assert process_next_update(lambda update: None) == 1
@@ -1,6 +1,8 @@
 import pytest
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.test import APIClient
-from typing import Callable
+from typing import Callable, Iterator
 from unittest.mock import ANY
 
 from core.models import User
@@ -9,6 +11,25 @@ from goals.models import BoardParticipant
 pytest_plugins = 'tests.factories'
 
 
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def local_events() -> Iterator[None]:
+    """Dispatch events in the test process, notifications of the postgres backend are lost with rolled back tests"""
+    with override_settings(EVENT_STREAM_BACKEND='local'):
+        yield
+
+
+@pytest.fixture(scope='session', autouse=True)
+def local_cache() -> Iterator[None]:
+    """Keep the cache in the test process, so the queries of the database cache do not count in query tests"""
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+        yield
+
+
 @pytest.fixture
 def client() -> APIClient:
     return APIClient()
@@ -0,0 +1,80 @@
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.tg.dc import Chat, GetUpdatesResponse, Message, Update
+from core.instrumentation import collect_timings, timer
+from core.models import User
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    def test_header_and_log(self, settings, auth_client, board_participant: BoardParticipant, goal_factory, caplog):
+        """Responses report the statements and timings, which are logged under the URL name"""
+        settings.REQUEST_TIMING = True
+        goal_factory.create_batch(size=3, user=board_participant.user, category__board=board_participant.board)
+
+        with CaptureQueriesContext(connection) as queries, caplog.at_level(logging.INFO, 'core.instrumentation'):
+            response = auth_client.get(reverse('goals:goal-list'), {'limit': 10})
+
+        metrics: dict[str, str] = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+        assert set(metrics) == {'db', 'serializer', 'view', 'total'}
+        assert metrics['db'].endswith(f'desc="{len(queries)} queries"')
+
+        data: dict = json.loads(caplog.records[-1].getMessage())
+        assert data['name'] == 'goals:goal-list'
+        assert (data['method'], data['status'], data['queries']) == ('GET', 200, len(queries))
+        assert data['view_ms'] <= data['total_ms']
+
+    def test_disabled(self, auth_client):
+        """Nothing is reported by default"""
+        response = auth_client.get(reverse('goals:goal-list'))
+
+        assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+class TestTimings:
+    def test_nested_timers(self, user: User):
+        """Statements are counted and a part nested in itself is timed once"""
+        with collect_timings('test') as timings:
+            with timer('serializer'):
+                User.objects.get(id=user.id)
+                with timer('serializer'):
+                    User.objects.count()
+
+        assert timings.queries == 2
+        assert timings.durations['serializer'] >= timings.durations['db']
+        assert timings.durations['serializer'] <= timings.total
+
+    def test_timer_without_timings(self):
+        """Timers do nothing outside of collected blocks"""
+        with timer('serializer'):
+            pass
+
+    def test_bot_update(self, settings, user: User, caplog):
+        """Bot updates are timed and logged under their command"""
+        settings.REQUEST_TIMING = True
+        TgUser.objects.create(chat_id=1, user=user)
+        command = Command()
+        update = Update(update_id=10, message=Message(chat=Chat(id=1), text='/goals'))
+        # The bot loops until interrupted
+        updates: list = [GetUpdatesResponse(ok=True, result=[update]), KeyboardInterrupt]
+
+        with patch.object(command.tg_client, 'get_updates', side_effect=updates), \
+                patch.object(command.tg_client, 'send_message') as send_message, \
+                caplog.at_level(logging.INFO, 'core.instrumentation'), pytest.raises(KeyboardInterrupt), \
+                CaptureQueriesContext(connection) as queries:
+            command.handle(serial=True)
+
+        send_message.assert_called_once()
+        data: dict = json.loads(caplog.records[-1].getMessage())
+        assert (data['name'], data['update_id'], data['queries']) == ('bot:/goals', 10, len(queries))
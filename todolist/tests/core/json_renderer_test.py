@@ -0,0 +1,59 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+DATA: dict = {
+    'aware': datetime.datetime(2023, 8, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'offset': datetime.datetime(2023, 8, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=3))),
+    'naive': datetime.datetime(2023, 8, 1, 12, 30),
+    'date': datetime.date(2023, 8, 1),
+    'decimal': decimal.Decimal('1.50'),
+    'lazy': gettext_lazy('Board'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'text': 'Unicode: \u043f\u0440\u0438\u0432\u0435\u0442 \u2028 \u2029 "quoted" \\ / \n\t\x01',
+    'numbers': [0, -1, 2 ** 63 - 1, 1.5, 0.1, 123456.789, True, None],
+    'int_keys': {1: 'one', 2: 'two'},
+}
+
+
+class TestORJSONRenderer:
+    def test_same_output(self):
+        """Output matches the default JSON renderer byte for byte"""
+        data: dict = DATA | {'nested': [DATA, {'now': timezone.now()}]}
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent(self):
+        """Indented output is rendered like the default renderer does"""
+        assert ORJSONRenderer().render(DATA, 'application/json; indent=4') == JSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        )
+
+    def test_big_integer(self):
+        """Integers orjson does not support are rendered by the default renderer"""
+        assert ORJSONRenderer().render({'big': 2 ** 70}) == b'{"big":1180591620717411303424}'
+
+
+class TestORJSONParser:
+    def test_same_result(self):
+        """Parsed data matches the default JSON parser"""
+        body: bytes = JSONRenderer().render(DATA)
+
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize('body', [b'{"a": ', b'{"a": NaN}', b'\xff'])
+    def test_invalid(self, body: bytes):
+        """Invalid JSON, non-finite numbers and invalid UTF-8 are rejected"""
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(body))
@@ -0,0 +1,111 @@
+import multiprocessing
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from core.metrics import Counter, Gauge, Metric, ValuesFile, generate_latest
+
+
+@pytest.fixture
+def metrics(settings, tmp_path):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_DIR = str(tmp_path)
+    settings.METRICS_TOKEN = ''
+    return settings
+
+
+def parse(text: str) -> dict[str, float]:
+    """Return the samples of a text format exposition by their name and labels"""
+    return {
+        match[1]: float(match[2]) for match in re.finditer(r'^([^#\s][^ ]*) (\S+)$', text, flags=re.MULTILINE)
+    }
+
+
+def record_in_child(counter: Counter, gauge: Gauge) -> None:
+    counter.inc(2, kind='child')
+    gauge.inc()
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def test_requests(self, metrics, auth_client):
+        """Latency, count and SQL statements of requests are exposed by URL name"""
+        auth_client.get(reverse('goals:goal-list'))
+        auth_client.get(reverse('goals:goal-list'))
+
+        response = auth_client.get(reverse('metrics'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        samples: dict[str, float] = parse(response.content.decode())
+        view: str = 'view="goals:goal-list"'
+        assert samples[f'http_request_duration_seconds_count{{{view}}}'] == 2
+        assert samples[f'http_request_duration_seconds_bucket{{{view},le="+Inf"}}'] == 2
+        assert samples[f'http_requests_total{{{view},method="GET",status="200"}}'] == 2
+        assert samples[f'http_db_queries_total{{{view}}}'] >= 2
+        # The request for the metrics is in flight
+        assert samples['http_requests_in_flight'] == 1
+        assert '# TYPE http_requests_total counter' in response.content.decode()
+
+    def test_with_server_timing(self, metrics, auth_client):
+        """Both middlewares share the timings, the Server-Timing header keeps its serializer and view parts"""
+        metrics.REQUEST_TIMING = True
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(reverse('goals:goal-list'))
+
+        timings: dict[str, str] = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+        assert set(timings) == {'db', 'serializer', 'view', 'total'}
+        count: int = len(queries)
+        assert timings['db'].endswith(f'desc="{count} queries"')
+        # Captured queries are reset by the next request
+        samples: dict[str, float] = parse(auth_client.get(reverse('metrics')).content.decode())
+        assert samples['http_db_queries_total{view="goals:goal-list"}'] == count
+
+    def test_token(self, metrics, client):
+        """The token is required if set"""
+        metrics.METRICS_TOKEN = 'secret'
+
+        assert client.get(reverse('metrics')).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_disabled(self, client):
+        response = client.get(reverse('metrics'))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestMetricsStore:
+    def test_processes_aggregated(self, metrics):
+        """Counters of every process are summed, gauges of processes that have exited are left out"""
+        counter = Counter('test_events', 'Test events', labelnames=('kind', ))
+        gauge = Gauge('test_running', 'Test gauge')
+        counter.inc(kind='child')
+        gauge.inc()
+
+        process = multiprocessing.get_context('fork').Process(target=record_in_child, args=(counter, gauge))
+        process.start()
+        process.join()
+
+        samples: dict[str, float] = parse(generate_latest())
+        del Metric.registry[counter.name], Metric.registry[gauge.name]
+        assert samples['test_events_total{kind="child"}'] == 3
+        assert samples['test_running'] == 1
+
+    def test_values_file_grows(self, tmp_path):
+        """Files grow as samples are added and are read back by other processes"""
+        values_file = ValuesFile(tmp_path / '1.db')
+        keys: list[str] = [f'key {i}' * 10 for i in range(2000)]
+        for i, key in enumerate(keys):
+            values_file.add(key, i)
+        values_file.add(keys[0], 0.5)
+
+        assert values_file.capacity > ValuesFile.initial_size
+        assert ValuesFile.read(tmp_path / '1.db') == {key: i for i, key in enumerate(keys)} | {keys[0]: 0.5}
+        # The file is reopened with its samples, e.g. when the pid is reused
+        assert ValuesFile(tmp_path / '1.db').positions == values_file.positions
@@ -3,7 +3,7 @@ from django.utils import timezone
 from pytest_factoryboy import register
 
 from core.models import User
-from goals.models import GoalCategory, Board, BoardParticipant, Goal
+from goals.models import GoalCategory, Board, BoardParticipant, Goal, GoalComment
 
 USER_PASSWORD: str = '123afafa'
 
@@ -80,3 +80,13 @@ class GoalFactory(factory.django.DjangoModelFactory):
     category = factory.SubFactory(GoalCategoryFactory)
     status = Goal.Status.to_do
     priority = Goal.Priority.medium
+
+
+@register
+class GoalCommentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GoalComment
+
+    text = 'Test comment'
+    user = factory.SubFactory(UserFactory)
+    goal = factory.SubFactory(GoalFactory)
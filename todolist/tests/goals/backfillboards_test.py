@@ -0,0 +1,39 @@
+import pytest
+from io import StringIO
+
+from django.core.management import call_command
+
+from goals.backfill import backfill_boards
+from goals.models import Goal, GoalComment
+
+
+@pytest.mark.django_db
+class TestBackfillBoards:
+    def test_backfill(self, goal_factory, goal_comment_factory):
+        """Boards of goals and comments created before they were stored are filled"""
+        goals: list[Goal] = goal_factory.create_batch(size=3)
+        comments: list[GoalComment] = [goal_comment_factory.create(goal=goal) for goal in goals]
+        Goal.objects.update(board=None)
+        GoalComment.objects.update(board=None)
+        out = StringIO()
+
+        call_command('backfillboards', '--batch-size=2', stdout=out)
+
+        for goal, comment in zip(goals, comments):
+            goal.refresh_from_db()
+            comment.refresh_from_db()
+            assert goal.board_id == goal.category.board_id
+            assert comment.board_id == goal.category.board_id
+        assert 'Goal: 3 rows filled' in out.getvalue()
+
+    def test_resume(self, goal_factory):
+        """An interrupted backfill continues with the rows left without a board"""
+        goal_factory.create_batch(size=3)
+        Goal.objects.update(board=None)
+
+        batches = backfill_boards(Goal, GoalComment, batch_size=1)
+        assert next(batches) == ('Goal', 1)
+        batches.close()
+
+        assert list(backfill_boards(Goal, GoalComment, batch_size=1)) == [('Goal', 1), ('Goal', 1)]
+        assert not Goal.objects.filter(board__isnull=True).exists()
@@ -0,0 +1,125 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import warnings
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+@pytest.fixture
+def board_goals(goal_category: GoalCategory, goal_factory, goal_comment_factory) -> list[Goal]:
+    goals: list[Goal] = goal_factory.create_batch(size=3, category=goal_category)
+    goal_comment_factory.create(goal=goals[0])
+    return goals
+
+
+def read_ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+@pytest.mark.django_db
+class TestBoardExport:
+    def test_ndjson(self, auth_client, board_participant: BoardParticipant, board_goals, settings):
+        """The board is streamed first, followed by rows of every table of the board"""
+        settings.EXPORT_CHUNK_SIZE = 2
+        settings.EXPORT_BUFFER_SIZE = 1
+
+        response = auth_client.get(reverse('goals:board-export', args=[board_participant.board_id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == f'attachment; filename="board-{board_participant.board_id}.ndjson"'
+        rows: list[dict] = read_ndjson(response.getvalue())
+        assert [row['table'] for row in rows] == [
+            'board', 'participants', 'categories', 'goals', 'goals', 'goals', 'comments'
+        ]
+        assert rows[0]['id'] == board_participant.board_id
+        assert [row['id'] for row in rows[3:6]] == [goal.id for goal in board_goals]
+        assert rows[6]['goal_id'] == board_goals[0].id
+
+    def test_csv_gzip(self, auth_client, board_participant: BoardParticipant, board_goals):
+        """A single table is exported as CSV, compressed on request"""
+        response = auth_client.get(
+            reverse('goals:board-export', args=[board_participant.board_id]),
+            {'output': 'csv', 'table': 'goals', 'gzip': 'true'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/gzip'
+        assert response['Content-Disposition'].endswith(f'board-{board_participant.board_id}-goals.csv.gz"')
+        rows: list[dict] = list(csv.DictReader(io.StringIO(gzip.decompress(response.getvalue()).decode())))
+        assert [int(row['id']) for row in rows] == [goal.id for goal in board_goals]
+        assert rows[0]['title'] == board_goals[0].title
+
+    def test_csv_without_table(self, auth_client, board_participant: BoardParticipant):
+        """CSV exports require a table"""
+        response = auth_client.get(
+            reverse('goals:board-export', args=[board_participant.board_id]), {'output': 'csv'}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_not_participant(self, auth_client, goal_category: GoalCategory):
+        """Boards the user does not participate in are not exported"""
+        response = auth_client.get(reverse('goals:board-export', args=[goal_category.board_id]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_command(self, board_goals, tmp_path):
+        """The command writes the selected tables to a file"""
+        path = tmp_path / 'export.ndjson.gz'
+
+        call_command(
+            'exportboard', board_goals[0].board_id, '--table=comments', '--gzip', f'--file={path}', stderr=io.StringIO()
+        )
+
+        rows: list[dict] = read_ndjson(gzip.decompress(path.read_bytes()))
+        assert [row['table'] for row in rows] == ['board', 'comments']
+        assert rows[1]['id'] == GoalComment.objects.get().id
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBoardExportAsgi:
+    def test_streamed(self, auth_client, board_participant: BoardParticipant, board_goals, settings):
+        """Under ASGI, the export is sent chunk by chunk as it is produced"""
+        settings.EXPORT_BUFFER_SIZE = 1
+        session_key: str = auth_client.cookies[settings.SESSION_COOKIE_NAME].value
+        scope: dict = {
+            'type': 'http', 'method': 'GET', 'query_string': b'',
+            'path': reverse('goals:board-export', args=[board_participant.board_id]),
+            'headers': [(b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode())],
+        }
+
+        @async_to_sync
+        async def run() -> list[dict]:
+            received: asyncio.Queue = asyncio.Queue()
+            sent: list[dict] = []
+            await received.put({'type': 'http.request', 'body': b''})
+
+            async def send(message: dict) -> None:
+                sent.append(message)
+
+            await asyncio.wait_for(ASGIHandler()(scope, received.get, send), timeout=10)
+            return sent
+
+        with warnings.catch_warnings():
+            # Django warns when streaming content has to be consumed synchronously
+            warnings.simplefilter('error')
+            start, *bodies = run()
+
+        assert start['status'] == status.HTTP_200_OK
+        assert len([body for body in bodies if body.get('more_body')]) > 2
+        rows: list[dict] = read_ndjson(b''.join(body.get('body', b'') for body in bodies))
+        assert [row['table'] for row in rows] == [
+            'board', 'participants', 'categories', 'goals', 'goals', 'goals', 'comments'
+        ]
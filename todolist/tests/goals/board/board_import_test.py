@@ -0,0 +1,164 @@
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import User
+from goals.export import export_board
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.statistics import get_board_statistics
+
+
+@pytest.fixture
+def exported_board(board_factory, user_factory, goal_category_factory, goal_factory, goal_comment_factory) -> bytes:
+    """Export of a board with two participants, the second one being the author of the goal"""
+    board: Board = board_factory.create()
+    owner: User = user_factory.create()
+    writer: User = user_factory.create()
+    BoardParticipant.objects.create(board=board, user=owner)
+    BoardParticipant.objects.create(board=board, user=writer, role=BoardParticipant.Role.writer)
+    category: GoalCategory = goal_category_factory.create(board=board, user=owner)
+    goal: Goal = goal_factory.create(
+        category=category, user=writer, status=Goal.Status.done, description='Tab\there,\nnew line and \\N'
+    )
+    goal_comment_factory.create(goal=goal, user=user_factory.create())
+    return b''.join(export_board(board))
+
+
+@pytest.mark.django_db
+class TestBoardImport:
+    def test_success(self, auth_client, user: User, exported_board: bytes):
+        """Rows are created with remapped ids, participants are skipped and rows are credited to the user"""
+        source: Board = Board.objects.get()
+
+        response = auth_client.post(
+            reverse('goals:import-board'), exported_board, content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        board: Board = Board.objects.exclude(id=source.id).get()
+        assert response.data['boards'] == [board.id]
+        assert response.data['rows'] == {'board': 1, 'participants': 0, 'categories': 1, 'goals': 1, 'comments': 1}
+        assert response.data['skipped'] == 2
+        assert (board.title, board.created) == (source.title, source.created)
+        assert dict(board.participants.values_list('user_id', 'role')) == {user.id: BoardParticipant.Role.owner}
+
+        goal: Goal = Goal.objects.get(board=board)
+        source_goal: Goal = Goal.objects.get(board=source)
+        assert goal.category.board_id == board.id
+        assert (goal.title, goal.description, goal.status, goal.user_id) == (
+            source_goal.title, source_goal.description, source_goal.status, user.id
+        )
+        # Counters are maintained by the goal table's triggers
+        assert get_board_statistics(board.id)['by_status'][Goal.Status.done] == 1
+        comment: GoalComment = GoalComment.objects.get(board=board)
+        assert (comment.goal_id, comment.user_id) == (goal.id, user.id)
+
+    def test_participants_not_imported(self, auth_client, user: User, user_factory):
+        """A user cannot make other users participants, let alone owners, of an imported board"""
+        other: User = user_factory.create()
+        lines: list[dict] = [
+            {'table': 'board', 'id': 1, 'title': 'Board'},
+            {'table': 'participants', 'user_id': other.id, 'user__username': other.username, 'role': 1},
+            {'table': 'categories', 'id': 1, 'board_id': 1, 'user_id': other.id, 'title': 'Category'},
+        ]
+
+        response = auth_client.post(
+            reverse('goals:import-board'), '\n'.join(map(json.dumps, lines)), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['skipped'] == 1
+        board: Board = Board.objects.get()
+        assert dict(board.participants.values_list('user_id', 'role')) == {user.id: BoardParticipant.Role.owner}
+        assert GoalCategory.objects.get().user_id == user.id
+
+    def test_gzip(self, auth_client, exported_board: bytes):
+        """Bodies can be sent compressed"""
+        response = auth_client.post(
+            reverse('goals:import-board'), gzip.compress(exported_board),
+            content_type='application/x-ndjson', HTTP_CONTENT_ENCODING='gzip',
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Board.objects.count() == 2
+
+    def test_invalid_row(self, auth_client, exported_board: bytes):
+        """An invalid row fails the whole import"""
+        lines: list[bytes] = exported_board.splitlines()
+        goal: dict = json.loads(lines[4])
+        goal['status'] = 10
+        lines[4] = json.dumps(goal).encode()
+
+        response = auth_client.post(
+            reverse('goals:import-board'), b'\n'.join(lines), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['detail'].startswith('Line 5: status:')
+        assert Board.objects.count() == 1
+
+    def test_unknown_reference(self, auth_client, exported_board: bytes):
+        """Goals must refer to categories of the imported board"""
+        lines: list[bytes] = exported_board.splitlines()
+        del lines[3]
+
+        response = auth_client.post(
+            reverse('goals:import-board'), b'\n'.join(lines), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['detail'] == 'Line 4: category_id: no such row in the imported board'
+
+    @pytest.mark.parametrize('line, key, value, message', [
+        (1, 'table', ['board'], 'table: expected a string'),
+        (1, 'id', {'id': 1}, 'id: expected an integer'),
+        (4, 'user_id', [1], 'user_id: expected an integer'),
+        (5, 'category_id', '1', 'category_id: expected an integer'),
+        (5, 'title', 'Goal\x00', 'title: NUL characters are not allowed'),
+        (5, 'due_date', ['2023-08-01'], 'due_date: invalid value'),
+    ])
+    def test_malformed_row(self, auth_client, exported_board: bytes, line: int, key: str, value, message: str):
+        """Rows that are valid JSON but have values of unexpected types are rejected with their line"""
+        lines: list[bytes] = exported_board.splitlines()
+        row: dict = json.loads(lines[line - 1])
+        row[key] = value
+        lines[line - 1] = json.dumps(row).encode()
+
+        response = auth_client.post(
+            reverse('goals:import-board'), b'\n'.join(lines), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['detail'].startswith(f'Line {line}: {message}')
+        assert Board.objects.count() == 1
+
+    def test_not_authenticated(self, client, exported_board: bytes):
+        response = client.post(reverse('goals:import-board'), exported_board, content_type='application/x-ndjson')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_command(self, user: User, exported_board: bytes, tmp_path):
+        """The command imports every given file with its participants except the source owner"""
+        path = tmp_path / 'board.ndjson.gz'
+        path.write_bytes(gzip.compress(exported_board))
+        out = io.StringIO()
+        source: Board = Board.objects.get()
+
+        call_command('importboards', str(path), str(path), f'--owner={user.username}', '--batch-size=1', stdout=out)
+
+        writer: User = source.participants.get(role=BoardParticipant.Role.writer).user
+        assert Board.objects.count() == 3
+        for board in Board.objects.exclude(id=source.id):
+            assert dict(board.participants.values_list('user_id', 'role')) == {
+                user.id: BoardParticipant.Role.owner, writer.id: BoardParticipant.Role.writer,
+            }
+            assert Goal.objects.get(board=board).user_id == writer.id
+        assert out.getvalue().count(
+            '1 board, 1 participants, 1 categories, 1 goals, 1 comments imported, 1 participants skipped'
+        ) == 2
+        assert 'rows/s' in out.getvalue()
@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import User
+from goals.models import Board, BoardParticipant
+
+
+@pytest.mark.django_db
+class TestListBoard:
+    url: str = reverse('goals:board-list')
+
+    def test_list_boards(self, auth_client, user: User, board_factory, board_data):
+        """Only active boards the user participates in are listed"""
+        board = board_factory.create(with_owner=user)
+        board_factory.create(with_owner=user, is_deleted=True)
+        board_factory.create()
+
+        response = auth_client.get(self.url)
+
+        assert response.data == [board_data(id=board.id, title=board.title)]
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_without_count(self, auth_client, user: User, board_factory):
+        """Boards can be listed without counting them"""
+        board_factory.create_batch(size=2, with_owner=user)
+
+        response = auth_client.get(self.url, data={'limit': 1, 'count': 'false'})
+
+        assert response.data['count'] is None
+        assert len(response.data['results']) == 1
+        assert response.data['next'] is not None
+
+    def test_not_modified(self, auth_client, user: User, board_factory, django_assert_num_queries):
+        """A request with the current ETag in If-None-Match returns 304 without querying the boards"""
+        board_factory.create(with_owner=user)
+        etag = auth_client.get(self.url)['ETag']
+
+        # Session, user and board roles
+        with django_assert_num_queries(3):
+            response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    def test_cache_invalidated_on_update(
+            self, auth_client, user: User, board: Board, board_participant: BoardParticipant,
+            django_capture_on_commit_callbacks,
+    ):
+        """Changing a board invalidates the cached list and its ETag"""
+        first_response = auth_client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.put(reverse('goals:board', args=[board.id]), {'title': 'New title', 'participants': []})
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=first_response['ETag'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != first_response['ETag']
+        assert response.data[0]['title'] == 'New title'
+
+    def test_cache_invalidated_on_new_board(self, auth_client, user: User, board_factory):
+        """Being added to a board changes the cached list"""
+        board_factory.create(with_owner=user)
+        auth_client.get(self.url)
+
+        board_factory.create(with_owner=user)
+        response = auth_client.get(self.url)
+
+        assert len(response.data) == 2
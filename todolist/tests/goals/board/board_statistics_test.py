@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import User
+from goals.models import BoardParticipant, Goal, GoalCategory, GoalCounter
+from goals.statistics import get_board_statistics
+
+# Session and user lookups made by the session authentication on every request
+AUTH_QUERIES: int = 2
+
+
+@pytest.fixture
+def board_goals(goal_category: GoalCategory, goal_factory) -> list[Goal]:
+    yesterday: datetime.date = timezone.localdate() - datetime.timedelta(days=1)
+    return [
+        goal_factory.create(category=goal_category, status=Goal.Status.to_do, priority=Goal.Priority.high),
+        goal_factory.create(category=goal_category, status=Goal.Status.to_do, due_date=yesterday),
+        goal_factory.create(category=goal_category, status=Goal.Status.in_progress, due_date=yesterday),
+        goal_factory.create(category=goal_category, status=Goal.Status.done, due_date=yesterday),
+        goal_factory.create(category=goal_category, status=Goal.Status.archived, priority=Goal.Priority.high),
+    ]
+
+
+@pytest.mark.django_db
+class TestBoardStatistics:
+    def test_success(self, auth_client, board_participant: BoardParticipant, board_goals, django_assert_num_queries):
+        """Goal counts are read from the counters with a single query"""
+        # Board, the permission check and counters
+        with django_assert_num_queries(AUTH_QUERIES + 3):
+            response = auth_client.get(reverse('goals:board-statistics', args=[board_participant.board_id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            'board': board_participant.board_id,
+            'total': 4,
+            'overdue': 2,
+            'by_status': {'1': 2, '2': 1, '3': 1, '4': 1},
+            'by_priority': {'1': 0, '2': 3, '3': 1, '4': 0},
+        }
+
+    def test_not_participant(self, auth_client, board_goals, goal_category: GoalCategory):
+        """Statistics of boards the user does not participate in are not found"""
+        response = auth_client.get(reverse('goals:board-statistics', args=[goal_category.board_id]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_updates(self, auth_client, user: User, board_participant: BoardParticipant, board_goals, goal_factory):
+        """Counters follow single and bulk goal updates"""
+        goal_factory.create(category=board_goals[0].category, priority=Goal.Priority.critical)
+        board_goals[0].status = Goal.Status.done
+        board_goals[0].save()
+        Goal.objects.filter(id=board_goals[1].id).update(due_date=None)
+        auth_client.post(reverse('goals:bulk-archive-goal'), [{'id': board_goals[2].id}], format='json')
+
+        statistics: dict = get_board_statistics(board_participant.board_id)
+
+        assert statistics['total'] == 4
+        assert statistics['overdue'] == 0
+        assert statistics['by_status'] == {1: 2, 2: 0, 3: 2, 4: 2}
+        assert statistics['by_priority'] == {1: 0, 2: 2, 3: 1, 4: 1}
+
+    def test_category_destroyed(self, auth_client, user: User, board_participant, goal_category_factory, goal_factory):
+        """Goals archived by the category deletion are counted as archived"""
+        category: GoalCategory = goal_category_factory.create(board=board_participant.board, user=user)
+        goal_factory.create_batch(size=3, category=category)
+
+        auth_client.delete(reverse('goals:category', args=[category.id]))
+
+        assert get_board_statistics(board_participant.board_id)['by_status'] == {1: 0, 2: 0, 3: 0, 4: 3}
+
+    def test_reconcile(self, board_participant: BoardParticipant, board_goals):
+        """The reconcile command rebuilds the counters from the goals"""
+        expected: dict = get_board_statistics(board_participant.board_id)
+        GoalCounter.objects.update(count=100)
+
+        call_command('reconcilestatistics', f'--board={board_participant.board_id}')
+
+        assert get_board_statistics(board_participant.board_id) == expected
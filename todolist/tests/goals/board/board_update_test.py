@@ -1,3 +1,5 @@
+from unittest.mock import call, patch
+
 import pytest
 from django.urls import reverse
 from rest_framework import status
@@ -75,3 +77,56 @@ class TestUpdateBoard:
 
         assert response.data == {'participants': [{'role': ['"1" is not a valid choice.']}]}
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize('size', (2, 20))
+    def test_update_board_participants_query_count(
+            self,
+            size,
+            auth_client,
+            user_factory,
+            board_participant_factory,
+            board: Board,
+            board_participant: BoardParticipant,
+            django_assert_num_queries,
+    ):
+        """Participants are kept, changed, removed and added with a constant number of queries"""
+        kept, changed, removed = (
+            board_participant_factory.create_batch(size=size, board=board, role=BoardParticipant.Role.reader)
+            for _ in range(3)
+        )
+        added_users = user_factory.create_batch(size=size)
+        participants = (
+            [{'user': pa.user.username, 'role': BoardParticipant.Role.reader} for pa in kept] +
+            [{'user': pa.user.username, 'role': BoardParticipant.Role.writer} for pa in changed] +
+            [{'user': new_user.username, 'role': BoardParticipant.Role.reader} for new_user in added_users]
+        )
+
+        # Session, user, board, board roles, users, existing participants, savepoint, delete, update, insert,
+        # savepoint release, board update and participants in the response
+        with django_assert_num_queries(13):
+            response = auth_client.put(self.get_url(board.id), self.get_update_data(participants=participants))
+
+        roles = dict(BoardParticipant.objects.filter(board=board).values_list('user_id', 'role'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(roles) == 1 + 3 * size
+        assert all(roles[pa.user_id] == BoardParticipant.Role.writer for pa in changed)
+        assert not any(pa.user_id in roles for pa in removed)
+
+    def test_update_board_removed_published_once(
+            self, auth_client, board_participant_factory, board: Board, board_participant: BoardParticipant,
+    ):
+        """Removed participants are published with a single event and cached board lists are invalidated once"""
+        removed = board_participant_factory.create_batch(size=3, board=board, role=BoardParticipant.Role.reader)
+
+        with patch('goals.events.publish') as publish, patch('goals.serializers.bump_board_versions') as bump, \
+                patch('goals.signals.bump_board_versions', bump):
+            response = auth_client.put(self.get_url(board.id), self.get_update_data(title=board.title))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(BoardParticipant.objects.filter(board=board)) == [board_participant]
+        participant_calls = [args for args in publish.call_args_list if args.args[0] == 'participant']
+        assert len(participant_calls) == 1
+        kind, action, board_id, ids, users = participant_calls[0].args
+        assert (kind, action, board_id) == ('participant', 'deleted', board.id)
+        assert (set(ids), set(users)) == ({pa.id for pa in removed}, {pa.user_id for pa in removed})
+        assert bump.call_args_list == [call([board.id])]
@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import User
+from goals.models import Board, CascadeTask, Goal, GoalCategory
+
+
+@pytest.fixture
+def deferred_cascade(settings) -> None:
+    settings.DEFERRED_CASCADE_DELETE = True
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('deferred_cascade')
+class TestDeferredCascade:
+    def test_destroy_board(self, auth_client, user: User, board_factory, goal_category_factory, goal_factory):
+        """Deleting a board queues archiving of its categories and goals, which the worker does in batches"""
+        board = board_factory.create(with_owner=user)
+        categories = goal_category_factory.create_batch(size=2, user=user, board=board)
+        goal_factory.create_batch(size=3, user=user, category=categories[0])
+
+        response = auth_client.delete(reverse('goals:board', args=[board.id]))
+        task = CascadeTask.objects.get(board=board)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['id'] == task.id
+        assert Board.objects.get(id=board.id).is_deleted
+        assert not GoalCategory.objects.filter(is_deleted=True).exists()
+
+        call_command('runcascade', '--once', '--batch-size=2')
+        task.refresh_from_db()
+
+        assert task.status == CascadeTask.Status.done
+        assert task.processed == 5
+        assert not GoalCategory.objects.filter(board=board, is_deleted=False).exists()
+        assert not Goal.objects.exclude(status=Goal.Status.archived).exists()
+
+    def test_destroy_category(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """Deleting a category queues archiving of its goals"""
+        goal_factory.create_batch(size=2, user=user, category=goal_category)
+
+        response = auth_client.delete(reverse('goals:category', args=[goal_category.id]))
+        call_command('runcascade', '--once')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert GoalCategory.objects.get(id=goal_category.id).is_deleted
+        assert not Goal.objects.exclude(status=Goal.Status.archived).exists()
+        assert CascadeTask.objects.get(category=goal_category).status == CascadeTask.Status.done
+
+    def test_resume(self, user: User, board_participant, goal_category, goal_factory):
+        """A task interrupted half way is continued without processing objects twice"""
+        goals = goal_factory.create_batch(size=3, user=user, category=goal_category)
+        Goal.objects.filter(id=goals[0].id).update(status=Goal.Status.archived)
+        task = CascadeTask.objects.create(category=goal_category, user=user, status=CascadeTask.Status.running)
+
+        call_command('runcascade', '--once')
+        task.refresh_from_db()
+
+        assert task.processed == 2
+        assert task.status == CascadeTask.Status.done
+
+    def test_progress(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """The task's progress is available to the user who requested it"""
+        goal_factory.create_batch(size=2, user=user, category=goal_category)
+        task_id = auth_client.delete(reverse('goals:category', args=[goal_category.id])).data['id']
+        call_command('runcascade', '--once', '--batch-size=1')
+
+        response = auth_client.get(reverse('goals:cascade-task', args=[task_id]))
+
+        assert response.data['status'] == CascadeTask.Status.done
+        assert response.data['processed'] == 2
+        assert response.status_code == status.HTTP_200_OK
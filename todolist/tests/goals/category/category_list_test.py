@@ -42,3 +42,19 @@ class TestListCategory:
 
         assert len(results) == category_count
         assert not any([cat['is_deleted'] for cat in results])
+
+    def test_cache_invalidated_on_create(
+            self, auth_client, user: User, board_participant: BoardParticipant, goal_category_factory,
+            django_capture_on_commit_callbacks,
+    ):
+        """Creating a category invalidates the cached list"""
+        goal_category_factory.create(user=user, board=board_participant.board)
+        first_response = auth_client.get(reverse('goals:category-list'))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            goal_category_factory.create(user=user, board=board_participant.board)
+        response = auth_client.get(reverse('goals:category-list'), HTTP_IF_NONE_MATCH=first_response['ETag'])
+
+        assert len(first_response.data) == 1
+        assert len(response.data) == 2
+        assert response.status_code == status.HTTP_200_OK
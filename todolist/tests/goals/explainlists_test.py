@@ -0,0 +1,25 @@
+import pytest
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+
+from core.models import User
+
+
+@pytest.mark.django_db
+class TestExplainLists:
+    def test_explain_all_endpoints(self, user: User, board_participant, goal_category, goal):
+        """The query plan is printed for every list endpoint"""
+        out = StringIO()
+
+        call_command('explainlists', user.username, stdout=out)
+
+        output = out.getvalue()
+        for url_name in ('goals:board-list', 'goals:category-list', 'goals:goal-list', 'goals:comment-list'):
+            assert url_name in output
+        assert 'actual time' in output
+
+    def test_explain_invalid_query(self, user: User):
+        """An invalid filter value returns an error"""
+        with pytest.raises(CommandError):
+            call_command('explainlists', user.username, '--endpoint=goals:goal-list', '--query=status=abc')
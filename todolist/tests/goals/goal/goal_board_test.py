@@ -0,0 +1,64 @@
+import pytest
+from django.urls import reverse
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db
+class TestGoalBoard:
+    """Goals and comments keep a copy of their category's board"""
+
+    def test_create(self, goal: Goal, goal_comment_factory):
+        """New goals and comments take the board of their category"""
+        comment: GoalComment = goal_comment_factory.create(goal=goal)
+
+        assert goal.board_id == goal.category.board_id
+        assert comment.board_id == goal.category.board_id
+
+    def test_goal_moved(self, goal: Goal, goal_comment_factory, goal_category_factory, board_factory):
+        """A goal moved to a category of another board takes its comments along"""
+        comment: GoalComment = goal_comment_factory.create(goal=goal)
+        board: Board = board_factory.create()
+        other_category: GoalCategory = goal_category_factory.create(board=board)
+
+        goal = Goal.objects.get(id=goal.id)
+        goal.category = other_category
+        goal.save()
+
+        comment.refresh_from_db()
+        assert goal.board_id == board.id
+        assert comment.board_id == board.id
+
+    def test_category_moved(self, goal: Goal, goal_comment_factory, board_factory):
+        """A category moved to another board takes its goals and their comments along"""
+        comment: GoalComment = goal_comment_factory.create(goal=goal)
+        board: Board = board_factory.create()
+
+        category = GoalCategory.objects.get(id=goal.category_id)
+        category.board = board
+        category.save()
+
+        goal.refresh_from_db()
+        comment.refresh_from_db()
+        assert goal.board_id == board.id
+        assert comment.board_id == board.id
+
+    def test_bulk_update_moved(
+            self, auth_client, user, board_participant: BoardParticipant, goal_factory, goal_comment_factory,
+            goal_category_factory, board_participant_factory,
+    ):
+        """Goals moved to another board by a bulk update take their comments along"""
+        goal: Goal = goal_factory.create(category__board=board_participant.board, category__user=user)
+        comment: GoalComment = goal_comment_factory.create(goal=goal)
+        other_participant: BoardParticipant = board_participant_factory.create(user=user)
+        other_category: GoalCategory = goal_category_factory.create(board=other_participant.board, user=user)
+
+        response = auth_client.patch(
+            reverse('goals:bulk-update-goal'), [{'id': goal.id, 'category': other_category.id}], format='json'
+        )
+
+        goal.refresh_from_db()
+        comment.refresh_from_db()
+        assert response.data[0]['category'] == other_category.id
+        assert goal.board_id == other_category.board_id
+        assert comment.board_id == other_category.board_id
@@ -0,0 +1,147 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import User
+from goals.models import BoardParticipant, Goal, GoalCategory
+
+# Session and user lookups made by the session authentication on every request
+AUTH_QUERIES: int = 2
+
+
+@pytest.mark.django_db
+class TestBulkCreateGoal:
+    url: str = reverse('goals:bulk-create-goal')
+
+    @pytest.mark.parametrize('size', (1, 100))
+    def test_success(
+            self, size, auth_client, user: User, board_participant, goal_category: GoalCategory, goal_data,
+            django_assert_num_queries,
+    ):
+        """All goals are created with a constant number of queries"""
+        data = [{'title': f'Goal {i}', 'category': goal_category.id, 'priority': 1} for i in range(size)]
+
+        # Categories, board roles, savepoint, insert and savepoint release
+        with django_assert_num_queries(AUTH_QUERIES + 5):
+            response = auth_client.post(self.url, data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Goal.objects.filter(category=goal_category).count() == size
+        assert response.data[0] == goal_data(title='Goal 0', category=goal_category.id, description=None, due_date=None)
+
+    def test_per_item_errors(self, auth_client, user: User, board_participant, goal_category, goal_category_factory):
+        """Invalid items fail the whole list and errors are returned per item"""
+        deleted_category = goal_category_factory.create(user=user, board=goal_category.board, is_deleted=True)
+        data = [
+            {'title': 'Valid goal', 'category': goal_category.id},
+            {'title': 'Deleted category', 'category': deleted_category.id},
+            {'title': 'Missing category', 'category': 0},
+        ]
+
+        response = auth_client.post(self.url, data)
+
+        assert response.data == [
+            {},
+            {'category': ['Cannot use a deleted category']},
+            {'category': ['Invalid pk "0" - object does not exist.']},
+        ]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Goal.objects.exists()
+
+    def test_reader_forbidden(self, auth_client, user: User, board_participant_factory, goal_category_factory):
+        """A reader cannot create goals on a board"""
+        participant = board_participant_factory.create(user=user, role=BoardParticipant.Role.reader)
+        category = goal_category_factory.create(user=user, board=participant.board)
+
+        response = auth_client.post(self.url, [{'title': 'Test goal', 'category': category.id}])
+
+        assert response.data == [{'category': ['No permission to create goals on this board']}]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBulkUpdateGoal:
+    url: str = reverse('goals:bulk-update-goal')
+
+    def test_success(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """Each goal gets its own changes"""
+        first, second = goal_factory.create_batch(size=2, user=user, category=goal_category)
+        data = [
+            {'id': first.id, 'status': Goal.Status.done},
+            {'id': second.id, 'title': 'New title', 'priority': Goal.Priority.high},
+        ]
+
+        response = auth_client.patch(self.url, data)
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.data] == [first.id, second.id]
+        assert first.status == Goal.Status.done
+        assert (second.title, second.priority, second.status) == ('New title', Goal.Priority.high, Goal.Status.to_do)
+
+    def test_other_user_goal(self, auth_client, board_participant, goal_factory):
+        """Goals on boards the user does not participate in cannot be updated"""
+        goal = goal_factory.create()
+
+        response = auth_client.patch(self.url, [{'id': goal.id, 'title': 'New title'}])
+
+        assert response.data == [{'id': [f'Invalid pk "{goal.id}" - object does not exist.']}]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_duplicate_ids(self, auth_client, user: User, board_participant, goal: Goal):
+        """The same goal cannot be listed twice"""
+        response = auth_client.patch(self.url, [{'id': goal.id}, {'id': goal.id}])
+
+        assert response.data == {'non_field_errors': ['Each goal can only be listed once']}
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_missing_id(self, auth_client, user: User, board_participant, goal: Goal):
+        """Every item must give the id of the goal it changes"""
+        response = auth_client.patch(self.url, [{'id': goal.id, 'title': 'New title'}, {'title': 'New title'}])
+
+        assert response.data == [{}, {'id': ['This field is required.']}]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_move_to_read_only_board(
+            self, auth_client, user: User, board_participant, goal_category, goal_factory, board_participant_factory,
+            goal_category_factory,
+    ):
+        """Goals cannot be moved to a category of a board the user only reads"""
+        goal: Goal = goal_factory.create(user=user, category=goal_category)
+        participant = board_participant_factory.create(user=user, role=BoardParticipant.Role.reader)
+        category: GoalCategory = goal_category_factory.create(user=user, board=participant.board)
+
+        response = auth_client.patch(self.url, [{'id': goal.id, 'category': category.id}])
+        goal.refresh_from_db()
+
+        assert response.data == [{'category': ['No permission to move goals to this board']}]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert goal.category_id == goal_category.id
+
+
+@pytest.mark.django_db
+class TestBulkArchiveGoal:
+    url: str = reverse('goals:bulk-archive-goal')
+
+    @pytest.mark.parametrize('size', (1, 100))
+    def test_success(
+            self, size, auth_client, user: User, board_participant, goal_category, goal_factory,
+            django_assert_num_queries,
+    ):
+        """All goals are archived with a constant number of queries"""
+        goals = goal_factory.create_batch(size=size, user=user, category=goal_category)
+
+        # Goals, board roles, savepoint, update and savepoint release
+        with django_assert_num_queries(AUTH_QUERIES + 5):
+            response = auth_client.post(self.url, [{'id': goal.id} for goal in goals])
+
+        assert response.data == [{'id': goal.id} for goal in goals]
+        assert response.status_code == status.HTTP_200_OK
+        assert not Goal.objects.exclude(status=Goal.Status.archived).exists()
+
+    def test_missing_id(self, auth_client, board_participant):
+        response = auth_client.post(self.url, [{}])
+
+        assert response.data == [{'id': ['This field is required.']}]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
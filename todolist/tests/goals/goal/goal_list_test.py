@@ -0,0 +1,124 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import User
+from goals.models import GoalCategory
+
+# Session and user lookups made by the session authentication on every request
+AUTH_QUERIES: int = 2
+
+
+@pytest.mark.django_db
+class TestListGoal:
+    url: str = reverse('goals:goal-list')
+
+    def test_keyset_pagination(
+            self, auth_client, user: User, board_participant, goal_category: GoalCategory, goal_factory
+    ):
+        """Following 'next' and 'previous' cursors walks through all goals without gaps or duplicates"""
+        goals = goal_factory.create_batch(size=5, user=user, category=goal_category)
+        expected_ids = [goal.id for goal in sorted(goals, key=lambda goal: (goal.title, goal.id))]
+
+        response = auth_client.get(self.url, data={'cursor': '', 'limit': 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        assert response.data['previous'] is None
+
+        pages = [[goal['id'] for goal in response.data['results']]]
+        while response.data['next']:
+            response = auth_client.get(response.data['next'])
+            pages.append([goal['id'] for goal in response.data['results']])
+
+        assert pages == [expected_ids[0:2], expected_ids[2:4], expected_ids[4:]]
+
+        response = auth_client.get(response.data['previous'])
+        assert [goal['id'] for goal in response.data['results']] == expected_ids[2:4]
+
+    def test_keyset_pagination_descending(
+            self, auth_client, user: User, board_participant, goal_category: GoalCategory, goal_factory
+    ):
+        """Keyset pagination follows the requested ordering"""
+        goals = goal_factory.create_batch(size=3, user=user, category=goal_category)
+        expected_ids = [goal.id for goal in sorted(goals, key=lambda goal: (goal.created, goal.id), reverse=True)]
+
+        response = auth_client.get(self.url, data={'cursor': '', 'limit': 2, 'ordering': '-created'})
+        next_response = auth_client.get(response.data['next'])
+
+        assert [goal['id'] for goal in response.data['results']] == expected_ids[:2]
+        assert [goal['id'] for goal in next_response.data['results']] == expected_ids[2:]
+        assert next_response.data['next'] is None
+
+    def test_keyset_pagination_invalid_cursor(self, auth_client, board_participant):
+        """A malformed cursor returns an error"""
+        response = auth_client.get(self.url, data={'cursor': 'not-a-cursor'})
+
+        assert response.data == {'detail': 'Invalid cursor'}
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_limit_offset_pagination(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """Without a cursor the list is paginated with limit and offset"""
+        goal_factory.create_batch(size=3, user=user, category=goal_category)
+
+        response = auth_client.get(self.url, data={'limit': 2})
+
+        assert response.data['count'] == 3
+        assert len(response.data['results']) == 2
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_without_count(
+            self, auth_client, user: User, board_participant, goal_category, goal_factory, django_assert_num_queries
+    ):
+        """With count=false no count query is made, one more row tells whether there is a next page"""
+        goal_factory.create_batch(size=3, user=user, category=goal_category)
+
+        # Page only
+        with django_assert_num_queries(AUTH_QUERIES + 1):
+            response = auth_client.get(self.url, data={'limit': 2, 'count': 'false'})
+        last_response = auth_client.get(response.data['next'])
+
+        assert response.data['count'] is None
+        assert response.data['count_exact'] is False
+        assert len(response.data['results']) == 2
+        assert len(last_response.data['results']) == 1
+        assert last_response.data['next'] is None
+        assert last_response.data['previous'] is not None
+
+    def test_estimated_count(self, auth_client, user: User, board_participant, goal_category, goal_factory, settings):
+        """With count=estimate large lists report the planner's estimate, small ones are counted"""
+        goal_factory.create_batch(size=3, user=user, category=goal_category)
+
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 0
+        estimated = auth_client.get(self.url, data={'limit': 2, 'count': 'estimate'})
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1000
+        counted = auth_client.get(self.url, data={'limit': 2, 'count': 'estimate'})
+
+        assert isinstance(estimated.data['count'], int)
+        assert estimated.data['count_exact'] is False
+        assert estimated.data['next'] is not None
+        assert counted.data['count'] == 3
+        assert counted.data['count_exact'] is True
+
+    def test_search(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """Search matches word prefixes in titles and descriptions, ranking title matches first"""
+        title_match = goal_factory.create(
+            user=user, category=goal_category, title='Buy groceries', description='Milk and bread'
+        )
+        description_match = goal_factory.create(
+            user=user, category=goal_category, title='Weekend', description='Go to the grocery store'
+        )
+        goal_factory.create(user=user, category=goal_category, title='Unrelated', description=None)
+
+        response = auth_client.get(self.url, data={'search': 'grocer'})
+
+        assert [goal['id'] for goal in response.data] == [title_match.id, description_match.id]
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_search_all_terms(self, auth_client, user: User, board_participant, goal_category, goal_factory):
+        """All search terms have to match, special characters are ignored"""
+        goal = goal_factory.create(user=user, category=goal_category, title='Buy milk', description=None)
+        goal_factory.create(user=user, category=goal_category, title='Buy bread', description=None)
+
+        response = auth_client.get(self.url, data={'search': "buy mil' &|"})
+
+        assert [item['id'] for item in response.data] == [goal.id]
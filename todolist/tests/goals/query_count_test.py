@@ -0,0 +1,114 @@
+import pytest
+from django.urls import reverse
+
+from goals.models import BoardParticipant, Goal, GoalCategory
+
+PAGE_SIZES: tuple[int, ...] = (1, 5, 20)
+
+# Session and user lookups made by the session authentication on every request
+AUTH_QUERIES: int = 2
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+    """Every goals endpoint runs the same number of queries regardless of how many rows it serializes"""
+
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_category_list(
+            self, size, auth_client, board_participant: BoardParticipant, goal_category_factory,
+            django_assert_num_queries,
+    ):
+        """Category list query count does not depend on the page size"""
+        goal_category_factory.create_batch(size=size, board=board_participant.board)
+
+        # Board roles for the response cache key, count and page
+        with django_assert_num_queries(AUTH_QUERIES + 3):
+            response = auth_client.get(reverse('goals:category-list'), data={'limit': size})
+
+        assert len(response.data['results']) == size
+
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_goal_list(
+            self, size, auth_client, board_participant, goal_category: GoalCategory, goal_factory,
+            django_assert_num_queries,
+    ):
+        """Goal list query count does not depend on the page size"""
+        goal_factory.create_batch(size=size, category=goal_category)
+
+        # Count and page
+        with django_assert_num_queries(AUTH_QUERIES + 2):
+            response = auth_client.get(reverse('goals:goal-list'), data={'limit': size})
+
+        assert len(response.data['results']) == size
+
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_comment_list(
+            self, size, auth_client, board_participant, goal: Goal, goal_comment_factory, django_assert_num_queries
+    ):
+        """Comment list query count does not depend on the page size"""
+        goal_comment_factory.create_batch(size=size, goal=goal)
+
+        # Count and page
+        with django_assert_num_queries(AUTH_QUERIES + 2):
+            response = auth_client.get(reverse('goals:comment-list'), data={'limit': size})
+
+        assert len(response.data['results']) == size
+
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_board_list(self, size, auth_client, user, board_factory, django_assert_num_queries):
+        """Board list query count does not depend on the page size"""
+        board_factory.create_batch(size=size, with_owner=user)
+
+        # Board roles for the response cache key, count and page
+        with django_assert_num_queries(AUTH_QUERIES + 3):
+            response = auth_client.get(reverse('goals:board-list'), data={'limit': size})
+
+        assert len(response.data['results']) == size
+
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_board_retrieve(
+            self, size, auth_client, board_participant: BoardParticipant, board_participant_factory,
+            django_assert_num_queries,
+    ):
+        """Board query count does not depend on the number of participants"""
+        board_participant_factory.create_batch(
+            size=size, board=board_participant.board, role=BoardParticipant.Role.reader
+        )
+
+        # Board, participants with their users and the permission check
+        with django_assert_num_queries(AUTH_QUERIES + 3):
+            response = auth_client.get(reverse('goals:board', args=[board_participant.board_id]))
+
+        assert len(response.data['participants']) == size + 1
+
+    def test_goal_retrieve(self, auth_client, board_participant, goal: Goal, django_assert_num_queries):
+        """Goal is retrieved in a constant number of queries"""
+        # Goal with its author and category and the permission check
+        with django_assert_num_queries(AUTH_QUERIES + 2):
+            auth_client.get(reverse('goals:goal', args=[goal.id]))
+
+    def test_category_retrieve(
+            self, auth_client, board_participant, goal_category: GoalCategory, django_assert_num_queries
+    ):
+        """Category is retrieved in a constant number of queries"""
+        # Category with its author and the permission check
+        with django_assert_num_queries(AUTH_QUERIES + 2):
+            auth_client.get(reverse('goals:category', args=[goal_category.id]))
+
+    def test_comment_retrieve(self, auth_client, board_participant, goal_comment, django_assert_num_queries):
+        """Comment is retrieved in a constant number of queries"""
+        # Comment with its author
+        with django_assert_num_queries(AUTH_QUERIES + 1):
+            auth_client.get(reverse('goals:comment', args=[goal_comment.id]))
+
+    def test_comment_create(self, auth_client, board_participant, goal: Goal, django_assert_num_queries):
+        """Comment creation resolves the board role with a single query"""
+        # Goal with its category, board roles and insert
+        with django_assert_num_queries(AUTH_QUERIES + 3):
+            auth_client.post(reverse('goals:create-comment'), data={'goal': goal.id, 'text': 'Test comment'})
+
+    def test_goal_update(self, auth_client, board_participant, goal: Goal, django_assert_num_queries):
+        """Goal update checks the board role and the category ownership without extra lookups"""
+        # Goal with its author and category, board roles, new category and update
+        with django_assert_num_queries(AUTH_QUERIES + 4):
+            auth_client.patch(reverse('goals:goal', args=[goal.id]), data={'category': goal.category_id})
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+
+from goals.events import Event, broadcaster
+from goals.stream import EVENT_STREAM_PATH, event_stream
+
+
+def get_scope(client=None, method: str = 'GET') -> dict:
+    headers: list[tuple[bytes, bytes]] = []
+    if client is not None:
+        session_key: str = client.cookies[settings.SESSION_COOKIE_NAME].value
+        headers.append((b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode()))
+    return {'type': 'http', 'method': method, 'path': EVENT_STREAM_PATH, 'headers': headers}
+
+
+class StreamConnection:
+    """Runs the event stream application with in-memory ASGI receive and send channels"""
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.received: asyncio.Queue = asyncio.Queue()
+        self.sent: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task = asyncio.create_task(event_stream(scope, self.received.get, self.sent.put))
+
+    async def next_message(self) -> dict:
+        return await asyncio.wait_for(self.sent.get(), timeout=5)
+
+    async def next_event(self) -> dict:
+        message: dict = await self.next_message()
+        return json.loads(message['body'].decode().removeprefix('data: '))
+
+    async def disconnect(self) -> None:
+        await self.received.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    def test_not_authenticated(self, client):
+        """Anonymous connections are rejected"""
+        @async_to_sync
+        async def run() -> dict:
+            connection = StreamConnection(get_scope())
+            return await connection.next_message()
+
+        assert run()['status'] == 403
+
+    def test_events(
+            self, auth_client, user, board_participant, goal_category, goal_factory,
+            django_capture_on_commit_callbacks,
+    ):
+        """Changes of the user's boards are streamed once committed, the subscription ends on disconnect"""
+        @sync_to_async
+        def create_goal() -> int:
+            with django_capture_on_commit_callbacks(execute=True):
+                return goal_factory.create(category=goal_category).id
+
+        @async_to_sync
+        async def run() -> tuple[dict, dict, int]:
+            connection = StreamConnection(get_scope(auth_client))
+            start: dict = await connection.next_message()
+            await connection.next_message()
+
+            goal_id: int = await create_goal()
+            event: dict = await connection.next_event()
+
+            await connection.disconnect()
+            return start, event, goal_id
+
+        start, event, goal_id = run()
+
+        assert start['status'] == 200
+        assert (b'content-type', b'text/event-stream') in start['headers']
+        assert event == {
+            'kind': 'goal', 'action': 'created', 'board': goal_category.board_id, 'ids': [goal_id], 'users': []
+        }
+        assert broadcaster.subscription_count == 0
+
+    def test_joined_board(
+            self, auth_client, user, board_factory, board_participant_factory, goal_category_factory, goal_factory,
+            django_capture_on_commit_callbacks,
+    ):
+        """Events of a board the user joins while connected are streamed as well"""
+        board = board_factory.create()
+
+        @sync_to_async
+        def join_and_create_goal() -> None:
+            with django_capture_on_commit_callbacks(execute=True):
+                board_participant_factory.create(board=board, user=user)
+            with django_capture_on_commit_callbacks(execute=True):
+                goal_factory.create(category=goal_category_factory.create(board=board))
+
+        @async_to_sync
+        async def run() -> list[str]:
+            connection = StreamConnection(get_scope(auth_client))
+            await connection.next_message()
+            await connection.next_message()
+
+            await join_and_create_goal()
+            kinds: list[str] = [(await connection.next_event())['kind'] for _ in range(3)]
+
+            await connection.disconnect()
+            return kinds
+
+        assert run() == ['participant', 'category', 'goal']
+
+
+class TestBroadcaster:
+    def test_dispatch_from_thread(self):
+        """Events dispatched from other threads reach subscribers of their topics only"""
+        @async_to_sync
+        async def run() -> tuple[Event, Event | None]:
+            subscription = broadcaster.subscribe(['board:1'])
+            other = broadcaster.subscribe(['board:2'])
+            event = Event(kind='goal', action='created', board=1, ids=[1])
+
+            thread = threading.Thread(target=broadcaster.dispatch, args=(event, ))
+            thread.start()
+            thread.join()
+
+            received: Event = await subscription.get(timeout=5)
+            other_received: Event | None = await other.get(timeout=0.1)
+            subscription.close()
+            other.close()
+            return received, other_received
+
+        received, other_received = run()
+
+        assert received.ids == [1]
+        assert other_received is None
+        assert broadcaster.subscription_count == 0
+
+    def test_overflow(self):
+        """A subscriber that falls behind is told to stop"""
+        @async_to_sync
+        async def run() -> None:
+            subscription = broadcaster.subscribe(['board:1'], max_size=2)
+            for i in range(3):
+                broadcaster.dispatch(Event(kind='goal', action='created', board=1, ids=[i]))
+            await asyncio.sleep(0)
+
+            try:
+                await subscription.get(timeout=1)
+                await subscription.get(timeout=1)
+            finally:
+                subscription.close()
+
+        with pytest.raises(OverflowError):
+            run()
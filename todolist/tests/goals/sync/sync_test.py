@@ -0,0 +1,178 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import User
+from goals.models import BoardParticipant, Goal, GoalCategory, GoalComment, Tombstone
+from goals.sync import make_token
+
+# Session and user lookups made by the session authentication on every request
+AUTH_QUERIES: int = 2
+
+
+@pytest.fixture(autouse=True)
+def no_overlap(settings) -> None:
+    settings.SYNC_OVERLAP = datetime.timedelta(0)
+
+
+@pytest.mark.django_db
+class TestSync:
+    url: str = reverse('goals:sync')
+
+    def get_token(self, client) -> str:
+        return client.get(self.url).data['token']
+
+    def test_token_only(self, auth_client):
+        """A request without a token returns the token to start syncing from"""
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(response.data) == ['token']
+
+    def test_changes(
+            self, auth_client, user: User, board_participant: BoardParticipant, goal_category: GoalCategory,
+            goal_factory, goal_comment_factory, django_assert_num_queries,
+    ):
+        """Only objects changed since the token are returned, with a constant number of queries"""
+        old_goal: Goal = goal_factory.create(category=goal_category)
+        deleted_comment: GoalComment = goal_comment_factory.create(goal=old_goal)
+        deleted_comment_id: int = deleted_comment.id
+        token: str = self.get_token(auth_client)
+
+        new_goals: list[Goal] = goal_factory.create_batch(size=3, category=goal_category)
+        goal_category.title = 'New title'
+        goal_category.save()
+        deleted_comment.delete()
+
+        # Memberships, then boards, participants, categories, goals, comments and tombstones
+        with django_assert_num_queries(AUTH_QUERIES + 7):
+            response = auth_client.get(self.url, {'token': token})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['token'] != token
+        assert response.data['boards'] == []
+        assert response.data['participants'] == []
+        assert [category['title'] for category in response.data['categories']] == ['New title']
+        assert [goal['id'] for goal in response.data['goals']] == [goal.id for goal in new_goals]
+        assert response.data['comments'] == []
+        assert response.data['deleted'] == [{
+            'kind': Tombstone.Kind.comment,
+            'object_id': deleted_comment_id,
+            'board': goal_category.board_id,
+            'user': None,
+            'deleted': response.data['deleted'][0]['deleted'],
+        }]
+
+        response = auth_client.get(self.url, {'token': response.data['token']})
+
+        assert response.data['goals'] == []
+        assert response.data['deleted'] == []
+
+    def test_board_deleted(self, auth_client, board_participant: BoardParticipant, goal: Goal):
+        """Goals archived by the board deletion are returned as changed"""
+        token: str = self.get_token(auth_client)
+
+        auth_client.delete(reverse('goals:board', args=[board_participant.board_id]))
+        response = auth_client.get(self.url, {'token': token})
+
+        assert response.data['boards'][0]['is_deleted']
+        assert response.data['goals'][0]['status'] == Goal.Status.archived
+
+    def test_participant_removed(
+            self, auth_client, client, user: User, board_participant: BoardParticipant, board_participant_factory
+    ):
+        """Both the board's other participants and the removed user get the removal"""
+        removed: BoardParticipant = board_participant_factory.create(
+            board=board_participant.board, role=BoardParticipant.Role.reader
+        )
+        client.force_login(removed.user)
+        removed_token: str = self.get_token(client)
+        client.force_login(user)
+        token: str = self.get_token(client)
+
+        auth_client.put(
+            reverse('goals:board', args=[board_participant.board_id]),
+            {'title': board_participant.board.title, 'participants': []},
+        )
+
+        for sync_user, sync_token in ((user, token), (removed.user, removed_token)):
+            client.force_login(sync_user)
+            response = client.get(self.url, {'token': sync_token})
+
+            assert [(tombstone['object_id'], tombstone['user']) for tombstone in response.data['deleted']] == [
+                (removed.id, removed.user.username)
+            ]
+
+    def test_board_joined(
+            self, auth_client, user: User, goal_category: GoalCategory, goal_factory, board_participant_factory
+    ):
+        """All objects of a board the user joined since the token are returned"""
+        goal: Goal = goal_factory.create(category=goal_category)
+        token: str = self.get_token(auth_client)
+
+        board_participant_factory.create(board=goal_category.board, user=user, role=BoardParticipant.Role.reader)
+        response = auth_client.get(self.url, {'token': token})
+
+        assert [board['id'] for board in response.data['boards']] == [goal_category.board_id]
+        assert [category['id'] for category in response.data['categories']] == [goal_category.id]
+        assert [data['id'] for data in response.data['goals']] == [goal.id]
+
+    def test_goals_bulk_moved(
+            self, auth_client, user: User, board_participant: BoardParticipant, goal_category: GoalCategory,
+            goal_factory, goal_comment_factory, goal_category_factory, board_participant_factory,
+    ):
+        """Comments of goals moved to another board by a bulk update are returned as changed"""
+        goal: Goal = goal_factory.create(category=goal_category)
+        comment: GoalComment = goal_comment_factory.create(goal=goal)
+        other_category: GoalCategory = goal_category_factory.create(
+            board=board_participant_factory.create(user=user).board, user=user
+        )
+        token: str = self.get_token(auth_client)
+
+        auth_client.patch(reverse('goals:bulk-update-goal'), [{'id': goal.id, 'category': other_category.id}])
+        response = auth_client.get(self.url, {'token': token})
+
+        assert [data['id'] for data in response.data['goals']] == [goal.id]
+        assert [data['id'] for data in response.data['comments']] == [comment.id]
+
+    def test_invalid_token(self, auth_client):
+        """A token not issued by the endpoint is rejected"""
+        response = auth_client.get(self.url, {'token': 'invalid'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_expired_token(self, auth_client, settings):
+        """A token older than the kept tombstones requires a reload"""
+        token: str = make_token(timezone.now() - settings.SYNC_TOMBSTONE_TTL - datetime.timedelta(seconds=1))
+
+        response = auth_client.get(self.url, {'token': token})
+
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_too_many_changes(self, auth_client, board_participant, goal_category, goal_factory, settings):
+        """More changes than the endpoint returns at once require a reload"""
+        settings.SYNC_MAX_CHANGES = 2
+        token: str = self.get_token(auth_client)
+        goal_factory.create_batch(size=3, category=goal_category)
+
+        response = auth_client.get(self.url, {'token': token})
+
+        assert response.status_code == status.HTTP_410_GONE
+
+
+@pytest.mark.django_db
+def test_purge_tombstones(goal_comment_factory, settings):
+    """Tombstones older than the sync tokens are purged"""
+    goal_comment_factory.create_batch(size=2)
+    GoalComment.objects.all().delete()
+    Tombstone.objects.filter(id=Tombstone.objects.earliest('id').id).update(
+        deleted=timezone.now() - settings.SYNC_TOMBSTONE_TTL - datetime.timedelta(seconds=1)
+    )
+
+    call_command('purgetombstones')
+
+    assert Tombstone.objects.count() == 1
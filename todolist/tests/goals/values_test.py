@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from goals.models import BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.serializers import GoalCategorySerializer, GoalCommentSerializer, GoalSerializer
+from goals.values import ValuesPlan, get_values_plan
+
+
+@pytest.fixture
+def board_items(user: User, board_participant: BoardParticipant, user_factory, goal_factory, goal_comment_factory):
+    """Categories, goals and comments by two authors, with empty and filled nullable fields"""
+    author: User = user_factory.create()
+    BoardParticipant.objects.create(board=board_participant.board, user=author, role=BoardParticipant.Role.writer)
+    for i, writer in enumerate((user, author, user)):
+        category: GoalCategory = GoalCategory.objects.create(
+            title=f'Category {i}', user=writer, board=board_participant.board
+        )
+        goal: Goal = goal_factory.create(
+            title=f'Goal {i}', category=category, user=writer, description=None if i else 'Description',
+            due_date=datetime.date(2023, 8, i + 1) if i else None, priority=Goal.Priority.high,
+        )
+        goal_comment_factory.create(goal=goal, user=writer)
+
+
+@pytest.mark.django_db
+class TestValuesListParity:
+    @pytest.mark.parametrize('name, serializer_class, queryset', [
+        ('goal-list', GoalSerializer, Goal.objects.order_by('title', 'id')),
+        ('category-list', GoalCategorySerializer, GoalCategory.objects.order_by('title', 'id')),
+        ('comment-list', GoalCommentSerializer, GoalComment.objects.order_by('-created', '-id')),
+    ])
+    @pytest.mark.parametrize('params', [{}, {'limit': 2}, {'cursor': '', 'limit': 2}])
+    def test_same_output(
+        self, auth_client, board_items, name: str, serializer_class: type[serializers.Serializer],
+        queryset: QuerySet, params: dict,
+    ):
+        """Lists built from values() rows render exactly like the model serializer's output"""
+        response = auth_client.get(reverse(f'goals:{name}'), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        # Without a limit the list is not paginated
+        results: list = response.data['results'] if params else response.data
+        expected: list = serializer_class(queryset[:params.get('limit', 100)], many=True).data
+        assert JSONRenderer().render(results) == JSONRenderer().render(expected)
+
+    def test_timezone(self, board_items):
+        """Datetimes are represented in the active timezone like the serializer does"""
+        goals: QuerySet = Goal.objects.select_related('user').order_by('id')
+        plan: ValuesPlan = get_values_plan(GoalSerializer)
+
+        with timezone.override('Asia/Novosibirsk'):
+            data: list[dict] = plan.build_many(goals.values(*plan.lookups))
+
+            assert data == GoalSerializer(goals, many=True).data
+            assert data[0]['created'].endswith('+07:00')
+
+    def test_cursor_pages(self, auth_client, board_items):
+        """Keyset cursors are taken from values() rows"""
+        url: str = reverse('goals:goal-list')
+
+        first = auth_client.get(url, {'cursor': '', 'limit': 2}).data
+        second = auth_client.get(first['next']).data
+        previous = auth_client.get(second['previous']).data
+
+        assert [goal['title'] for goal in first['results'] + second['results']] == ['Goal 0', 'Goal 1', 'Goal 2']
+        assert previous['results'] == first['results']
+
+    def test_search(self, auth_client, board_items):
+        """Searching and ranking work on the values() queryset"""
+        response = auth_client.get(reverse('goals:goal-list'), {'search': 'goal 1'})
+
+        assert [goal['title'] for goal in response.data] == ['Goal 1']
+        assert response.data[0] == GoalSerializer(Goal.objects.get(title='Goal 1')).data
+
+
+class TestValuesPlan:
+    def test_lookups(self):
+        """Nested serializers are loaded across the relation"""
+        plan = ValuesPlan(GoalCommentSerializer())
+
+        assert plan.lookups == [
+            'id', 'user', 'user__id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+            'created', 'updated', 'text', 'goal',
+        ]
+
+    def test_unsupported_field(self):
+        """Fields that cannot be built from a row are rejected when the plan is made"""
+        class MethodSerializer(serializers.Serializer):
+            title = serializers.SerializerMethodField()
+
+        with pytest.raises(ValueError, match='MethodSerializer.title'):
+            ValuesPlan(MethodSerializer())
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from goals.stream import EVENT_STREAM_PATH, event_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # The event stream holds its connections open, it is served without Django's request handling
+    if scope['type'] == 'http' and scope['path'] == EVENT_STREAM_PATH:
+        return await event_stream(scope, receive, send)
+    return await django_application(scope, receive, send)
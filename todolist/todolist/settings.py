@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import environ
+import tempfile
 
+from datetime import timedelta
 from pathlib import Path
 
 env = environ.Env(
@@ -57,6 +59,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.ServerTimingMiddleware',
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,6 +76,16 @@ REST_FRAMEWORK = {
         'social_core.backends.google.GoogleOAuth2',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    # JSON is encoded and decoded with orjson if it is installed, with the json module otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
@@ -113,6 +127,17 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# List responses of the goals app are cached here and invalidated by every process that changes boards, the bot
+# included, so they all have to use the same cache. The database cache table is created by createcachetable,
+# which the entrypoint runs. A local memory cache (CACHE_URL=locmemcache://) only suits a single process.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='dbcache://cache_table'),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -138,6 +163,23 @@ AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
 )
 
+# Instrumentation
+
+# If True, responses get a Server-Timing header with the SQL statement count and time, serializer, view and total
+# time, which are also logged per request and per telegram bot update
+REQUEST_TIMING = env.bool('REQUEST_TIMING', default=False)
+
+# If True, request, SQL and telegram bot metrics are recorded and exposed in the Prometheus text format at /metrics
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=False)
+
+# Directory where every process (gunicorn workers, the bot) records its metrics in its own file for /metrics
+# to aggregate. Must be shared by the processes and should be emptied when the application is deployed.
+# Processes in separate containers, like the bot, need a shared volume and process namespace, see deploy/
+METRICS_DIR = env.str('METRICS_DIR', default=str(Path(tempfile.gettempdir(), 'todolist-metrics')))
+
+# If set, /metrics requires this bearer token in the Authorization header
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+
 # Google Oauth2
 
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = env('SOCIAL_AUTH_GOOGLE_OAUTH2_KEY', default='')
@@ -150,10 +192,91 @@ SOCIAL_AUTH_LOGIN_REDIRECT_URL = '/logged-in/'
 SOCIAL_AUTH_LOGIN_ERROR_URL = '/login-error/'
 SOCIAL_AUTH_USER_MODEL = 'core.User'
 
+# Goals
+
+# If True, deleting a board or a category only marks it as deleted and queues archiving of its child objects,
+# which is done in batches by the runcascade management command
+DEFERRED_CASCADE_DELETE = env.bool('DEFERRED_CASCADE_DELETE', default=False)
+
+# Maximum number of rows changed by one statement of the runcascade command
+CASCADE_BATCH_SIZE = 500
+
+# Changes made this long before a sync request are returned again by the next one, so changes of transactions
+# that were still running at the time of the request are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones of deleted objects are kept this long, older sync tokens require reloading the lists
+SYNC_TOMBSTONE_TTL = timedelta(days=30)
+
+# Maximum number of objects of each kind returned by a sync request, more changes require reloading the lists
+SYNC_MAX_CHANGES = 1000
+
+# Delivery of the event stream's events to the application processes: 'postgres' uses LISTEN/NOTIFY to reach
+# every process, including the bot and management commands, 'local' only reaches subscribers of the process
+# that made the change and suits a single ASGI process serving every change
+EVENT_STREAM_BACKEND = env.str('EVENT_STREAM_BACKEND', default='postgres')
+
+# Seconds between keepalive comments on idle event streams
+EVENT_STREAM_HEARTBEAT = 15
+
+# Milliseconds a client waits before reconnecting to a closed event stream
+EVENT_STREAM_RETRY = 3000
+
+# Maximum number of events waiting to be sent to a client, the stream of a client that falls behind is closed
+EVENT_STREAM_QUEUE_SIZE = 100
+
+# Number of rows fetched from the server-side cursor at a time by board exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Minimum size in bytes of the chunks an export is written out in, before compression
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# Lists paginated with ?count=estimate report the planner's row estimate as the count when it is at least this
+# high, smaller lists are counted exactly
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10000
+
+# Number of rows validated and inserted with one statement by board imports
+IMPORT_BATCH_SIZE = 2000
+
 # Telegram bot
 
 TELEGRAM_BOT_TOKEN = env('TELEGRAM_BOT_TOKEN', default='')
 
+# Base URL of the telegram bot API
+TELEGRAM_API_URL = env.str('TELEGRAM_API_URL', default='https://api.telegram.org')
+
+# Number of updates the bot handles at a time, each in its own thread
+BOT_CONCURRENCY = env.int('BOT_CONCURRENCY', default=8)
+
+# Storage of the states of creation commands users are going through, shared by the bot processes:
+# bot.state.DatabaseStateStore, or bot.state.CacheStateStore if the cache is shared by the processes
+BOT_STATE_STORE = env.str('BOT_STATE_STORE', default='bot.state.DatabaseStateStore')
+
+# Seconds a creation command is kept after the user's last step
+BOT_STATE_TTL = 3600
+
+# URL of the bot/webhook view telegram sends updates to with 'runbot --webhook', and the secret token it sends
+# along, which the view requires. The webhook is registered by runbot if the URL is set.
+TELEGRAM_WEBHOOK_URL = env.str('TELEGRAM_WEBHOOK_URL', default='')
+TELEGRAM_WEBHOOK_SECRET = env.str('TELEGRAM_WEBHOOK_SECRET', default='')
+
+# Seconds a webhook worker waits for a notification of a new update before looking at the queue again
+BOT_QUEUE_POLL_INTERVAL = 5
+
+# Seconds a webhook worker may take to handle an update before another worker handles it again, must exceed
+# the time telegram requests can take with their retries
+BOT_QUEUE_CLAIM_TIMEOUT = 300
+
+# Seconds to wait for a connection to the telegram bot API and for a response, on top of the long poll timeout
+TELEGRAM_CONNECT_TIMEOUT = 5
+TELEGRAM_READ_TIMEOUT = 10
+
+# Number of times a telegram bot API request is sent before giving up, and seconds to wait before the first retry,
+# doubled with every retry up to the maximum
+TELEGRAM_MAX_ATTEMPTS = 5
+TELEGRAM_BACKOFF = 0.5
+TELEGRAM_MAX_BACKOFF = 30
+
 # Length of a verification code used to verify a telegram user
 VERIFICATION_CODE_LENGTH = 6
 
@@ -17,10 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('oauth/', include('social_django.urls', namespace='social')),
     path('core/', include('core.urls', namespace='core')),
     path('goals/', include('goals.urls', namespace='goals')),
     path('bot/', include('bot.urls', namespace='bot')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]